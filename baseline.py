@@ -0,0 +1,115 @@
+import os
+import sqlite3
+import numpy as np
+from openpyxl.utils import get_column_letter
+from results_db import RESULTS_DB_FILE, to_sqlite_id
+
+# 기준(이전 납품) 대비 셀 분류 (보고서 열 순서)
+DELTA_STATUSES = ('New', 'Changed', 'Unchanged')
+
+# 기준 데이터베이스에서 한 번에 읽을 행 수
+BASELINE_FETCH_ROWS = 100000
+
+def get_cell_key(rel_path, sheet_name, address):
+    """셀 위치(파일 상대 경로, 시트, 주소)의 64비트 키"""
+    return to_sqlite_id(f"{rel_path}\x1f{sheet_name}\x1f{address}")
+
+def get_baseline_db_path(path):
+    """--baseline 값(결과 데이터베이스 파일 또는 results.sqlite가 있는 결과 묶음 디렉토리)의 데이터베이스 경로"""
+    if os.path.isdir(path):
+        path = os.path.join(path, RESULTS_DB_FILE)
+    if not os.path.isfile(path):
+        raise ValueError(f"Baseline results database not found: {path} (run the previous delivery with --results-db)")
+    return os.path.abspath(path)
+
+def sorted_contains(sorted_values, values):
+    """정렬된 배열에 값들이 있는지 (값마다 이진 탐색, 한 번의 numpy 호출)"""
+    if not len(sorted_values):
+        return np.zeros(len(values), dtype=bool)
+    positions = np.searchsorted(sorted_values, values)
+    positions[positions == len(sorted_values)] = 0
+    return sorted_values[positions] == values
+
+# 이전 실행의 셀 단위 결과 데이터베이스(--results-db)로 만든 기준 색인
+class BaselineIndex:
+    """기준 실행의 고유 텍스트 해시 집합과 텍스트가 있던 셀 위치 집합
+
+    둘 다 정렬된 int64 배열로 메모리에 두므로 항목당 8바이트이며, 시트마다 모든 셀을
+    한 번의 벡터화된 탐색으로 분류한다. 텍스트는 결과 데이터베이스와 같은 64비트 해시로
+    비교하므로 기준 데이터베이스의 텍스트 본문은 읽지 않는다.
+    """
+    def __init__(self, path):
+        self.path = get_baseline_db_path(path)
+        connection = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+        try:
+            cursor = connection.cursor()
+            self.text_ids = np.unique(np.array([row[0] for row in cursor.execute("SELECT text_id FROM texts")], dtype=np.int64))
+            key_parts = []
+            cursor.execute("SELECT f.rel_path, c.sheet_name, c.address FROM cells c JOIN files f ON f.file_id = c.file_id")
+            while True:
+                rows = cursor.fetchmany(BASELINE_FETCH_ROWS)
+                if not rows:
+                    break
+                key_parts.append(np.array([get_cell_key(*row) for row in rows], dtype=np.int64))
+        finally:
+            connection.close()
+        self.cell_keys = np.unique(np.concatenate(key_parts)) if key_parts else np.zeros(0, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.text_ids)
+
+    def classify(self, rel_path, sheet_name, segments):
+        """시트의 세그먼트 [(열 번호, 텍스트, 행 번호 목록)]마다 (새 셀 수, 변경 셀 수, 유지 셀 수) 목록 반환
+
+        기준에 같은 텍스트가 있으면 위치와 무관하게 유지(Unchanged), 없으면 기준의 같은 셀
+        주소에 (다른) 텍스트가 있었을 때 변경(Changed), 그 외는 새 셀(New)이다.
+        """
+        if not segments:
+            return []
+        text_ids = np.array([to_sqlite_id(text) for _, text, _ in segments], dtype=np.int64)
+        known = sorted_contains(self.text_ids, text_ids)
+        results = []
+        keys = []
+        for (col, _, rows), is_known in zip(segments, known):
+            if is_known:
+                results.append((0, 0, len(rows)))
+                continue
+            results.append(None)
+            column_letter = get_column_letter(col + 1)
+            keys.extend(get_cell_key(rel_path, sheet_name, f"{column_letter}{r+1}") for r in rows)
+        changed = sorted_contains(self.cell_keys, np.array(keys, dtype=np.int64)).tolist()
+        offset = 0
+        for i, (_, _, rows) in enumerate(segments):
+            if results[i] is None:
+                changed_cells = sum(changed[offset:offset + len(rows)])
+                offset += len(rows)
+                results[i] = (len(rows) - changed_cells, changed_cells, 0)
+        return results
+
+def new_delta_counts(measures):
+    """카테고리 하나의 분류별 [셀 수, 측정값...] (measures: 측정값 개수)"""
+    return [[0] * (1 + measures) for _ in DELTA_STATUSES]
+
+def add_delta_counts(delta, status_cells, values):
+    """세그먼트의 분류별 셀 수와 셀 하나의 측정값(단어 수, 글자 수 등)을 누적"""
+    for status, cells in enumerate(status_cells):
+        if cells:
+            delta[status][0] += cells
+            for i, value in enumerate(values, start=1):
+                delta[status][i] += value * cells
+
+def get_delta_headers(measures, category_header='Category'):
+    """Delta 시트 헤더 (measures: 측정값 이름 목록, 예: ['Words', 'Chars'])"""
+    headers = ['Path', 'FileName', 'SheetName', 'Status', '🏳️', category_header]
+    for status in DELTA_STATUSES:
+        headers += [f"{status}Cells"] + [f"{status}{measure}" for measure in measures]
+    return headers
+
+def get_delta_total_rows(delta_rows):
+    """파일/시트별 Delta 행을 카테고리별로 더한 폴더 합계 행 (ALL)"""
+    totals = {}
+    for row in delta_rows:
+        key = (row[4], row[5])
+        values = totals.get(key)
+        totals[key] = row[6:] if values is None else [a + b for a, b in zip(values, row[6:])]
+    return [['ALL', 'ALL', 'ALL', "Normal", emoji, category] + values for (emoji, category), values in totals.items()]
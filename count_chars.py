@@ -1,16 +1,30 @@
 import os
 import sys
+import numpy as np
 import pandas as pd
 import re
-from openpyxl import Workbook
 from openpyxl.utils import get_column_letter
 from openpyxl.styles import Alignment
 from datetime import datetime
 from tqdm import tqdm
 import tempfile
-import json
 import shutil
+from collections import defaultdict, ChainMap
+from functools import partial
 from translations import t
+from sketches import HyperLogLog
+from unique_store import UniqueStore, DEFAULT_UNIQUE_MEMORY
+from results_db import ResultsDatabase, CellResultsBuffer, RESULTS_DB_FILE, get_results_db_path
+from baseline import BaselineIndex, new_delta_counts, add_delta_counts, get_delta_headers, get_delta_total_rows
+from sheet_pool import SheetPool
+from report_writer import ReportWriter
+from file_discovery import FileDiscovery, DISCOVERY_WORKERS
+from estimate import estimate_folder, write_estimate_report, DEFAULT_TARGET_ERROR
+from memory_budget import MemoryBudget, prefetch_workbooks_within_budget, format_memory_size, MEMORY_LOG_FILE, DEFAULT_READ_WORKERS
+from workbook_reader import (prefetch_workbooks, read_workbook, read_workbook_groups, group_distinct_values,
+                             group_non_text_values, GroupedSheet, PREFETCH_DEPTH)
+from result_bundle import (ResultBundle, new_file_rows, CHECKPOINT_DIR_PREFIX,
+                           get_shard_dir, find_shard_dirs, select_shard_files, load_shard_bundles)
 
 # 언어별 정규 표현식 패턴 정의 및 간결한 이름
 PATTERNS = {
@@ -24,54 +38,78 @@ PATTERNS = {
     'Special': (re.compile(r'[^\w\s]'), '🔣')
 }
 
+# 결과 행렬의 고정 카테고리 인덱스 (행: PATTERNS 순서, 열: 시트의 열)
+LANG_INDEX = {lang: i for i, lang in enumerate(PATTERNS)}
+
+# 정수 자릿수 계산용 10의 거듭제곱 (10 ~ 10^19, uint64 범위)
+POWERS_OF_TEN = np.array([10 ** k for k in range(1, 20)], dtype=np.uint64)
+
+# 절댓값이 이보다 작고 소수부가 없는 실수는 정수로 표시 (이보다 크면 str(float) 표시)
+INTEGRAL_FLOAT_LIMIT = 1e15
+
 # 임시 파일 관리를 위한 클래스
 class TempFileManager:
-    def __init__(self, base_dir):
+    def __init__(self, base_dir, temp_dir=None, hll_error=None, unique_memory=DEFAULT_UNIQUE_MEMORY):
         self.base_dir = base_dir
-        self.temp_dir = tempfile.mkdtemp(dir=base_dir)
-        self.temp_files = {lang: [] for lang in PATTERNS}
-        self.current_sets = {lang: set() for lang in PATTERNS}
-        self.set_size_limit = 100000  # 각 언어별 집합 크기 제한
+        if temp_dir:
+            # 체크포인트 디렉토리처럼 실행이 끝나도 유지되어야 하는 경우
+            os.makedirs(temp_dir, exist_ok=True)
+            self.temp_dir = temp_dir
+        else:
+            self.temp_dir = tempfile.mkdtemp(dir=base_dir)
+        # 언어별 고유 텍스트 집합 (모든 언어 합계가 unique_memory를 넘으면 가장 큰 언어부터 파일로 내보냄)
+        self.store = UniqueStore(self.temp_dir, unique_memory)
+        # 근사 모드: 고유 텍스트 집합 대신 언어별 HyperLogLog 스케치만 유지 (고정 메모리, 임시 파일 없음)
+        self.hll_error = hll_error
+        self.sketches = {lang: HyperLogLog.from_error(hll_error) for lang in PATTERNS} if hll_error else None
 
     def add_text(self, lang, text):
-        if text in self.current_sets[lang]:
-            return
-        
-        self.current_sets[lang].add(text)
-        if len(self.current_sets[lang]) >= self.set_size_limit:
-            self._save_to_temp_file(lang)
-
-    def _save_to_temp_file(self, lang):
-        if not self.current_sets[lang]:
+        if self.sketches is not None:
+            # 텍스트의 글자 수만큼 슬롯을 추가하여 고유 텍스트들의 글자 수 합을 추정
+            self.sketches[lang].add_weighted(text, len(PATTERNS[lang][0].findall(text)))
             return
 
-        temp_file = os.path.join(self.temp_dir, f"{lang}_{len(self.temp_files[lang])}.json")
-        with open(temp_file, 'w', encoding='utf-8') as f:
-            json.dump(list(self.current_sets[lang]), f, ensure_ascii=False)
-        
-        self.temp_files[lang].append(temp_file)
-        self.current_sets[lang].clear()
-
-    def get_all_unique_texts(self, lang):
-        all_texts = set()
-        
-        # 현재 메모리에 있는 텍스트 추가
-        all_texts.update(self.current_sets[lang])
-        
-        # 임시 파일에서 텍스트 로드
-        for temp_file in self.temp_files[lang]:
-            with open(temp_file, 'r', encoding='utf-8') as f:
-                all_texts.update(json.load(f))
-        
-        return all_texts
+        self.store.add(lang, text)
 
     def get_total_chars(self, lang):
-        total_chars = 0
-        unique_texts = self.get_all_unique_texts(lang)
-        for text in unique_texts:
-            counts = count_characters(text)
-            total_chars += counts[lang]
-        return total_chars
+        if self.sketches is not None:
+            return self.sketches[lang].count()
+
+        # 해시 구간별로 고유 텍스트를 합쳐 세므로 전체 합집합을 한 번에 메모리에 올리지 않음
+        pattern = PATTERNS[lang][0]
+        return sum(len(pattern.findall(text)) for text in self.store.iter_unique(lang))
+
+    def get_unique_status(self):
+        """폴더 전체 고유 값 행의 상태 (근사 모드이면 오차 범위 표시)"""
+        if self.sketches is None:
+            return "Normal"
+        error = HyperLogLog.from_error(self.hll_error).error
+        return f"Approximate (HyperLogLog, ±{error:.1%} standard error)"
+
+    def flush(self):
+        """메모리에 있는 모든 집합을 임시 파일로 내보냄 (체크포인트용)"""
+        self.store.flush()
+
+    def get_state(self):
+        """임시 파일 목록 반환 (체크포인트에 저장)"""
+        if self.sketches is not None:
+            return {'hll': {lang: sketch.to_state() for lang, sketch in self.sketches.items()}}
+        return {'temp_files': self.store.get_state()}
+
+    def merge_state(self, state, temp_dir):
+        """다른 실행(샤드)의 임시 파일 목록을 추가 (병합용, 원본 파일은 삭제하지 않음)"""
+        self.store.merge_state(state.get('temp_files', {}), temp_dir)
+        for lang, sketch_state in state.get('hll', {}).items():
+            self.sketches[lang].merge(HyperLogLog.from_state(sketch_state))
+
+    def restore_state(self, state):
+        """체크포인트의 임시 파일 목록 복원 (목록에 없는 파일은 마지막 체크포인트 이후의 것이므로 삭제)"""
+        keep = self.store.restore_state(state.get('temp_files', {}))
+        for lang, sketch_state in state.get('hll', {}).items():
+            self.sketches[lang] = HyperLogLog.from_state(sketch_state)
+        for name in os.listdir(self.temp_dir):
+            if name not in keep:
+                os.remove(os.path.join(self.temp_dir, name))
 
     def cleanup(self):
         """임시 디렉토리 정리 (Windows 액세스 거부 오류 처리)"""
@@ -107,6 +145,14 @@ def count_characters(text):
         counts[lang] += len(matches)
     return counts
 
+def count_characters_vector(text):
+    """PATTERNS 순서의 글자 수 리스트 반환 (결과 행렬의 한 열에 더하기 위함)"""
+    return [len(pattern.findall(text)) for pattern, _ in PATTERNS.values()]
+
+def get_shared_string_counts(shared_strings):
+    """워크북의 공유 문자열마다 글자 수를 한 번씩 계산 ({텍스트: PATTERNS 순서 글자 수}, 모든 시트가 함께 사용)"""
+    return {text: count_characters_vector(text) for text in set(shared_strings)}
+
 def determine_primary_language(counts):
     non_special_counts = {lang: count for lang, count in counts.items() if lang not in ['Special']}
     non_english_counts = {lang: count for lang, count in non_special_counts.items() if lang != ['Alphabet']}
@@ -123,45 +169,151 @@ def determine_primary_language(counts):
     
     return primary_lang
 
-def analyze_sheet(df):
-    total_counts = {lang: 0 for lang in PATTERNS}
-    column_counts = {col: {lang: 0 for lang in PATTERNS} for col in range(df.shape[1])}
-
-    for r in range(df.shape[0]):
-        for c in range(df.shape[1]):
-            cell_value = df.iat[r, c]
-            if pd.isna(cell_value) or str(cell_value).strip() == '':
-                continue  # 빈 셀은 무시
-            text = str(cell_value)
-            counts = count_characters(text)
-            
-            # 모든 언어의 글자 수를 더함
-            for lang in PATTERNS:
-                total_counts[lang] += counts[lang]
-                column_counts[c][lang] += counts[lang]
+def new_result_matrix(num_columns):
+    """카테고리 x 열 정수 행렬 생성"""
+    return np.zeros((len(PATTERNS), num_columns), dtype=np.int64)
 
-    # 유효한 열만 필터링
+def find_valid_columns(column_counts):
+    """값이 있는 열만 반환 (빈 열이 20개 이상 연속될 경우 중단)"""
+    col_totals = column_counts.sum(axis=0)
     valid_columns = []
     empty_col_count = 0
-    for col in range(df.shape[1]):
-        col_total = sum(column_counts[col].values())
-        if col_total > 0:
+    for col in range(column_counts.shape[1]):
+        if col_totals[col] > 0:
             valid_columns.append(col)
             empty_col_count = 0
         else:
             empty_col_count += 1
             if empty_col_count >= 20:  # 빈 열이 20개 이상 연속될 경우 중단
                 break
+    return valid_columns
+
+def count_digits(magnitudes):
+    """uint64 배열 각 원소의 십진 자릿수 (0은 1자리)"""
+    return 1 + np.searchsorted(POWERS_OF_TEN, magnitudes, side='right')
+
+def format_non_text_value(value):
+    """숫자/날짜 값의 표시 텍스트 (get_non_text_count_matrix의 글자 수와 같은 형식)"""
+    if isinstance(value, np.datetime64):
+        return str(pd.Timestamp(value))
+    if isinstance(value, np.floating):
+        value = float(value)
+        if not (value.is_integer() and abs(value) < INTEGRAL_FLOAT_LIMIT):
+            return str(value)
+    return str(int(value))
+
+def get_non_text_count_matrix(values, positions):
+    """숫자/날짜 값 배열의 (고유 값 목록, 고유 값의 행 목록, 고유 값 x 카테고리 글자 수 행렬) 반환
+
+    셀마다 문자열을 만들지 않고 값에서 바로 숫자/특수문자 수를 계산한다
+    (정수: 자릿수와 음수 부호, 날짜: 'YYYY-MM-DD HH:MM:SS[.ffffff]').
+    소수부가 있는 실수와 int64 범위를 넘는 정수(object 배열)만 고유 값마다 한 번 문자열로 변환해 센다.
+    """
+    uniques, inverse, occurrences = np.unique(values, return_inverse=True, return_counts=True)
+    # 고유 값별 행 목록 (안정 정렬이므로 행은 오름차순)
+    order = np.argsort(inverse.ravel(), kind='stable')
+    rows = [r.tolist() for r in np.split(positions[order], np.cumsum(occurrences)[:-1])] if len(uniques) else []
+
+    matrix = np.zeros((len(uniques), len(PATTERNS)), dtype=np.int64)
+    number, special = LANG_INDEX['Number'], LANG_INDEX['Special']
+    if uniques.dtype.kind == 'M':
+        # 초 미만 값이 있으면 마이크로초(6자리) 또는 나노초(9자리)와 '.'이 붙음
+        fractions = (uniques - uniques.astype('datetime64[s]')).astype('timedelta64[ns]').view(np.int64)
+        matrix[:, number] = 14 + np.where(fractions % 1000 != 0, 9, np.where(fractions != 0, 6, 0))
+        matrix[:, special] = 4 + (fractions != 0)
+    elif uniques.dtype.kind == 'f':
+        # 소수부가 없는 실수는 정수로 표시 (빈 셀 때문에 실수 열이 된 정수 1.0 -> 1)
+        integral = np.isfinite(uniques) & (uniques == np.floor(uniques)) & (np.abs(uniques) < INTEGRAL_FLOAT_LIMIT)
+        matrix[integral, number] = count_digits(np.abs(uniques[integral]).astype(np.uint64))
+        matrix[integral, special] = uniques[integral] < 0
+        for k in np.flatnonzero(~integral):
+            matrix[k] = count_characters_vector(format_non_text_value(uniques[k]))
+    elif uniques.dtype.kind == 'O':
+        for k, value in enumerate(uniques):
+            matrix[k] = count_characters_vector(format_non_text_value(value))
+    else:
+        negative = uniques < 0
+        # 부호 있는 정수의 절댓값 (최솟값에서도 넘치지 않도록 -(v+1)+1로 계산)
+        with np.errstate(over='ignore'):
+            magnitudes = np.where(negative, (-(uniques + 1)).astype(np.uint64) + np.uint64(1), uniques.astype(np.uint64))
+        matrix[:, number] = count_digits(magnitudes)
+        matrix[:, special] = negative
+    return list(uniques), rows, matrix
+
+def get_column_count_matrices(df, groups=None, count_cache=None, non_text_values=None):
+    """열별 (고유 값 목록, 고유 값의 행 목록, 고유 값 x 카테고리 글자 수 행렬) 반환
+
+    같은 텍스트는 열이 달라도 count_cache에서 한 번만 계산하며 (시트마다 한 번 만들어 분석 함수들이 함께 사용),
+    실제 값은 고유 값의 값에 출현 횟수(행 수)를 곱해 구한다.
+    숫자/날짜 셀(non_text_values)은 값에서 바로 계산하고 결과를 열 번호로 count_cache에 보관한다
+    (빈 딕셔너리를 주면 숫자/날짜 셀은 분석에서 제외).
+    """
+    if groups is None:
+        groups = group_distinct_values(df, text_only=True)
+    if non_text_values is None:
+        non_text_values = group_non_text_values(df)
+    if count_cache is None:
+        count_cache = {}
+    matrices = {}
+    for c in sorted(set(groups) | set(non_text_values)):
+        column_groups = groups.get(c, {})
+        for text in column_groups:
+            if text not in count_cache:
+                count_cache[text] = count_characters_vector(text)
+        values = list(column_groups)
+        rows = list(column_groups.values())
+        matrix = np.array([count_cache[text] for text in column_groups], dtype=np.int64).reshape(len(rows), len(PATTERNS))
+        if c in non_text_values:
+            if c not in count_cache:
+                parts = [get_non_text_count_matrix(part_values, positions) for part_values, positions in non_text_values[c]]
+                count_cache[c] = ([value for part in parts for value in part[0]],
+                                  [r for part in parts for r in part[1]],
+                                  np.vstack([part[2] for part in parts]))
+            non_text_uniques, non_text_rows, non_text_matrix = count_cache[c]
+            values += non_text_uniques
+            rows += non_text_rows
+            matrix = np.vstack([matrix, non_text_matrix])
+        matrices[c] = (values, rows, matrix)
+    return matrices
+
+def get_occurrences(rows):
+    """고유 텍스트별 출현 횟수 배열"""
+    return np.array([len(text_rows) for text_rows in rows], dtype=np.int64)
+
+def analyze_sheet(df, matrices):
+    """matrices: get_column_count_matrices 결과 (시트마다 한 번 만들어 분석 함수들이 함께 사용)"""
+    column_counts = new_result_matrix(df.shape[1])
+
+    # 모든 언어의 글자 수를 고유 텍스트별로 한 번 세고 출현 횟수만큼 더함
+    for c, (_, rows, matrix) in matrices.items():
+        column_counts[:, c] = get_occurrences(rows) @ matrix
+
+    total_counts = column_counts.sum(axis=1)
+
+    # 유효한 열만 필터링
+    valid_columns = find_valid_columns(column_counts)
 
     return total_counts, column_counts, valid_columns
 
-def adjust_column_widths(sheet):
+def get_row_count_matrix(df, non_text='count'):
+    """행 x 카테고리(PATTERNS 순서) 글자 수 행렬 (표본 추정에서 행마다 값을 구하기 위함)"""
+    groups = group_distinct_values(df, text_only=True)
+    non_text_values = group_non_text_values(df) if non_text == 'count' else {}
+    row_counts = np.zeros((df.shape[0], len(PATTERNS)), dtype=np.int64)
+    for _, rows, matrix in get_column_count_matrices(df, groups, {}, non_text_values).values():
+        for text_rows, counts in zip(rows, matrix):
+            row_counts[text_rows] += counts
+    return row_counts
+
+def adjust_column_widths(sheet, title=None):
+    """열 너비 조정 (title: 이어지는 시트의 원래 시트 이름)"""
+    title = title or sheet.title
     for column_cells in sheet.columns:
         max_length = 0
         column = column_cells[0].column_letter  # Get the column name
         
         # Summary_cell_address 시트에서 데이터 열(A열, B열 등)만 너비를 10으로 고정하고 셀에 맞춤 설정
-        if sheet.title == 'Summary_cell_address' and column >= 'G':  # G열부터 시작하는 데이터 열
+        if title == 'Summary_cell_address' and column >= 'G':  # G열부터 시작하는 데이터 열
             sheet.column_dimensions[column].width = 10
             # 해당 열의 모든 셀에 셀에 맞춤 설정 적용 (줄바꿈 없음)
             for cell in column_cells:
@@ -177,196 +329,213 @@ def adjust_column_widths(sheet):
         adjusted_width = (max_length + 2)
         sheet.column_dimensions[column].width = adjusted_width
 
-def get_unique_values_per_column(df):
-    unique_counts = {}
-    for col in range(df.shape[1]):
-        # 해당 열의 모든 값을 가져옴
-        column_values = df.iloc[:, col].dropna().astype(str)
-        # 중복 제거
-        unique_values = column_values.unique()
-        # 각 고유 값에 대해 글자 수를 세고 합산
-        col_counts = {lang: 0 for lang in PATTERNS}
-        for value in unique_values:
-            counts = count_characters(value)
-            for lang in PATTERNS:
-                col_counts[lang] += counts[lang]
-        unique_counts[col] = col_counts
+def get_unique_values_per_column(df, matrices):
+    unique_counts = new_result_matrix(df.shape[1])
+    # 열의 고유 값마다 글자 수를 세고 합산
+    for c, (_, _, matrix) in matrices.items():
+        unique_counts[:, c] = matrix.sum(axis=0)
     return unique_counts
 
-def get_cell_addresses(df):
-    cell_addresses = {lang: {col: [] for col in range(df.shape[1])} for lang in PATTERNS}
-    
-    for r in range(df.shape[0]):
-        for c in range(df.shape[1]):
-            cell_value = df.iat[r, c]
-            if pd.isna(cell_value) or str(cell_value).strip() == '':
-                continue  # 빈 셀은 무시
-                
-            text = str(cell_value)
-            for lang, (pattern, _) in PATTERNS.items():
-                if pattern.search(text):
-                    cell_address = f"{get_column_letter(c+1)}{r+1}"
-                    cell_addresses[lang][c].append(cell_address)
-    
-    # 각 언어별로 셀 주소 정렬
-    for lang in PATTERNS:
-        for col in range(df.shape[1]):
-            cell_addresses[lang][col].sort(key=lambda x: (x[0], int(x[1:])))
-    
+def get_cell_addresses(matrices):
+    """(언어, 열) -> 셀 주소 리스트 (주소가 있는 조합만 생성)"""
+    cell_addresses = defaultdict(list)
+
+    for c, (_, rows, matrix) in matrices.items():
+        column_letter = get_column_letter(c+1)
+        for lang, i in LANG_INDEX.items():
+            # 해당 언어가 포함된 고유 텍스트의 행을 모아 행 순서로 정렬
+            lang_rows = sorted(r for k in np.flatnonzero(matrix[:, i]) for r in rows[k])
+            if lang_rows:
+                cell_addresses[(lang, c)] = [f"{column_letter}{r+1}" for r in lang_rows]
+
     return cell_addresses
 
-def count_cells_by_language(df):
-    cell_counts = {lang: {col: 0 for col in range(df.shape[1])} for lang in PATTERNS}
-    
-    for r in range(df.shape[0]):
-        for c in range(df.shape[1]):
-            cell_value = df.iat[r, c]
-            if pd.isna(cell_value) or str(cell_value).strip() == '':
-                continue  # 빈 셀은 무시
-                
-            text = str(cell_value)
-            for lang, (pattern, _) in PATTERNS.items():
-                if pattern.search(text):
-                    cell_counts[lang][c] += 1
-    
+def count_cells_by_language(df, matrices):
+    cell_counts = new_result_matrix(df.shape[1])
+
+    # 언어가 포함된 고유 텍스트의 출현 횟수 합
+    for c, (_, rows, matrix) in matrices.items():
+        cell_counts[:, c] = get_occurrences(rows) @ (matrix > 0).astype(np.int64)
+
     return cell_counts
 
-def main(current_language='ko'):
-    # exe 파일이 실행된 경로를 기준으로 설정
-    folder_path = os.path.dirname(os.path.abspath(sys.executable)) if getattr(sys, 'frozen', False) else os.path.dirname(os.path.abspath(__file__))
-    print(f"{t('UI_006', current_language)}: {folder_path}")
-    
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    report_name = f"CHAR_COUNT_REPORT_{timestamp}.xlsx"
-    report_path = os.path.join(folder_path, report_name)
-    print(f"{t('UI_007', current_language)}: {report_path}")
+def get_text_language(counts):
+    """셀 텍스트의 대표 카테고리 (글자가 가장 많은 언어, 언어 글자가 없으면 숫자, 특수 문자 순)"""
+    best = None
+    for lang, count in zip(PATTERNS, counts):
+        if count > 0 and lang not in ('Number', 'Special') and (best is None or count > counts[LANG_INDEX[best]]):
+            best = lang
+    if best is not None:
+        return best
+    if counts[LANG_INDEX['Number']] > 0:
+        return 'Number'
+    return 'Special' if counts[LANG_INDEX['Special']] > 0 else None
+
+def write_cell_results(cell_results, sheet_name, matrices):
+    """시트의 셀별 언어와 글자 수를 결과 데이터베이스에 기록 (같은 텍스트의 셀은 한 번에 기록)"""
+    for c, (values, rows, matrix) in matrices.items():
+        for value, text_rows, counts in zip(values, rows, matrix.tolist()):
+            text = value if isinstance(value, str) else format_non_text_value(value)
+            cell_results.add_cells(sheet_name, c, text, text_rows, get_text_language(counts), counts)
+
+def analyze_sheet_task(rel_path, file_name, sheet_name, df, non_text='count', shared_counts=None, cell_results=None,
+                       current_language='ko', baseline=None):
+    """시트 하나를 분석하여 보고서 행, 유효한 열, 폴더 전체 고유 집합에 넣을 텍스트를 반환
+
+    메인 프로세스와 시트 워커 프로세스에서 모두 실행되며, 결과는 apply_sheet_result로
+    시트 순서대로 파일 결과와 폴더 전체 고유 집합에 반영한다. shared_counts는 워크북의
+    공유 문자열별 글자 수(없으면 텍스트마다 계산), cell_results는 셀 단위 결과 기록 대상,
+    baseline은 새/변경/유지 셀을 분류할 기준 색인(BaselineIndex)이다.
+    """
+    print(f"{t('UI_012', current_language)}: {sheet_name}")
+    sheet_rows = new_file_rows()
+    if baseline is not None:
+        sheet_rows['delta'] = []  # 기준 대비 새/변경/유지 셀의 글자 수
+    if isinstance(df, GroupedSheet):
+        # XML에서 이미 열별로 묶인 시트
+        groups = df.groups
+        non_text_values = df.non_text_values if non_text == 'count' else {}
+        count_cache = ChainMap({}, shared_counts) if shared_counts is not None else {}
+    else:
+        # 열별 고유 텍스트로 묶어 글자 수는 텍스트마다 한 번만 셈 (숫자/날짜 열은 값에서 바로 계산)
+        groups = group_distinct_values(df, text_only=True)
+        non_text_values = group_non_text_values(df) if non_text == 'count' else {}
+        count_cache = {}
+    # 열별 고유 값 x 카테고리 글자 수 행렬은 한 번만 만들어 모든 분석에 사용
+    matrices = get_column_count_matrices(df, groups, count_cache, non_text_values)
+    total_counts, column_counts, valid_columns = analyze_sheet(df, matrices)
+    unique_counts = get_unique_values_per_column(df, matrices)
+    cell_addresses = get_cell_addresses(matrices)
+    cell_counts = count_cells_by_language(df, matrices)
+    if cell_results is not None:
+        write_cell_results(cell_results, sheet_name, matrices)
+
+    # 폴더 전체 고유 집합에 넣을 텍스트 (언어별)
+    unique_texts = defaultdict(list)
+    delta_segments = []  # 기준 대비 분류할 [(열 번호, 텍스트, 행 번호 목록)]
+    delta_counts = []  # 세그먼트별 언어별 글자 수
+    for c, (values, rows, matrix) in matrices.items():
+        for value, text_rows, counts in zip(values, rows, matrix):
+            text = value if isinstance(value, str) else format_non_text_value(value)
+            for lang, count in zip(PATTERNS, counts):
+                if count > 0:
+                    unique_texts[lang].append(text)
+            if baseline is not None:
+                delta_segments.append((c, text, text_rows))
+                delta_counts.append(counts.tolist())
+
+    # 기준 대비 새/변경/유지 셀 분류 (시트의 모든 세그먼트를 한 번에 조회)
+    if baseline is not None:
+        delta = {}
+        for status_cells, counts in zip(baseline.classify(rel_path, sheet_name, delta_segments), delta_counts):
+            for lang, count in zip(PATTERNS, counts):
+                if count > 0:
+                    add_delta_counts(delta.setdefault(lang, new_delta_counts(1)), status_cells, (count,))
+        for lang in PATTERNS:
+            if lang in delta:
+                row_data = [rel_path, file_name, sheet_name, "Normal", PATTERNS[lang][1], f"{lang}"]
+                sheet_rows['delta'].append(row_data + [value for status_counts in delta[lang] for value in status_counts])
+
+    # 실제 데이터 처리
+    for lang in PATTERNS:
+        emoji = PATTERNS[lang][1]
+        lang_index = LANG_INDEX[lang]
+        col_totals = column_counts[lang_index, valid_columns].tolist()
+        total = int(total_counts[lang_index])
+        sum_col_totals = sum(col_totals)
+        if sum_col_totals != total:
+            status = f"Error: Total characters({total}) and column totals({sum_col_totals}) do not match"
+        else:
+            status = "Normal"
 
-    report_wb = Workbook()
-    
-    # Summary_real 시트 생성
-    report_ws_real = report_wb.active
-    report_ws_real.title = 'Summary_real'
-    
-    # Summary_unique_for_Sheet 시트 생성
-    report_ws_unique_for_sheet = report_wb.create_sheet('Summary_unique_for_Sheet')
-    
-    # Summary_unique_for_Folder 시트 생성
-    report_ws_unique_for_folder = report_wb.create_sheet('Summary_unique_for_Folder')
-    
-    # Summary_cell_address 시트 생성
-    report_ws_cell_address = report_wb.create_sheet('Summary_cell_address')
-    
-    # Summary_cells 시트 생성
-    report_ws_cells = report_wb.create_sheet('Summary_cells')
-
-    # 임시 파일 매니저 초기화
-    temp_manager = TempFileManager(folder_path)
-
-    # 하위 폴더를 포함한 모든 엑셀 파일 수집
-    files_to_process = []
-    for root, dirs, files in os.walk(folder_path):
-        # 특정 폴더 제외
-        if '__pycache__' in dirs:
-            dirs.remove('__pycache__')
-        if '.git' in dirs:
-            dirs.remove('.git')
-            
-        for file in files:
-            if file.endswith(('.xlsx', '.xlsm', '.csv')) and "REPORT_" not in file and not file.startswith('~$'):
-                # 상대 경로 계산
-                rel_path = os.path.relpath(os.path.join(root, file), folder_path)
-                files_to_process.append((rel_path, file))
+        row_data = [rel_path, file_name, sheet_name, status, emoji, f"{lang}", total] + col_totals
+        sheet_rows['real'].append(row_data)
 
-    print(f"{t('UI_008', current_language)}: {[f[1] for f in files_to_process]}")
+    # 고유 값 데이터 처리
+    for lang in PATTERNS:
+        emoji = PATTERNS[lang][1]
+        unique_col_totals = unique_counts[LANG_INDEX[lang], valid_columns].tolist()
+        total_unique = sum(unique_col_totals)
+        row_data = [rel_path, file_name, sheet_name, "Normal", emoji, f"{lang}", total_unique] + unique_col_totals
+        sheet_rows['unique_for_sheet'].append(row_data)
+
+    # 셀 주소 데이터 처리
+    for lang in PATTERNS:
+        emoji = PATTERNS[lang][1]
+        cell_col_addresses = [', '.join(cell_addresses.get((lang, col), [])) for col in valid_columns]
+        total_cells = sum(len(cell_addresses.get((lang, col), [])) for col in valid_columns)
+        row_data = [rel_path, file_name, sheet_name, "Normal", emoji, f"{lang}", total_cells] + cell_col_addresses
+        sheet_rows['cell_address'].append(row_data)
 
+    # 셀 갯수 데이터 처리
+    for lang in PATTERNS:
+        emoji = PATTERNS[lang][1]
+        cell_col_counts = cell_counts[LANG_INDEX[lang], valid_columns].tolist()
+        total_cells = sum(cell_col_counts)
+        row_data = [rel_path, file_name, sheet_name, "Normal", emoji, f"{lang}", total_cells] + cell_col_counts
+        sheet_rows['cells'].append(row_data)
+
+    return {'rows': sheet_rows, 'columns': valid_columns, 'unique': dict(unique_texts)}
+
+# 시트 워커 프로세스의 기준 색인 (--baseline, init_sheet_worker에서 설정)
+worker_baseline = None
+
+def init_sheet_worker(baseline):
+    """시트 워커 프로세스 초기화"""
+    global worker_baseline
+    worker_baseline = baseline
+
+def run_sheet_task_in_worker(rel_path, file_name, non_text, results_db, current_language, sheet_name, df):
+    """시트 워커 프로세스에서 analyze_sheet_task 실행 (셀 단위 결과는 모아서 함께 반환)"""
+    cells = CellResultsBuffer() if results_db else None
+    result = analyze_sheet_task(rel_path, file_name, sheet_name, df, non_text, None, cells, current_language,
+                                worker_baseline)
+    result['cells'] = cells
+    return result
+
+def strip_shared_strings(df):
+    """워커로 보낼 시트에서 워크북 전체 공유 문자열 목록을 뺌"""
+    return df.without_shared_strings() if isinstance(df, GroupedSheet) else df
+
+def apply_sheet_result(result, file_rows, file_columns, temp_manager, cell_results=None):
+    """시트 분석 결과를 파일 결과와 폴더 전체 고유 집합에 반영 (시트 순서대로 호출)"""
+    for kind, rows in result['rows'].items():
+        file_rows[kind].extend(rows)
+    # 유효한 열을 파일의 열 목록에 추가
+    file_columns.update(result['columns'])
+    # 고유한 텍스트 수집 (폴더 전체 기준)
+    for lang, texts in result['unique'].items():
+        for text in texts:
+            temp_manager.add_text(lang, text)
+    if result.get('cells') is not None and cell_results is not None:
+        result['cells'].write_to(cell_results)
+
+def write_report(report_path, file_order, file_records, temp_manager, current_language):
+    """파일별 결과 레코드로 보고서 작성 (일반 실행과 샤드 병합에서 공통 사용)
+
+    행은 file_order(상대 경로 목록) 순서대로 배치하고, 폴더 전체 고유 값은
+    temp_manager에 모인 집합으로 계산한다.
+    """
     # 전체 열을 추적하기 위한 변수
     all_columns = set()
-    processed_files = 0
-
-    print(t('UI_009', current_language).format(len(files_to_process)))
-    print(t('UI_010', current_language))
 
     data_rows_real = []  # 실제 데이터를 저장할 리스트
     data_rows_unique_for_sheet = []  # 고유 값 데이터를 저장할 리스트
     data_rows_cell_address = []  # 셀 주소 데이터를 저장할 리스트
     data_rows_cells = []  # 셀 갯수 데이터를 저장할 리스트
+    data_rows_delta = []  # 기준 대비 새/변경/유지 셀 데이터를 저장할 리스트
 
-    # 콘솔 출력이 가능한지 확인
-    has_console = hasattr(sys.stdout, 'write') and sys.stdout is not None
-    
-    for rel_path, file_name in tqdm(files_to_process, desc="processing files", disable=not has_console):
-        try:
-            print(f"\n{t('UI_011', current_language)}: {file_name}")
-            file_path = os.path.join(folder_path, rel_path)
-            xls = pd.ExcelFile(file_path)
-
-            for sheet_name in xls.sheet_names:
-                print(f"{t('UI_012', current_language)}: {sheet_name}")
-                df = pd.read_excel(xls, sheet_name=sheet_name, header=None)
-                total_counts, column_counts, valid_columns = analyze_sheet(df)
-                unique_counts = get_unique_values_per_column(df)
-                cell_addresses = get_cell_addresses(df)
-                cell_counts = count_cells_by_language(df)
-
-                # 유효한 열을 전체 열 목록에 추가
-                for col in valid_columns:
-                    all_columns.add(col)
-
-                # 고유한 텍스트 수집 (폴더 전체 기준)
-                for r in range(df.shape[0]):
-                    for c in range(df.shape[1]):
-                        cell_value = df.iat[r, c]
-                        if pd.isna(cell_value) or str(cell_value).strip() == '':
-                            continue
-                        text = str(cell_value)
-                        for lang, (pattern, _) in PATTERNS.items():
-                            if pattern.search(text):
-                                temp_manager.add_text(lang, text)
-
-                # 실제 데이터 처리
-                for lang in PATTERNS:
-                    emoji = PATTERNS[lang][1]
-                    col_totals = [column_counts[col][lang] for col in valid_columns]
-                    total = total_counts[lang]
-                    sum_col_totals = sum(col_totals)
-                    if sum_col_totals != total:
-                        status = f"Error: Total characters({total}) and column totals({sum_col_totals}) do not match"
-                    else:
-                        status = "Normal"
-
-                    row_data = [rel_path, file_name, sheet_name, status, emoji, f"{lang}", total] + col_totals
-                    data_rows_real.append(row_data)
-
-                # 고유 값 데이터 처리
-                for lang in PATTERNS:
-                    emoji = PATTERNS[lang][1]
-                    unique_col_totals = [unique_counts[col][lang] for col in valid_columns]
-                    total_unique = sum(unique_col_totals)
-                    row_data = [rel_path, file_name, sheet_name, "Normal", emoji, f"{lang}", total_unique] + unique_col_totals
-                    data_rows_unique_for_sheet.append(row_data)
-                
-                # 셀 주소 데이터 처리
-                for lang in PATTERNS:
-                    emoji = PATTERNS[lang][1]
-                    cell_col_addresses = [', '.join(cell_addresses[lang][col]) for col in valid_columns]
-                    total_cells = sum(len(cell_addresses[lang][col]) for col in valid_columns)
-                    row_data = [rel_path, file_name, sheet_name, "Normal", emoji, f"{lang}", total_cells] + cell_col_addresses
-                    data_rows_cell_address.append(row_data)
-                
-                # 셀 갯수 데이터 처리
-                for lang in PATTERNS:
-                    emoji = PATTERNS[lang][1]
-                    cell_col_counts = [cell_counts[lang][col] for col in valid_columns]
-                    total_cells = sum(cell_col_counts)
-                    row_data = [rel_path, file_name, sheet_name, "Normal", emoji, f"{lang}", total_cells] + cell_col_counts
-                    data_rows_cells.append(row_data)
-
-            processed_files += 1
-            print(t('UI_013', current_language).format(f"{processed_files}/{len(files_to_process)}"))
-
-        except Exception as e:
-            print(f"{t('UI_017', current_language)}: {file_name} {t('UI_018', current_language)}: {e}")
+    # 파일 순서대로 보고서 행 구성 (중단 없이 실행한 경우와 동일한 순서)
+    for rel_path in file_order:
+        record = file_records.get(rel_path)
+        if record is None:
             continue
+        all_columns.update(record['columns'])
+        data_rows_real.extend(record['rows']['real'])
+        data_rows_unique_for_sheet.extend(record['rows']['unique_for_sheet'])
+        data_rows_cell_address.extend(record['rows']['cell_address'])
+        data_rows_cells.extend(record['rows']['cells'])
+        data_rows_delta.extend(record['rows'].get('delta', []))
 
     print(f"\n{t('UI_014', current_language)}")
     # Summary_real 시트의 헤더 추가
@@ -374,49 +543,270 @@ def main(current_language='ko'):
     column_headers = [f"Col {get_column_letter(col+1)}" for col in sorted_columns]
     headers = ['Path', 'FileName', 'SheetName', 'Status', '🏳️', 'Char', 'TotalChars'] + column_headers
     
+    # Excel 크기 한도를 넘는 시트는 이어지는 시트/워크북으로 나누어 저장
+    writer = ReportWriter(report_path, finish_sheet=adjust_column_widths)
+
     # Summary_real 시트에 데이터 추가
-    report_ws_real.append(headers)
-    for row in data_rows_real:
-        report_ws_real.append(row)
-    adjust_column_widths(report_ws_real)
+    writer.write_sheet('Summary_real', headers, data_rows_real)
 
     # Summary_unique_for_Sheet 시트에 데이터 추가
-    report_ws_unique_for_sheet.append(headers)
-    for row in data_rows_unique_for_sheet:
-        report_ws_unique_for_sheet.append(row)
-    adjust_column_widths(report_ws_unique_for_sheet)
+    writer.write_sheet('Summary_unique_for_Sheet', headers, data_rows_unique_for_sheet)
     
     # Summary_unique_for_Folder 시트에 데이터 추가
-    report_ws_unique_for_folder.append(headers)
+    data_rows_unique_for_folder = []
+    folder_status = temp_manager.get_unique_status()
     for lang in PATTERNS:
         emoji = PATTERNS[lang][1]
         # count_characters 함수를 사용하여 글자 수 계산
         total_chars = temp_manager.get_total_chars(lang)
-        row_data = ['ALL', 'ALL', 'ALL', 'Normal', emoji, f"{lang}", total_chars] + [0] * len(sorted_columns)
-        report_ws_unique_for_folder.append(row_data)
-    adjust_column_widths(report_ws_unique_for_folder)
+        row_data = ['ALL', 'ALL', 'ALL', folder_status, emoji, f"{lang}", total_chars] + [0] * len(sorted_columns)
+        data_rows_unique_for_folder.append(row_data)
+    writer.write_sheet('Summary_unique_for_Folder', headers, data_rows_unique_for_folder)
     
     # Summary_cell_address 시트에 데이터 추가
     cell_address_headers = headers.copy()
     cell_address_headers[5] = 'TotalCells'  # F1 셀의 헤더 변경
-    report_ws_cell_address.append(cell_address_headers)
-    for row in data_rows_cell_address:
-        report_ws_cell_address.append(row)
-    adjust_column_widths(report_ws_cell_address)
+    writer.write_sheet('Summary_cell_address', cell_address_headers, data_rows_cell_address)
     
     # Summary_cells 시트에 데이터 추가
     cells_headers = headers.copy()
     cells_headers[5] = 'TotalCells'  # F1 셀의 헤더 변경
-    report_ws_cells.append(cells_headers)
-    for row in data_rows_cells:
-        report_ws_cells.append(row)
-    adjust_column_widths(report_ws_cells)
+    writer.write_sheet('Summary_cells', cells_headers, data_rows_cells)
 
-    # 임시 파일 정리
-    temp_manager.cleanup()
+    # Summary_delta 시트 (--baseline 사용 시 기준 대비 새/변경/유지 셀의 글자 수, 폴더 합계는 ALL 행)
+    if any('delta' in record['rows'] for record in file_records.values()):
+        delta_rows = data_rows_delta + get_delta_total_rows(data_rows_delta)
+        writer.write_sheet('Summary_delta', get_delta_headers(['Chars'], 'Char'), delta_rows, key_columns=6)
 
-    report_wb.save(report_path)
+    report_paths = writer.close()
     print(f"{t('UI_015', current_language)}: {report_path}")
+    if writer.split:
+        print(f"{t('UI_026', current_language)}: {', '.join(os.path.basename(path) for path in report_paths)}")
+
+def main(current_language='ko', prefetch_depth=PREFETCH_DEPTH, prefetch_process=False, resume=False,
+         shard=None, shard_balance='hash', hll_error=None, non_text='count',
+         include=None, exclude=None, scan_workers=DISCOVERY_WORKERS,
+         memory_budget=None, read_workers=DEFAULT_READ_WORKERS, xlsx_reader='xml', unique_memory=DEFAULT_UNIQUE_MEMORY,
+         results_db=False, sheet_workers=0, baseline=None):
+    # exe 파일이 실행된 경로를 기준으로 설정
+    folder_path = os.path.dirname(os.path.abspath(sys.executable)) if getattr(sys, 'frozen', False) else os.path.dirname(os.path.abspath(__file__))
+    print(f"{t('UI_006', current_language)}: {folder_path}")
+    
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    report_name = f"CHAR_COUNT_REPORT_{timestamp}.xlsx"
+    report_path = os.path.join(folder_path, report_name)
+    if not shard:
+        print(f"{t('UI_007', current_language)}: {report_path}")
+
+    # 기준 실행의 결과 데이터베이스로 새/변경/유지 셀을 분류할 색인을 만듦
+    baseline_index = None
+    if baseline:
+        baseline_index = BaselineIndex(baseline)
+        print(t('UI_037', current_language).format(baseline_index.path, len(baseline_index)))
+
+    # 하위 폴더를 포함한 엑셀 파일 탐색 (찾는 대로 분석을 시작하고 탐색은 함께 진행)
+    discovery = FileDiscovery(folder_path, include=include, exclude=exclude, workers=scan_workers)
+
+    # 샤드 실행이면 이 샤드에 배정된 파일만 처리하고, 보고서 대신 결과 묶음을 남김
+    # (샤드 배정에는 전체 파일 목록이 필요하므로 탐색을 먼저 마침)
+    if shard:
+        shard_index, shard_count = shard
+        files_to_process = discovery.collect()
+        print(f"{t('UI_008', current_language)}: {[f[1] for f in files_to_process]}")
+        work_files = select_shard_files(folder_path, files_to_process, shard_index, shard_count, shard_balance)
+        bundle_dir = get_shard_dir(folder_path, 'chars', shard_index, shard_count)
+        print(t('UI_023', current_language).format(f"{shard_index}/{shard_count}", len(work_files)))
+    else:
+        print(t('UI_027', current_language))
+        work_files = discovery
+        bundle_dir = os.path.join(folder_path, CHECKPOINT_DIR_PREFIX + 'chars')
+
+    # 체크포인트 (완료된 파일 결과와 폴더 전체 고유 집합 상태를 주기적으로 저장)
+    # 근사 고유 값 모드, 숫자/날짜 열 처리 방식, 읽기 방식과 기준에 따라 결과가 달라지므로 설정이 다르면 이어서 처리하지 않음
+    options = {'hll_error': hll_error, 'non_text': non_text, 'xlsx_reader': xlsx_reader, 'results_db': results_db,
+               'baseline': baseline_index.path if baseline_index is not None else None}
+    if shard:
+        options.update({'shard': [shard_index, shard_count], 'shard_balance': shard_balance,
+                        'include': include, 'exclude': exclude})
+    checkpoint = ResultBundle(bundle_dir, 'chars', options=options)
+    checkpoint.files = discovery.rel_paths  # 탐색이 진행되며 채워짐
+    file_records = {}
+    if resume and checkpoint.load():
+        file_records = {record['rel_path']: record for record in checkpoint.get_file_records()}
+        print(t('UI_021', current_language).format(len(file_records)))
+    else:
+        checkpoint.reset()
+
+    # 임시 파일 매니저 초기화 (체크포인트 디렉토리에 저장하여 재개 시 복원)
+    temp_manager = TempFileManager(folder_path, temp_dir=checkpoint.unique_dir, hll_error=hll_error,
+                                   unique_memory=unique_memory)
+    temp_manager.restore_state(checkpoint.unique_state)
+
+    # 셀 단위 결과 데이터베이스 (결과 묶음 안에 기록하여 재개 시 이어서 쓰고, 보고서를 저장하면 보고서 옆으로 옮김)
+    cell_results = ResultsDatabase(os.path.join(bundle_dir, RESULTS_DB_FILE), PATTERNS) if results_db else None
+
+    processed_files = len(file_records)
+    pending_files = (f for f in work_files if f[0] not in file_records)
+    pending_total = sum(f[0] not in file_records for f in work_files) if discovery.finished else None
+
+    if discovery.finished:
+        print(t('UI_009', current_language).format(len(work_files)))
+    print(t('UI_010', current_language))
+
+    # 콘솔 출력이 가능한지 확인
+    has_console = hasattr(sys.stdout, 'write') and sys.stdout is not None
+    
+    # 현재 워크북을 분석하는 동안 다음 워크북들을 백그라운드에서 미리 읽음
+    # xml 읽기 방식은 XLSX/XLSM을 DataFrame 없이 공유 문자열과 시트 XML에서 바로 열별 값으로 묶음
+    reader = read_workbook_groups if xlsx_reader == 'xml' else read_workbook
+    if memory_budget:
+        # 메모리 예산 안에서 여러 워크북을 동시에 읽음 (큰 파일은 스트리밍 읽기)
+        budget = MemoryBudget(memory_budget, stream_reader=read_workbook_groups, workers=read_workers,
+                              log_path=os.path.join(folder_path, MEMORY_LOG_FILE))
+        workbooks = prefetch_workbooks_within_budget(folder_path, pending_files, budget, prefetch_depth,
+                                                     use_process=prefetch_process, reader=reader)
+    else:
+        budget = None
+        workbooks = prefetch_workbooks(folder_path, pending_files, depth=prefetch_depth, use_process=prefetch_process,
+                                       reader=reader)
+
+    # 시트가 여럿인 워크북은 시트 단위로 워커 프로세스에 나누어 분석 (0이면 순차 분석)
+    sheet_pool = SheetPool(sheet_workers, init_sheet_worker, (baseline_index,))
+
+    try:
+        for rel_path, file_name, sheets, read_error in tqdm(workbooks, total=pending_total, desc="processing files", disable=not has_console):
+            file_rows = new_file_rows()  # 이 파일의 보고서 행
+            if baseline_index is not None:
+                file_rows['delta'] = []  # 기준 대비 새/변경/유지 셀의 글자 수
+            file_columns = set()  # 이 파일의 유효한 열
+            shared_counts = None  # 공유 문자열별 글자 수 (워크북의 모든 시트가 함께 사용)
+            try:
+                print(f"\n{t('UI_011', current_language)}: {file_name}")
+                if cell_results is not None:
+                    cell_results.begin_file(rel_path, file_name)
+
+                def analyze_in_process(sheet_name, df):
+                    # XML에서 읽은 시트는 공유 문자열을 워크북당 한 번만 분류하여 모든 시트가 함께 사용
+                    nonlocal shared_counts
+                    if isinstance(df, GroupedSheet) and shared_counts is None:
+                        shared_counts = get_shared_string_counts(df.shared_strings)
+                    return analyze_sheet_task(rel_path, file_name, sheet_name, df, non_text, shared_counts,
+                                              cell_results, current_language, baseline_index)
+
+                # 시트가 여럿이면 워커 프로세스에서 동시에 분석하고 결과는 시트 순서대로 반영
+                worker_task = partial(run_sheet_task_in_worker, rel_path, file_name, non_text, results_db, current_language)
+                for sheet_name, result in sheet_pool.map(sheets, analyze_in_process, worker_task, strip_shared_strings):
+                    apply_sheet_result(result, file_rows, file_columns, temp_manager, cell_results)
+
+                if read_error is not None:
+                    raise read_error
+
+                processed_files += 1
+                print(t('UI_013', current_language).format(f"{processed_files}/{len(work_files) if shard else discovery.format_count()}"))
+
+            except Exception as e:
+                print(f"{t('UI_017', current_language)}: {file_name} {t('UI_018', current_language)}: {e}")
+
+            # 오류가 난 파일도 그때까지의 결과를 그대로 기록 (재개 시 다시 처리하지 않음)
+            if cell_results is not None:
+                cell_results.commit_file()
+            file_records[rel_path] = checkpoint.add_file(rel_path, file_name, file_rows, file_columns)
+            checkpoint.maybe_save(temp_manager)
+
+        # 보고서 저장에 실패해도 --resume으로 다시 생성할 수 있도록 마지막 상태 저장
+        checkpoint.save(temp_manager)
+    except KeyboardInterrupt:
+        checkpoint.save(temp_manager)
+        print(f"\n{t('UI_022', current_language)}")
+        raise
+    finally:
+        sheet_pool.close()
+        if budget is not None:
+            budget.close()
+        if cell_results is not None:
+            cell_results.close()
+
+    if sheet_pool.parallel_sheets:
+        print(t('UI_036', current_language).format(sheet_pool.parallel_sheets, sheet_workers))
+
+    if budget is not None:
+        print(t('UI_028', current_language).format(format_memory_size(budget.peak_reserved), format_memory_size(budget.limit),
+                                                   budget.streamed_files, budget.log_path))
+
+    if temp_manager.store.spills:
+        print(t('UI_032', current_language).format(format_memory_size(temp_manager.store.memory_limit), temp_manager.store.spills))
+
+    if shard:
+        # 샤드 실행은 완료 표시만 남기고 보고서는 merge 단계에서 작성
+        checkpoint.finished = True
+        checkpoint.save(temp_manager)
+        print(f"{t('UI_024', current_language)}: {bundle_dir}")
+        return
+
+    print(t('UI_009', current_language).format(len(discovery)))
+    write_report(report_path, discovery.rel_paths, file_records, temp_manager, current_language)
+    if cell_results is not None:
+        cell_results.save_as(get_results_db_path(report_path))
+        print(f"{t('UI_033', current_language)}: {cell_results.path}")
+
+    # 보고서가 저장된 후 임시 파일 및 체크포인트 정리
+    temp_manager.cleanup()
+    checkpoint.remove()
+
+def merge(current_language='ko', bundle_dirs=None, unique_memory=DEFAULT_UNIQUE_MEMORY):
+    """샤드 결과 묶음을 합쳐 일반 실행과 같은 보고서 작성
+
+    bundle_dirs를 지정하지 않으면 분석 폴더의 샤드 결과 묶음을 모두 사용한다.
+    샤드별 고유 집합 임시 파일을 합집합으로 읽으므로 폴더 전체 고유 값 수도 정확하다.
+    """
+    # exe 파일이 실행된 경로를 기준으로 설정
+    folder_path = os.path.dirname(os.path.abspath(sys.executable)) if getattr(sys, 'frozen', False) else os.path.dirname(os.path.abspath(__file__))
+    print(f"{t('UI_006', current_language)}: {folder_path}")
+
+    if not bundle_dirs:
+        bundle_dirs = find_shard_dirs(folder_path, 'chars')
+    print(t('UI_025', current_language).format(len(bundle_dirs)))
+    file_order, file_records, bundles = load_shard_bundles(bundle_dirs, 'chars')
+
+    temp_manager = TempFileManager(folder_path, hll_error=bundles[0].options.get('hll_error'), unique_memory=unique_memory)
+    for bundle in bundles:
+        temp_manager.merge_state(bundle.unique_state, bundle.unique_dir)
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    report_name = f"CHAR_COUNT_REPORT_{timestamp}.xlsx"
+    report_path = os.path.join(folder_path, report_name)
+    print(f"{t('UI_007', current_language)}: {report_path}")
+
+    write_report(report_path, file_order, file_records, temp_manager, current_language)
+    temp_manager.cleanup()
+
+    if bundles[0].options.get('results_db'):
+        # 샤드별 셀 단위 결과 데이터베이스를 하나로 합침
+        cell_results = ResultsDatabase(get_results_db_path(report_path), PATTERNS)
+        for bundle in bundles:
+            cell_results.merge_from(os.path.join(bundle.bundle_dir, RESULTS_DB_FILE))
+        cell_results.close()
+        print(f"{t('UI_033', current_language)}: {cell_results.path}")
+
+def estimate(current_language='ko', target_error=DEFAULT_TARGET_ERROR, prefetch_depth=PREFETCH_DEPTH, non_text='count',
+             include=None, exclude=None, scan_workers=DISCOVERY_WORKERS):
+    """파일과 시트별 행을 표본으로 세어 폴더 전체 글자 수를 신뢰구간과 함께 추정 (견적용 빠른 실행)"""
+    folder_path = os.path.dirname(os.path.abspath(sys.executable)) if getattr(sys, 'frozen', False) else os.path.dirname(os.path.abspath(__file__))
+    print(f"{t('UI_006', current_language)}: {folder_path}")
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    report_path = os.path.join(folder_path, f"CHAR_ESTIMATE_REPORT_{timestamp}.xlsx")
+    print(f"{t('UI_007', current_language)}: {report_path}")
+
+    # 파일 표본은 전체 목록에서 뽑으므로 탐색을 먼저 마침
+    files = FileDiscovery(folder_path, include=include, exclude=exclude, workers=scan_workers).collect()
+    print(t('UI_009', current_language).format(len(files)))
+    print(t('UI_030', current_language).format(f"{target_error:.1%}"))
+
+    estimator = estimate_folder(folder_path, files, lambda df: get_row_count_matrix(df, non_text),
+                                target_error, current_language, prefetch_depth)
+    categories = [(lang, PATTERNS[lang][1]) for lang in PATTERNS]
+    write_estimate_report(report_path, estimator, categories, target_error, current_language, adjust_column_widths)
 
 if __name__ == "__main__":
     try:
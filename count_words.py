@@ -1,8 +1,8 @@
 import os
 import sys
+import numpy as np
 import pandas as pd
 import re
-from openpyxl import Workbook
 from openpyxl.utils import get_column_letter
 from openpyxl.styles import Alignment
 from datetime import datetime
@@ -10,7 +10,10 @@ from tqdm import tqdm
 import tempfile
 import json
 import shutil
+import hashlib
+import time
 from collections import defaultdict, Counter
+from functools import lru_cache, partial
 
 # 언어 감지 및 자연어 처리 라이브러리
 try:
@@ -20,98 +23,24 @@ except ImportError:
     print("Warning: langdetect not installed. Please install with: pip install langdetect")
     detect = None
 
-try:
-    from kiwipiepy import Kiwi
-    kiwi = Kiwi()
-    print("Korean processor: Kiwi loaded successfully")
-except (ImportError, Exception) as e:
-    print(f"Warning: kiwipiepy not available ({e}). Korean text will use basic split().")
-    kiwi = None
-
-try:
-    import spacy
-    # 다양한 언어 모델 로드
-    nlp_models = {}
-    
-    # 지원하는 spacy 모델들 (현재 버전에서 사용 가능한 것들만)
-    spacy_models = {
-        'en': 'en_core_web_sm',
-        'es': 'es_core_news_sm', 
-        'fr': 'fr_core_news_sm',
-        'de': 'de_core_news_sm',
-        'pt': 'pt_core_news_sm',
-        'it': 'it_core_news_sm',
-        'ru': 'ru_core_news_sm'
-        # tr, vi, th, id 모델들은 현재 spaCy 버전에서 지원되지 않음
-    }
-    
-    for lang_code, model_name in spacy_models.items():
-        try:
-            # PyInstaller 환경에서 모델 경로 찾기
-            import sys
-            import os
-            
-            if getattr(sys, 'frozen', False):
-                # 실행 파일 환경
-                base_path = sys._MEIPASS
-                model_path = os.path.join(base_path, 'spacy_models', model_name)
-                
-                # 모델 경로 확인 및 로드
-                if os.path.exists(model_path):
-                    # config.cfg 파일이 있는지 확인
-                    config_path = os.path.join(model_path, f'{model_name}-3.8.0', 'config.cfg')
-                    if os.path.exists(config_path):
-                        nlp_models[lang_code] = spacy.load(model_path)
-                        print(f"Loaded {lang_code} model from bundled path: {model_path}")
-                    else:
-                        # 전체 모델 디렉토리에서 찾기
-                        for root, dirs, files in os.walk(model_path):
-                            if 'config.cfg' in files:
-                                actual_model_path = root
-                                nlp_models[lang_code] = spacy.load(actual_model_path)
-                                print(f"Loaded {lang_code} model from: {actual_model_path}")
-                                break
-                        else:
-                            raise Exception(f"config.cfg not found in {model_path}")
-                else:
-                    # 기본 경로로 시도
-                    nlp_models[lang_code] = spacy.load(model_name)
-                    print(f"Loaded {lang_code} model: {model_name}")
-            else:
-                # 개발 환경
-                nlp_models[lang_code] = spacy.load(model_name)
-                print(f"Loaded {lang_code} model: {model_name}")
-        except Exception as e:
-            print(f"Warning: {model_name} not available ({e}). Will use basic split().")
-        
-except ImportError:
-    print("Warning: spacy not installed. Please install with: pip install spacy")
-    nlp_models = {}
-
-try:
-    import jieba
-    import jieba.posseg as pseg
-except ImportError:
-    print("Warning: jieba not installed. Please install with: pip install jieba")
-    jieba = None
-    pseg = None
-
-try:
-    import stanza
-    # 일본어 모델 다운로드 및 로드
-    try:
-        nlp_ja = stanza.Pipeline('ja', verbose=False)
-        print("Japanese processor: Stanza loaded successfully")
-    except:
-        # 모델이 없으면 다운로드 시도
-        stanza.download('ja', verbose=False)
-        nlp_ja = stanza.Pipeline('ja', verbose=False)
-        print("Japanese processor: Stanza loaded successfully")
-except (ImportError, Exception) as e:
-    print(f"Warning: stanza not available ({e}). Japanese text will use basic split().")
-    nlp_ja = None
-
 from translations import t
+from word_tokenizers import (tokenize_texts, set_tokenizer_profile, load_tokenizers, tokenizer_stats,
+                        get_tokenizer_state, merge_tokenizer_state, TOKENIZER_PROFILES, DEFAULT_TOKENIZER_PROFILE)
+from sketches import HyperLogLog, SpaceSaving, TOP_COUNTERS_PER_ITEM
+from unique_store import UniqueStore, DEFAULT_UNIQUE_MEMORY
+from results_db import ResultsDatabase, CellResultsBuffer, RESULTS_DB_FILE, get_results_db_path
+from baseline import BaselineIndex, new_delta_counts, add_delta_counts, get_delta_headers, get_delta_total_rows
+from sheet_pool import SheetPool
+from report_writer import ReportWriter
+from file_discovery import FileDiscovery, DISCOVERY_WORKERS
+from repetition import analyze_repetitions, make_segment, MATCH_BAND_NAMES
+from estimate import estimate_folder, write_estimate_report, shuffle_files, DEFAULT_TARGET_ERROR, INITIAL_SAMPLE_FILES
+from tokenizer_benchmark import run_benchmark, write_benchmark_report, DEFAULT_BENCHMARK_TEXTS
+from memory_budget import (MemoryBudget, prefetch_workbooks_within_budget, format_memory_size, get_process_memory,
+                           MEMORY_LOG_FILE, DEFAULT_READ_WORKERS)
+from workbook_reader import prefetch_workbooks, group_distinct_values, is_non_text_column, PREFETCH_DEPTH
+from result_bundle import (ResultBundle, new_file_rows, CHECKPOINT_DIR_PREFIX,
+                           get_shard_dir, find_shard_dirs, select_shard_files, load_shard_bundles)
 
 # 지원 언어 매핑 (langdetect 코드 -> 표시명)
 LANGUAGE_MAPPING = {
@@ -140,6 +69,105 @@ SPECIAL_PATTERNS = {
     'file_paths': re.compile(r'([a-zA-Z]:\\[^ ]+|/[^ ]+)')
 }
 
+# 특수 패턴별로 일치가 시작될 수 있는 문자열 (없으면 해당 패턴의 findall/sub를 생략)
+SPECIAL_PATTERN_TRIGGERS = {
+    'html_xml': ('<',),
+    'brackets': ('{',),
+    'newlines': ('\\n',),
+    'file_paths': ('/', ':\\')
+}
+# 모든 트리거를 하나로 묶은 정규식 (특수 패턴이 없는 대부분의 셀은 한 번의 검색으로 끝남)
+SPECIAL_PATTERN_TRIGGER = re.compile('|'.join(
+    re.escape(trigger) for triggers in SPECIAL_PATTERN_TRIGGERS.values() for trigger in triggers))
+NO_SPECIAL_PATTERNS = (0,) * len(SPECIAL_PATTERNS)
+
+# 결과 데이터베이스에 셀마다 기록할 개수 열 (셀 언어의 단어 수 + 특수 패턴별 개수)
+RESULTS_DB_COLUMNS = ['Words'] + list(SPECIAL_PATTERNS)
+
+# Words_tokenizers 시트 헤더 (언어/백엔드별 토큰화 처리량)
+TOKENIZER_HEADERS = ['Profile', 'Category', 'Backend', 'Texts', 'Chars', 'Tokens', 'Seconds', 'TokensPerSecond']
+SPECIAL_SCAN_CACHE_SIZE = 65536  # 같은 셀 텍스트의 결과를 개수 집계/언어 감지/토큰화에서 재사용
+SPECIAL_SCAN_CACHE_MAX_CHARS = 1000  # 이보다 긴 텍스트는 캐시하지 않음 (원문과 치환본이 함께 남으므로 항목 수만으로는 메모리가 제한되지 않음)
+
+# 토크나이저에 한 번에 넘길 최대 글자 수 (이보다 긴 셀은 문장/공백 경계에서 나누어 배치로 토큰화)
+TOKENIZE_CHUNK_CHARS = 5000
+TOKENIZE_CHUNK_BATCH = 8  # 한 번에 넘길 조각 수 (배치마다 감시 한도를 확인)
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?。！？])\s+|\n+')
+
+# 긴 셀 하나의 토큰화 한도 (넘으면 남은 조각은 split()으로 세고 Words_watchdog 시트에 셀 주소를 기록)
+CELL_TOKENIZE_SECONDS = 30
+CELL_TOKENIZE_MEMORY = 1 << 30  # 조각 묶음 사이에 잰 프로세스 상주 메모리(RSS) 증가량 기준
+
+# 키/ID 열 카테고리 (열 언어 대신 사용하는 가상 언어 코드이자 표시명)
+IDENTIFIER_CATEGORY = 'Identifier'
+
+# 키/ID 값의 형태 (공백 없는 전체 일치)
+IDENTIFIER_PATTERN = re.compile(r'''
+    [0-9A-Fa-f]{8}(?:-[0-9A-Fa-f]{4}){3}-[0-9A-Fa-f]{12}          # UUID/GUID
+  | (?:0[xX])?(?=[0-9A-Fa-f]*[0-9])(?=[0-9A-Fa-f]*[A-Fa-f])[0-9A-Fa-f]{8,}  # 16진수 해시
+  | _*[A-Za-z0-9]+(?:[_.][A-Za-z0-9]+)+_*                     # snake_case, CONSTANT_CASE, dotted.key
+  | [a-z][a-z0-9]*(?:[A-Z][a-z0-9]*)+                         # camelCase
+  | [A-Z][a-z0-9]+(?:[A-Z][a-z0-9]*)+                         # PascalCase
+  | (?=[A-Za-z]*[0-9])(?=[0-9]*[A-Za-z])[A-Za-z0-9]+          # 영문+숫자 (btn01)
+''', re.VERBOSE)
+
+# 키/ID 열 판정 기준 (헤더 행 제외)
+IDENTIFIER_MIN_CELLS = 5         # 판정에 필요한 최소 텍스트 셀 수
+IDENTIFIER_MIN_SHARE = 0.9       # 키/ID 형태인 셀의 최소 비율
+IDENTIFIER_MIN_UNIQUENESS = 0.9  # 고유 값 수 / 셀 수의 최소 비율
+
+# 결과 행렬의 고정 카테고리 인덱스 (행: 언어 표시명 + 특수 패턴 + 키/ID, 열: 시트의 열)
+WORD_CATEGORIES = list(LANGUAGE_MAPPING.values()) + list(SPECIAL_PATTERNS) + [IDENTIFIER_CATEGORY]
+WORD_CATEGORY_INDEX = {category: i for i, category in enumerate(WORD_CATEGORIES)}
+
+# 셀 단위 라우팅용 문자 체계(script) 패턴
+SCRIPT_PATTERNS = {
+    'hangul': re.compile(r'[가-힣ㄱ-ㅎㅏ-ㅣ]'),
+    'kana': re.compile(r'[\u3040-\u30FF]'),
+    'han': re.compile(r'[\u4E00-\u9FFF]'),
+    'thai': re.compile(r'[\u0E00-\u0E7F]'),
+    'cyrillic': re.compile(r'[\u0400-\u04FF]'),
+    'latin': re.compile(r'[A-Za-zÀ-ÿĀ-ž]')
+}
+
+# 문자 체계별 대표 언어 (라틴 문자는 감지 실패 시 영어로 간주)
+SCRIPT_LANGUAGES = {
+    'hangul': 'ko',
+    'kana': 'ja',
+    'han': 'zh-cn',
+    'thai': 'th',
+    'cyrillic': 'ru',
+    'latin': 'en'
+}
+
+# 언어별로 자연스럽게 사용되는 문자 체계 (일본어는 한자 포함)
+LANGUAGE_SCRIPTS = {
+    'ko': ('hangul',),
+    'ja': ('kana', 'han'),
+    'zh-cn': ('han',),
+    'zh-tw': ('han',),
+    'th': ('thai',),
+    'ru': ('cyrillic',),
+    'en': ('latin',),
+    'es': ('latin',),
+    'pt': ('latin',),
+    'fr': ('latin',),
+    'it': ('latin',),
+    'de': ('latin',),
+    'vi': ('latin',),
+    'id': ('latin',),
+    'tr': ('latin',)
+}
+
+# 열 언어 감지 캐시 설정
+LANG_CACHE_FILE = '.countlocales_lang_cache.json'
+LANG_CACHE_VERSION = 1
+LANG_CACHE_SAMPLE_SIZE = 20      # 지문(fingerprint) 계산에 사용할 샘플 셀 수
+LANG_CACHE_MIN_CONFIDENCE = 0.9  # 캐시 결과를 신뢰할 최소 득표율
+LANG_CACHE_MIN_VOTES = 3         # 캐시 결과를 신뢰할 최소 득표 수
+LANG_CACHE_VERIFY_SAMPLES = 3    # 헤더 기반 결과를 검증할 샘플 셀 수
+LANG_CACHE_MAX_ENTRIES = 100000
+
 def detect_language(text):
     """텍스트의 언어를 감지"""
     if not detect:
@@ -147,10 +175,7 @@ def detect_language(text):
     
     try:
         # HTML/XML 태그 제거 (언어 감지 정확도 향상)
-        clean_text = text
-        for pattern_name, pattern in SPECIAL_PATTERNS.items():
-            clean_text = pattern.sub(' ', clean_text)
-        clean_text = clean_text.strip()
+        clean_text = remove_special_patterns(text).strip()
         
         # 너무 짧은 텍스트는 감지하지 않음 (정확도 향상을 위해 최소 길이 증가)
         if len(clean_text) < 10:
@@ -159,97 +184,212 @@ def detect_language(text):
     except:
         return 'unknown'
 
+def clean_text_for_words(text):
+    """특수 패턴 제거 및 전처리를 거친 토큰화용 텍스트 반환"""
+    # 특수 패턴 제거
+    clean_text = remove_special_patterns(text)
+    
+    # 전처리: 구두점과 하이픈 제거, 숫자/날짜/버전 패턴 보존
+    return preprocess_text(clean_text)
+
+# 한도를 넘거나 토크나이저 오류로 split()을 사용한 텍스트 ((언어, 텍스트) -> 기록), 시트마다 보고서 행으로 옮김
+tokenize_incidents = {}
+
+def record_tokenize_incident(language, text, status, seconds=0.0, peak_memory=0, fallback_chunks=1):
+    tokenize_incidents[(language, text)] = {'status': status, 'chars': len(text), 'seconds': round(seconds, 1),
+                                            'peak_memory': peak_memory, 'fallback_chunks': fallback_chunks}
+
+# 긴 셀 하나의 토큰화 시간/메모리 감시
+class TokenizeWatchdog:
+    """조각 배치를 토큰화할 때마다 경과 시간과 시작 시점 대비 프로세스 상주 메모리 증가량을 확인
+
+    한도를 넘으면 reason에 사유가 남고, 호출하는 쪽은 남은 조각을 split()으로 처리한다.
+    토크나이저 호출 도중에는 멈출 수 없으므로 한 번에 넘기는 양을 조각 크기로 제한한다.
+    메모리는 할당을 추적하지 않고 배치 사이에 get_process_memory()로만 재므로 미리 읽기 스레드를
+    느리게 하지 않는다 (그 스레드들이 같은 시간에 늘린 메모리도 함께 잡힌다).
+    """
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.baseline_memory = get_process_memory()
+        self.peak_memory = 0
+        self.reason = None
+
+    @property
+    def seconds(self):
+        return time.perf_counter() - self.started
+
+    def check(self):
+        """한도 안이면 True"""
+        if self.baseline_memory is not None:
+            self.peak_memory = max(self.peak_memory, (get_process_memory() or 0) - self.baseline_memory)
+        if self.seconds > CELL_TOKENIZE_SECONDS:
+            self.reason = f"Warning: Time limit exceeded ({CELL_TOKENIZE_SECONDS}s)"
+        elif self.peak_memory > CELL_TOKENIZE_MEMORY:
+            self.reason = f"Warning: Memory limit exceeded ({CELL_TOKENIZE_MEMORY >> 20}MB)"
+        return self.reason is None
+
+    def fail(self, error):
+        self.reason = f"Warning: Tokenizer error ({error})"
+
+def split_text_into_chunks(text, max_chars=TOKENIZE_CHUNK_CHARS):
+    """긴 텍스트를 문장 경계(문장이 너무 길면 공백, 공백도 없으면 글자 수)에서 max_chars 이하의 조각으로 나눔"""
+    pieces = []
+    for sentence in SENTENCE_BOUNDARY.split(text):
+        while len(sentence) > max_chars:
+            cut = sentence.rfind(' ', 0, max_chars)
+            if cut <= 0:
+                cut = max_chars
+            pieces.append(sentence[:cut])
+            sentence = sentence[cut:].lstrip()
+        pieces.append(sentence)
+
+    chunks = []
+    current = ''
+    for piece in pieces:
+        if not piece.strip():
+            continue
+        if current and len(current) + 1 + len(piece) > max_chars:
+            chunks.append(current)
+            current = piece
+        else:
+            current = f"{current} {piece}" if current else piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+def tokenize_clean_texts(clean_texts, language):
+    """전처리된 텍스트 목록을 언어별 토크나이저에 배치로 전달 (토크나이저 오류는 그대로 발생)"""
+    # 백엔드는 현재 토크나이저 프로필(--tokenizer-profile)에 따라 tokenizers 모듈에서 선택
+    return tokenize_texts(clean_texts, language)
+
+def tokenize_long_text(text, language):
+    """긴 텍스트를 조각으로 나누어 배치로 전처리/토큰화
+
+    전처리(preprocess_text)도 조각마다 하므로 텍스트 길이에 비례하는 시간만 걸린다.
+    TokenizeWatchdog 한도를 넘거나 토크나이저 오류가 나면 남은 조각은 split()으로 세고 기록한다.
+    """
+    chunks = split_text_into_chunks(remove_special_patterns(text))
+    watchdog = TokenizeWatchdog()
+    words = []
+    fallback_chunks = 0
+    for start in range(0, len(chunks), TOKENIZE_CHUNK_BATCH):
+        batch = [preprocess_text(chunk) for chunk in chunks[start:start + TOKENIZE_CHUNK_BATCH]]
+        if watchdog.reason is None:
+            try:
+                for chunk_words in tokenize_clean_texts(batch, language):
+                    words.extend(chunk_words)
+                watchdog.check()
+                continue
+            except Exception as e:
+                watchdog.fail(e)
+        fallback_chunks += len(batch)
+        for clean_text in batch:
+            words.extend(clean_text.split())
+    if watchdog.reason is not None:
+        record_tokenize_incident(language, text, watchdog.reason, watchdog.seconds, watchdog.peak_memory, fallback_chunks)
+    return words
+
 def process_text_by_language(text, language):
     """언어별로 텍스트를 단어로 분리"""
     if not text or pd.isna(text) or str(text).strip() == '':
         return []
     
     text = str(text).strip()
+    if language == IDENTIFIER_CATEGORY:
+        # 키/ID 열은 토큰화하지 않고 셀 값 전체를 하나의 항목으로 셈
+        return [text]
     
-    # 특수 패턴 제거
-    clean_text = text
-    for pattern_name, pattern in SPECIAL_PATTERNS.items():
-        clean_text = pattern.sub(' ', clean_text)
+    if len(text) > TOKENIZE_CHUNK_CHARS:
+        # 매우 긴 셀 (문서, 로그 등): 조각으로 나누어 배치로 토큰화하고 시간/메모리를 감시
+        return [word for word in tokenize_long_text(text, language) if word.strip()]
     
-    # 전처리: 구두점과 하이픈 제거, 숫자/날짜/버전 패턴 보존
-    clean_text = preprocess_text(clean_text)
+    clean_text = clean_text_for_words(text)
     
-    # 공백으로 분리하여 기본 단어 추출
-    words = []
+    try:
+        # 언어별 토크나이저 (없으면 기본 split())
+        words = tokenize_clean_texts([clean_text], language)[0]
+    except Exception as e:
+        # 토크나이저 오류: split()으로 세고 보고서에 기록
+        words = clean_text.split()
+        record_tokenize_incident(language, text, f"Warning: Tokenizer error ({e})")
     
-    if language == 'ko' and kiwi:
-        # 한국어: Kiwi 사용 - 조사, 접속조사, 구두점, 숫자, 보조사, 접미사, 어미 제외
-        try:
-            tokens = kiwi.tokenize(clean_text)
-            # 조사(J), 접속조사(JC), 구두점(SF), 숫자(SN), 보조사(XS), 접미사(XP), 어미(E) 제외
-            # 단, 명사(N), 동사(V), 형용사(VA), 부사(MA), 감탄사(IC)는 포함
-            words = [token.form for token in tokens 
-                     if token.form.strip() 
-                     and not token.tag.startswith(('J', 'JC', 'SF', 'SN', 'XS', 'XP', 'E'))]  # 조사, 접속조사, 구두점, 숫자, 보조사, 접미사, 어미 제외
-        except:
-            words = clean_text.split()
-    
-    elif language in nlp_models:
-        # spaCy 지원 언어들: 전치사, 접속사, 관사, 대명사, 구두점, 숫자 제외
-        try:
-            doc = nlp_models[language](clean_text)
-            # 전치사(ADP), 접속사(CCONJ, SCONJ), 관사(DET), 대명사(PRON), 구두점(PUNCT), 숫자(NUM) 제외
-            # 감탄사(INTJ), 명사(NOUN), 동사(VERB), 형용사(ADJ), 부사(ADV) 등은 포함
-            words = [token.text for token in doc 
-                     if not token.is_space 
-                     and token.text.strip()
-                     and len(token.text) > 1  # 1글자 단어 제외 (단, 의미있는 단어는 예외)
-                     and token.pos_ not in ('ADP', 'CCONJ', 'SCONJ', 'DET', 'PRON', 'PUNCT', 'NUM')
-                     and not token.is_punct  # 구두점 추가 체크
-                     and not token.like_num]  # 숫자 패턴 추가 체크
-        except:
-            words = clean_text.split()
-    
-    elif language in ['zh-cn', 'zh-tw'] and jieba and pseg:
-        # 중국어(간체/번체): jieba posseg 사용 - 조사, 어조사, 접속사, 구두점, 숫자 제외
-        try:
-            # 조사(u), 어조사(y), 접속사(c), 구두점(x), 숫자(m) 제외
-            # 감탄사(e), 명사(n), 동사(v), 형용사(a), 부사(d) 등은 포함
-            words = [word for word, flag in pseg.cut(clean_text) 
-                     if word.strip() 
-                     and flag not in ('u', 'y', 'c', 'x', 'm')]
-        except:
-            words = clean_text.split()
-    
-    elif language == 'ja' and nlp_ja:
-        # 일본어: Stanza 사용 - 조사, 조동사, 접속사, 구두점, 숫자 제외
-        try:
-            doc = nlp_ja(clean_text)
-            words = []
-            for sent in doc.sentences:
-                for token in sent.tokens:
-                    # 조사(ADP), 조동사(AUX), 접속사(CCONJ, SCONJ), 구두점(PUNCT), 숫자(NUM) 제외
-                    # 감탄사(INTJ), 명사(NOUN), 동사(VERB), 형용사(ADJ), 부사(ADV) 등은 포함
-                    if (token.pos not in ('ADP', 'AUX', 'CCONJ', 'SCONJ', 'PUNCT', 'NUM')
-                        and token.text.strip()):
-                        words.append(token.text)
-        except:
-            words = clean_text.split()
+    return [word for word in words if word.strip()]
+
+def process_texts_by_language(texts, language):
+    """같은 언어의 여러 텍스트를 한 번의 배치로 토크나이저에 전달하여 단어로 분리 (긴 텍스트는 따로 조각으로 처리)"""
+    results = [[] for _ in texts]
+    batch_indexes = []
+    batch_texts = []
+    for i, text in enumerate(texts):
+        if not text or pd.isna(text) or str(text).strip() == '':
+            continue
+        if len(str(text).strip()) > TOKENIZE_CHUNK_CHARS:
+            results[i] = process_text_by_language(texts[i], language)
+            continue
+        batch_indexes.append(i)
+        batch_texts.append(clean_text_for_words(str(text).strip()))
     
+    if not batch_texts:
+        return results
+    
+    try:
+        batch_words = tokenize_clean_texts(batch_texts, language)
+    except Exception:
+        # 배치 처리 실패 시 텍스트별로 처리 (오류가 난 텍스트만 split()으로 세고 기록)
+        for i in batch_indexes:
+            results[i] = process_text_by_language(texts[i], language)
     else:
-        # 기타 언어: 기본 split() 사용
-        words = clean_text.split()
+        for i, words in zip(batch_indexes, batch_words):
+            results[i] = [word for word in words if word.strip()]
     
-    return [word for word in words if word.strip()]
+    return results
 
 def extract_special_patterns(text):
     """특수 패턴들을 추출하여 카테고리별로 분류"""
     if not text or pd.isna(text) or str(text).strip() == '':
         return {}
     
-    text = str(text)
-    pattern_counts = {}
-    
+    counts, _ = scan_special_patterns(str(text))
+    return dict(zip(SPECIAL_PATTERNS, counts))
+
+def scan_special_patterns(text):
+    """특수 패턴별 개수(SPECIAL_PATTERNS 순서)와 패턴을 공백으로 치환한 텍스트를 함께 계산
+
+    개수는 패턴별 findall, 텍스트는 패턴 순서대로 sub(' ')를 적용한 결과와 같다.
+    트리거 문자열이 없는 패턴은 건너뛰고, 원문에 일치가 없고 앞선 치환도 없었던 패턴은
+    sub를 생략한다. SPECIAL_SCAN_CACHE_MAX_CHARS 이하의 텍스트는 결과를 캐시하여 한 셀을 여러
+    분석 함수에서 다시 보더라도 한 번만 계산하며, 캐시는 파일(워커에서는 시트)마다 비운다.
+    """
+    if len(text) > SPECIAL_SCAN_CACHE_MAX_CHARS:
+        return compute_special_patterns(text)
+    return cached_special_patterns(text)
+
+def compute_special_patterns(text):
+    """scan_special_patterns의 계산 (캐시 없음)"""
+    if not SPECIAL_PATTERN_TRIGGER.search(text):
+        return NO_SPECIAL_PATTERNS, text
+
+    counts = []
     for pattern_name, pattern in SPECIAL_PATTERNS.items():
-        matches = pattern.findall(text)
-        pattern_counts[pattern_name] = len(matches)
-    
-    return pattern_counts
+        if any(trigger in text for trigger in SPECIAL_PATTERN_TRIGGERS[pattern_name]):
+            counts.append(len(pattern.findall(text)))
+        else:
+            counts.append(0)
+
+    clean_text = text
+    changed = False
+    for count, pattern in zip(counts, SPECIAL_PATTERNS.values()):
+        # 앞선 치환으로 새 일치가 생길 수 있으므로 한 번 치환한 뒤에는 항상 적용
+        if count or changed:
+            clean_text = pattern.sub(' ', clean_text)
+            changed = True
+    return tuple(counts), clean_text
+
+cached_special_patterns = lru_cache(maxsize=SPECIAL_SCAN_CACHE_SIZE)(compute_special_patterns)
+
+def remove_special_patterns(text):
+    """특수 패턴을 공백으로 치환한 텍스트 (언어 감지/토큰화용)"""
+    return scan_special_patterns(text)[1]
 
 def preprocess_text(text):
     """텍스트 전처리: 구두점/하이픈 제거, 숫자/날짜/버전 패턴 보존"""
@@ -313,38 +453,373 @@ def preprocess_text(text):
     
     return text
 
-def detect_column_language(df, column_index):
+# 열 언어 감지 결과 캐시 (시트/파일/실행 간 재사용)
+class LanguageDetectionCache:
+    def __init__(self, cache_path, use_header=False):
+        self.cache_path = cache_path
+        self.use_header = use_header
+        self.fingerprints = {}  # 샘플 지문 -> {'lang', 'votes', 'total'}
+        self.headers = {}       # 헤더 값 -> {언어 코드: 감지 횟수}
+        self.hits = 0
+        self.misses = 0
+        self.dirty = False
+        self.updates = None     # 시트 워커의 복사본이면 새 감지 결과 목록 (메인 프로세스에서 merge_updates로 반영)
+        self._load()
+
+    def _load(self):
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == LANG_CACHE_VERSION:
+                self.fingerprints = data.get('fingerprints', {})
+                self.headers = data.get('headers', {})
+        except (OSError, ValueError) as e:
+            # 손상된 캐시는 무시하고 새로 시작
+            print(f"Warning: Could not load language cache {self.cache_path}: {e}")
+
+    @staticmethod
+    def make_fingerprint(sample_texts):
+        """샘플 셀 텍스트들로부터 열 지문 생성"""
+        digest = hashlib.sha1()
+        for text in sample_texts:
+            digest.update(text.encode('utf-8'))
+            digest.update(b'\x1f')
+        return digest.hexdigest()
+
+    def lookup(self, fingerprint):
+        """지문으로 캐시된 언어를 조회 (높은 신뢰도인 경우만)"""
+        entry = self.fingerprints.get(fingerprint)
+        if entry and is_confident_detection(entry['votes'], entry['total']):
+            self.hits += 1
+            return entry['lang']
+        return None
+
+    def lookup_header(self, header):
+        """헤더 값으로 캐시된 언어를 조회 (높은 신뢰도인 경우만)"""
+        if not self.use_header or not header:
+            return None
+        lang_counts = self.headers.get(header)
+        if not lang_counts:
+            return None
+        lang, count = max(lang_counts.items(), key=lambda item: item[1])
+        if is_confident_detection(count, sum(lang_counts.values())):
+            return lang
+        return None
+
+    def store(self, fingerprint, header, lang, votes, total):
+        """감지 결과를 캐시에 저장"""
+        self.misses += 1
+        if len(self.fingerprints) >= LANG_CACHE_MAX_ENTRIES:
+            # 가장 오래된 항목부터 제거
+            self.fingerprints.pop(next(iter(self.fingerprints)))
+        self.fingerprints[fingerprint] = {'lang': lang, 'votes': votes, 'total': total}
+        if header and is_confident_detection(votes, total):
+            lang_counts = self.headers.setdefault(header, {})
+            lang_counts[lang] = lang_counts.get(lang, 0) + 1
+        self.dirty = True
+        if self.updates is not None:
+            self.updates.append((fingerprint, header, lang, votes, total))
+
+    def merge_updates(self, hits, updates):
+        """시트 워커 복사본의 조회 횟수와 새 감지 결과를 반영"""
+        self.hits += hits
+        for update in updates:
+            self.store(*update)
+
+    def save(self):
+        """캐시를 파일에 저장 (다음 실행에서 재사용)"""
+        if not self.dirty or not self.cache_path:
+            return
+        data = {
+            'version': LANG_CACHE_VERSION,
+            'fingerprints': self.fingerprints,
+            'headers': self.headers
+        }
+        temp_path = f"{self.cache_path}.tmp"
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(temp_path, self.cache_path)
+            self.dirty = False
+        except OSError as e:
+            print(f"Warning: Could not save language cache {self.cache_path}: {e}")
+
+def is_confident_detection(votes, total):
+    """득표 결과가 캐시에 재사용할 만큼 신뢰할 수 있는지 확인"""
+    return total >= LANG_CACHE_MIN_VOTES and votes / total >= LANG_CACHE_MIN_CONFIDENCE
+
+def get_column_header(df, column_index):
+    """열의 첫 번째 셀(헤더) 값을 반환"""
+    if df.shape[0] == 0:
+        return None
+    header = df.iat[0, column_index]
+    if pd.isna(header) or str(header).strip() == '':
+        return None
+    return str(header).strip()
+
+def is_identifier_column(column_groups):
+    """열의 텍스트가 키/ID 값(UI_001, btn_confirm_title, GUID 등)으로 이루어졌는지 판정
+
+    헤더 행을 제외한 텍스트 셀 대부분이 공백 없는 키/ID 형태이고 값이 거의 모두 서로 다르면
+    번역 대상이 아닌 키/ID 열로 본다.
+    """
+    cells = 0
+    identifier_cells = 0
+    distinct = 0
+    for text, rows in column_groups.items():
+        count = len(rows) - (rows[0] == 0)  # 헤더 행 제외
+        if count == 0:
+            continue
+        cells += count
+        distinct += 1
+        if IDENTIFIER_PATTERN.fullmatch(text.strip()):
+            identifier_cells += count
+    if cells < IDENTIFIER_MIN_CELLS:
+        return False
+    return identifier_cells / cells >= IDENTIFIER_MIN_SHARE and distinct / cells >= IDENTIFIER_MIN_UNIQUENESS
+
+def detect_column_language(df, column_index, lang_cache=None):
     """특정 열의 모든 셀을 분석하여 가장 많이 나타나는 언어를 반환"""
     if not detect:
         return 'unknown'
-    
-    language_votes = []
-    
+
+    # 언어 감지 대상 셀 수집
+    texts = []
     for row in range(df.shape[0]):
         cell_value = df.iat[row, column_index]
         if pd.isna(cell_value) or str(cell_value).strip() == '':
             continue
-        
+
         text = str(cell_value)
         if len(text.strip()) >= 10:  # 최소 길이 체크 (정확도 향상을 위해 증가)
-            detected_lang = detect_language(text)
-            if detected_lang != 'unknown':
-                language_votes.append(detected_lang)
-    
+            texts.append(text)
+
+    if not texts:
+        return 'unknown'
+
+    # 캐시 조회: 동일한 샘플 지문 또는 검증된 헤더가 있으면 감지 생략
+    fingerprint = None
+    header = None
+    if lang_cache is not None:
+        fingerprint = lang_cache.make_fingerprint(texts[:LANG_CACHE_SAMPLE_SIZE])
+        cached_lang = lang_cache.lookup(fingerprint)
+        if cached_lang:
+            return cached_lang
+
+        header = get_column_header(df, column_index)
+        header_lang = lang_cache.lookup_header(header)
+        if header_lang:
+            # 헤더 기반 결과는 소수의 샘플로 검증 후 사용
+            samples = [detect_language(text) for text in texts[:LANG_CACHE_VERIFY_SAMPLES]]
+            if all(sample == header_lang for sample in samples):
+                lang_cache.hits += 1
+                return header_lang
+
+    language_votes = []
+    for text in texts:
+        detected_lang = detect_language(text)
+        if detected_lang != 'unknown':
+            language_votes.append(detected_lang)
+
     if not language_votes:
         return 'unknown'
-    
+
     # 가장 많이 나타나는 언어 반환
     most_common = Counter(language_votes).most_common(1)[0]
     detected_lang = most_common[0]
     count = most_common[1]
     total = len(language_votes)
-    
+
     # 디버깅: 언어 감지 결과 출력 (선택적)
     # print(f"Column {column_index}: {detected_lang} ({count}/{total} votes)")
-    
+
+    if lang_cache is not None:
+        lang_cache.store(fingerprint, header, detected_lang, count, total)
+
     return detected_lang
 
+def detect_script(text):
+    """텍스트의 주 문자 체계를 빠르게 판별 (문자가 없으면 None)"""
+    clean_text = remove_special_patterns(text)
+    
+    script_counts = {script: len(pattern.findall(clean_text)) for script, pattern in SCRIPT_PATTERNS.items()}
+    if script_counts['kana']:
+        # 가나가 있으면 일본어 (한자는 일본어 문자로 합산)
+        script_counts['kana'] += script_counts['han']
+        script_counts['han'] = 0
+    
+    script, count = max(script_counts.items(), key=lambda item: item[1])
+    return script if count > 0 else None
+
+def route_text_language(text, column_language, column_scripts):
+    """셀 텍스트의 문자 체계가 열과 다를 때만 해당 셀의 언어를 다시 판별"""
+    script = detect_script(text)
+    if script is None or script in column_scripts:
+        return column_language
+    
+    if script != 'latin':
+        return SCRIPT_LANGUAGES[script]
+    
+    # 라틴 문자는 여러 언어가 공유하므로 langdetect로 판별
+    detected_lang = detect_language(text)
+    if 'latin' in LANGUAGE_SCRIPTS.get(detected_lang, ()):
+        return detected_lang
+    return SCRIPT_LANGUAGES['latin']
+
+def route_cell_languages(df, column_languages, groups=None):
+    """열의 주 문자 체계와 다른 셀만 언어를 다시 판별 (열 -> {텍스트: 언어})"""
+    if groups is None:
+        groups = group_distinct_values(df, text_only=True)
+    cell_languages = {}
+    for col, column_groups in groups.items():
+        # 열의 고유 텍스트와 출현 횟수
+        text_counts = {text: len(rows) for text, rows in column_groups.items()}
+        
+        if not text_counts:
+            continue
+        
+        col_lang = column_languages.get(col, 'unknown')
+        if col_lang == IDENTIFIER_CATEGORY:
+            continue  # 키/ID 열은 셀 언어를 다시 판별하지 않음
+        if col_lang == 'unknown':
+            # 언어를 감지하지 못한 열은 셀들의 주 문자 체계를 열의 언어로 사용
+            script_votes = Counter()
+            for text, count in text_counts.items():
+                script = detect_script(text)
+                if script:
+                    script_votes[script] += count
+            if not script_votes:
+                continue
+            base_lang = SCRIPT_LANGUAGES[script_votes.most_common(1)[0][0]]
+        else:
+            base_lang = col_lang
+        
+        column_scripts = LANGUAGE_SCRIPTS.get(base_lang, ())
+        overrides = {}
+        for text in text_counts:
+            lang = route_text_language(text, base_lang, column_scripts)
+            if lang != col_lang and lang != 'unknown':
+                overrides[text] = lang
+        if overrides:
+            cell_languages[col] = overrides
+    
+    return cell_languages
+
+def get_cell_language(column_languages, cell_languages, col, text):
+    """셀의 언어 반환 (셀 단위 라우팅 결과가 있으면 우선)"""
+    col_lang = column_languages.get(col, 'unknown')
+    if cell_languages and col in cell_languages:
+        return cell_languages[col].get(text, col_lang)
+    return col_lang
+
+def get_category_index(category):
+    """카테고리의 고정 행 인덱스 반환 (매핑에 없는 langdetect 코드는 뒤에 추가)"""
+    index = WORD_CATEGORY_INDEX.get(category)
+    if index is None:
+        index = len(WORD_CATEGORIES)
+        WORD_CATEGORIES.append(category)
+        WORD_CATEGORY_INDEX[category] = index
+    return index
+
+def get_word_categories(column_languages, cell_languages=None):
+    """시트의 전체 카테고리 (감지된 언어 표시명 + 특수 패턴, 고정 인덱스 순서)"""
+    languages = set(column_languages.values())
+    if cell_languages:
+        for overrides in cell_languages.values():
+            languages.update(overrides.values())
+    
+    all_categories = set()
+    for lang_code in languages:
+        if lang_code != 'unknown':
+            # langdetect 코드를 표시명으로 변환
+            display_name = LANGUAGE_MAPPING.get(lang_code, lang_code)
+            all_categories.add(display_name)
+    all_categories.update(['html_xml', 'brackets', 'newlines', 'file_paths'])
+    return sorted(all_categories, key=get_category_index)
+
+def new_word_matrix(num_columns):
+    """카테고리 x 열 정수 행렬 생성"""
+    return np.zeros((len(WORD_CATEGORIES), num_columns), dtype=np.int64)
+
+def find_valid_columns(column_counts):
+    """값이 있는 열만 반환 (빈 열이 20개 이상 연속될 경우 중단)"""
+    col_totals = column_counts.sum(axis=0)
+    valid_columns = []
+    empty_col_count = 0
+    for col in range(column_counts.shape[1]):
+        if col_totals[col] > 0:
+            valid_columns.append(col)
+            empty_col_count = 0
+        else:
+            empty_col_count += 1
+            if empty_col_count >= 20:
+                break
+    return valid_columns
+
+def get_words(text, language, word_cache=None):
+    """텍스트를 단어로 분리 (word_cache가 있으면 결과를 재사용)"""
+    if word_cache is None:
+        return process_text_by_language(text, language)
+    
+    key = (language, text)
+    words = word_cache.get(key)
+    if words is None:
+        words = process_text_by_language(text, language)
+        word_cache[key] = words
+    return words
+
+def tokenize_cells_in_batches(df, column_languages, cell_languages, word_cache, groups=None):
+    """시트의 셀을 언어별로 묶어 각 토크나이저에 배치로 전달"""
+    if groups is None:
+        groups = group_distinct_values(df, text_only=True)
+    texts_by_language = defaultdict(set)
+    for c, column_groups in groups.items():
+        for text in column_groups:
+            lang = get_cell_language(column_languages, cell_languages, c, text)
+            if lang != 'unknown' and (lang, text) not in word_cache:
+                texts_by_language[lang].add(text)
+    
+    for lang, texts in texts_by_language.items():
+        texts = list(texts)
+        for text, words in zip(texts, process_texts_by_language(texts, lang)):
+            word_cache[(lang, text)] = words
+
+def get_column_word_matrices(df, column_languages, cell_languages=None, word_cache=None, groups=None):
+    """열별 (고유 텍스트의 행 목록, 단어 수 행렬, 고유 단어 수 행렬) 반환
+
+    행렬의 행은 열의 고유 텍스트, 열은 카테고리다. 같은 텍스트는 한 번만 토큰화하고
+    특수 패턴을 세며, 실제 값은 고유 텍스트의 값에 출현 횟수(행 수)를 곱해 구한다.
+    """
+    if groups is None:
+        groups = group_distinct_values(df, text_only=True)
+    if word_cache is None:
+        word_cache = {}
+    matrices = {}
+    for c, column_groups in groups.items():
+        word_counts = np.zeros((len(column_groups), len(WORD_CATEGORIES)), dtype=np.int64)
+        unique_word_counts = np.zeros_like(word_counts)
+        for k, text in enumerate(column_groups):
+            cell_lang = get_cell_language(column_languages, cell_languages, c, text)
+            if cell_lang != 'unknown':
+                # langdetect 코드를 표시명으로 변환
+                category_index = WORD_CATEGORY_INDEX[LANGUAGE_MAPPING.get(cell_lang, cell_lang)]
+                words = get_words(text, cell_lang, word_cache)
+                word_counts[k, category_index] = len(words)
+                unique_word_counts[k, category_index] = len(set(words))
+            
+            # 특수 패턴 카운트
+            for pattern_name, count in extract_special_patterns(text).items():
+                word_counts[k, WORD_CATEGORY_INDEX[pattern_name]] = count
+                unique_word_counts[k, WORD_CATEGORY_INDEX[pattern_name]] = count
+        matrices[c] = (list(column_groups.values()), word_counts, unique_word_counts)
+    return matrices
+
+def get_occurrences(rows):
+    """고유 텍스트별 출현 횟수 배열"""
+    return np.array([len(text_rows) for text_rows in rows], dtype=np.int64)
+
 def count_words_in_text(text, language):
     """텍스트에서 단어 수를 계산 (중복 포함)"""
     words = process_text_by_language(text, language)
@@ -357,43 +832,110 @@ def count_unique_words_in_text(text, language):
 
 # 임시 파일 관리를 위한 클래스 (단어용)
 class TempWordManager:
-    def __init__(self, base_dir):
+    def __init__(self, base_dir, temp_dir=None, hll_error=None, top_words=0, top_words_exact=False,
+                 unique_memory=DEFAULT_UNIQUE_MEMORY):
         self.base_dir = base_dir
-        self.temp_dir = tempfile.mkdtemp(dir=base_dir)
-        self.temp_files = defaultdict(list)
-        self.current_sets = defaultdict(set)
-        self.set_size_limit = 100000
-
-    def add_words(self, category, words):
-        for word in words:
-            if word not in self.current_sets[category]:
-                self.current_sets[category].add(word)
-                if len(self.current_sets[category]) >= self.set_size_limit:
-                    self._save_to_temp_file(category)
-
-    def _save_to_temp_file(self, category):
-        if not self.current_sets[category]:
+        if temp_dir:
+            # 체크포인트 디렉토리처럼 실행이 끝나도 유지되어야 하는 경우
+            os.makedirs(temp_dir, exist_ok=True)
+            self.temp_dir = temp_dir
+        else:
+            self.temp_dir = tempfile.mkdtemp(dir=base_dir)
+        # 카테고리별 고유 단어 집합 (모든 카테고리 합계가 unique_memory를 넘으면 가장 큰 카테고리부터 파일로 내보냄)
+        self.store = UniqueStore(self.temp_dir, unique_memory)
+        # 근사 모드: 고유 단어 집합 대신 카테고리별 HyperLogLog 스케치만 유지 (고정 메모리, 임시 파일 없음)
+        self.hll_error = hll_error
+        self.sketches = defaultdict(lambda: HyperLogLog.from_error(hll_error)) if hll_error else None
+        # 카테고리별 빈도 상위 단어 (Space-Saving, 정확 모드이면 모든 단어의 횟수)
+        self.top_words = top_words
+        self.top_capacity = None if top_words_exact else top_words * TOP_COUNTERS_PER_ITEM
+        self.frequencies = defaultdict(lambda: SpaceSaving(self.top_capacity)) if top_words else None
+        # 처리 중인 파일의 카테고리별 단어 빈도 (commit_file에서 반영, 중단 시 체크포인트에 들어가지 않음)
+        self.pending_frequencies = defaultdict(Counter) if top_words else None
+
+    def add_words(self, category, words, occurrences=1):
+        """단어 목록 추가 (occurrences: 같은 텍스트가 나온 셀 수, 빈도 집계에만 반영)"""
+        if self.pending_frequencies is not None and category != IDENTIFIER_CATEGORY:
+            # 키/ID 값은 용어집 대상이 아니므로 빈도 집계에서 제외
+            pending = self.pending_frequencies[category]
+            for word in words:
+                pending[word] += occurrences
+
+        if self.sketches is not None:
+            self.sketches[category].add_many(words)
             return
 
-        temp_file = os.path.join(self.temp_dir, f"{category}_{len(self.temp_files[category])}.json")
-        with open(temp_file, 'w', encoding='utf-8') as f:
-            json.dump(list(self.current_sets[category]), f, ensure_ascii=False)
-        
-        self.temp_files[category].append(temp_file)
-        self.current_sets[category].clear()
+        self.store.add_many(category, words)
 
-    def get_all_unique_words(self, category):
-        all_words = set()
-        
-        # 현재 메모리에 있는 단어 추가
-        all_words.update(self.current_sets[category])
-        
-        # 임시 파일에서 단어 로드
-        for temp_file in self.temp_files[category]:
-            with open(temp_file, 'r', encoding='utf-8') as f:
-                all_words.update(json.load(f))
-        
-        return all_words
+    def commit_file(self):
+        """처리가 끝난 파일의 단어 빈도를 상위 단어 집계에 반영
+
+        빈도는 다시 더하면 중복 집계되므로, 중단된 파일의 빈도가 체크포인트에 저장되어
+        재개 시 두 번 세지 않도록 파일 단위로 반영한다 (고유 집합은 다시 더해도 같음).
+        """
+        if self.pending_frequencies is None:
+            return
+        for category, counts in self.pending_frequencies.items():
+            counter = self.frequencies[category]
+            for word, count in counts.items():
+                counter.add(word, count)
+        self.pending_frequencies.clear()
+
+    def count_unique_words(self, category):
+        """카테고리의 폴더 전체 고유 단어 수 (근사 모드이면 추정치)"""
+        if self.sketches is not None:
+            return self.sketches[category].count()
+        return self.store.count_unique(category)
+
+    def get_top_words(self, category):
+        """카테고리의 빈도 상위 단어 [(단어, 횟수, 최대 과대 추정치)]"""
+        return self.frequencies[category].top(self.top_words)
+
+    def get_top_words_status(self):
+        """빈도 상위 단어 행의 상태 (근사 모드이면 카운터 수 표시)"""
+        if self.top_capacity is None:
+            return "Normal"
+        return f"Approximate (Space-Saving, {self.top_capacity} counters per category)"
+
+    def get_unique_status(self):
+        """폴더 전체 고유 단어 행의 상태 (근사 모드이면 오차 범위 표시)"""
+        if self.sketches is None:
+            return "Normal"
+        error = HyperLogLog.from_error(self.hll_error).error
+        return f"Approximate (HyperLogLog, ±{error:.1%} standard error)"
+
+    def flush(self):
+        """메모리에 있는 모든 집합을 임시 파일로 내보냄 (체크포인트용)"""
+        self.store.flush()
+
+    def get_state(self):
+        """임시 파일 목록 반환 (체크포인트에 저장)"""
+        if self.sketches is not None:
+            state = {'hll': {category: sketch.to_state() for category, sketch in self.sketches.items()}}
+        else:
+            state = {'temp_files': self.store.get_state()}
+        if self.frequencies is not None:
+            state['top'] = {category: counter.to_state() for category, counter in self.frequencies.items()}
+        return state
+
+    def merge_state(self, state, temp_dir):
+        """다른 실행(샤드)의 임시 파일 목록을 추가 (병합용, 원본 파일은 삭제하지 않음)"""
+        self.store.merge_state(state.get('temp_files', {}), temp_dir)
+        for category, sketch_state in state.get('hll', {}).items():
+            self.sketches[category].merge(HyperLogLog.from_state(sketch_state))
+        for category, counter_state in state.get('top', {}).items():
+            self.frequencies[category].merge(SpaceSaving.from_state(counter_state))
+
+    def restore_state(self, state):
+        """체크포인트의 임시 파일 목록 복원 (목록에 없는 파일은 마지막 체크포인트 이후의 것이므로 삭제)"""
+        keep = self.store.restore_state(state.get('temp_files', {}))
+        for category, sketch_state in state.get('hll', {}).items():
+            self.sketches[category] = HyperLogLog.from_state(sketch_state)
+        for category, counter_state in state.get('top', {}).items():
+            self.frequencies[category] = SpaceSaving.from_state(counter_state)
+        for name in os.listdir(self.temp_dir):
+            if name not in keep:
+                os.remove(os.path.join(self.temp_dir, name))
 
     def cleanup(self):
         """임시 디렉토리 정리 (Windows 액세스 거부 오류 처리)"""
@@ -422,198 +964,144 @@ class TempWordManager:
                     print(f"Warning: Could not delete temporary directory {self.temp_dir}: {e}")
                     print(f"Please manually delete it if needed.")
 
-def analyze_sheet_for_words(df):
-    """시트를 분석하여 단어 수를 계산"""
+def analyze_sheet_for_words(df, lang_cache=None, cell_routing=False, word_cache=None, groups=None,
+                            detect_identifiers=True):
+    """시트를 분석하여 단어 수를 계산
+
+    열별 단어 수 행렬(get_column_word_matrices)도 함께 반환하여 다른 분석 함수들이 다시 만들지 않도록 한다.
+    """
+    if groups is None:
+        groups = group_distinct_values(df, text_only=True)
+    
     # 먼저 각 열의 언어를 감지
     column_languages = {}
     for col in range(df.shape[1]):
-        column_languages[col] = detect_column_language(df, col)
+        if is_non_text_column(df.iloc[:, col]):
+            # 숫자/날짜 dtype 열에는 단어가 없으므로 언어 감지와 토큰화를 생략
+            column_languages[col] = 'unknown'
+            continue
+        if detect_identifiers and is_identifier_column(groups.get(col, {})):
+            # 키/ID 열은 언어 감지와 토큰화 없이 Identifier 카테고리로 집계
+            column_languages[col] = IDENTIFIER_CATEGORY
+            continue
+        column_languages[col] = detect_column_language(df, col, lang_cache)
     
-    # 전체 카테고리 (언어 + 특수 패턴)
-    all_categories = set()
-    for lang_code in column_languages.values():
-        if lang_code != 'unknown':
-            # langdetect 코드를 표시명으로 변환
-            display_name = LANGUAGE_MAPPING.get(lang_code, lang_code)
-            all_categories.add(display_name)
+    # 셀 단위 라우팅: 열의 문자 체계와 다른 셀만 언어를 다시 판별하고 언어별로 배치 토큰화
+    cell_languages = {}
+    if cell_routing:
+        cell_languages = route_cell_languages(df, column_languages, groups)
+        if word_cache is not None:
+            tokenize_cells_in_batches(df, column_languages, cell_languages, word_cache, groups)
     
-    all_categories.update(['html_xml', 'brackets', 'newlines', 'file_paths'])
+    # 전체 카테고리 (언어 + 특수 패턴)를 고정 인덱스에 등록
+    get_word_categories(column_languages, cell_languages)
     
-    total_counts = {category: 0 for category in all_categories}
-    column_counts = {col: {category: 0 for category in all_categories} for col in range(df.shape[1])}
+    column_counts = new_word_matrix(df.shape[1])
     
-    for r in range(df.shape[0]):
-        for c in range(df.shape[1]):
-            cell_value = df.iat[r, c]
-            if pd.isna(cell_value) or str(cell_value).strip() == '':
-                continue
-            
-            text = str(cell_value)
-            col_lang = column_languages[c]
-            
-            if col_lang != 'unknown':
-                # langdetect 코드를 표시명으로 변환
-                display_name = LANGUAGE_MAPPING.get(col_lang, col_lang)
-                # 단어 수 계산
-                word_count = count_words_in_text(text, col_lang)
-                total_counts[display_name] += word_count
-                column_counts[c][display_name] += word_count
-            
-            # 특수 패턴 카운트
-            special_patterns = extract_special_patterns(text)
-            for pattern_name, count in special_patterns.items():
-                if count > 0:
-                    total_counts[pattern_name] += count
-                    column_counts[c][pattern_name] += count
+    # 고유 텍스트별 단어 수와 특수 패턴 수를 출현 횟수만큼 더함 (행렬은 시트마다 한 번만 만듦)
+    matrices = get_column_word_matrices(df, column_languages, cell_languages, word_cache, groups)
+    for c, (rows, word_counts, _) in matrices.items():
+        column_counts[:, c] = get_occurrences(rows) @ word_counts
+    
+    total_counts = column_counts.sum(axis=1)
     
     # 유효한 열만 필터링
-    valid_columns = []
-    empty_col_count = 0
-    for col in range(df.shape[1]):
-        col_total = sum(column_counts[col].values())
-        if col_total > 0:
-            valid_columns.append(col)
-            empty_col_count = 0
-        else:
-            empty_col_count += 1
-            if empty_col_count >= 20:
-                break
+    valid_columns = find_valid_columns(column_counts)
     
-    return total_counts, column_counts, valid_columns, column_languages
+    return total_counts, column_counts, valid_columns, column_languages, cell_languages, matrices
 
-def get_unique_words_per_column(df, column_languages):
-    """각 열별로 고유 단어 수를 계산"""
-    unique_counts = {}
-    for col in range(df.shape[1]):
-        col_lang = column_languages.get(col, 'unknown')
-        
-        # 전체 카테고리 생성
-        all_categories = set()
-        for lang_code in column_languages.values():
-            if lang_code != 'unknown':
-                display_name = LANGUAGE_MAPPING.get(lang_code, lang_code)
-                all_categories.add(display_name)
-        all_categories.update(['html_xml', 'brackets', 'newlines', 'file_paths'])
-        
-        col_counts = {category: 0 for category in all_categories}
-        
-        # 해당 열의 모든 값을 가져옴
-        column_values = df.iloc[:, col].dropna().astype(str)
-        unique_texts = column_values.unique()
-        
-        # 각 고유 값에 대해 단어 수를 세고 합산
-        for value in unique_texts:
-            if col_lang != 'unknown':
-                display_name = LANGUAGE_MAPPING.get(col_lang, col_lang)
-                unique_word_count = count_unique_words_in_text(value, col_lang)
-                col_counts[display_name] += unique_word_count
-            
-            # 특수 패턴 카운트
-            special_patterns = extract_special_patterns(value)
-            for pattern_name, count in special_patterns.items():
-                col_counts[pattern_name] += count
-        
-        unique_counts[col] = col_counts
+def get_unique_words_per_column(df, column_languages, cell_languages, matrices):
+    """각 열별로 고유 단어 수를 계산 (matrices: analyze_sheet_for_words가 반환한 열별 단어 수 행렬)"""
+    # 전체 카테고리를 고정 인덱스에 등록
+    get_word_categories(column_languages, cell_languages)
+    
+    unique_counts = new_word_matrix(df.shape[1])
+    # 각 고유 값에 대해 단어 수를 세고 합산
+    for c, (_, _, unique_word_counts) in matrices.items():
+        unique_counts[:, c] = unique_word_counts.sum(axis=0)
     
     return unique_counts
 
-def get_cell_addresses_for_words(df, column_languages):
-    """단어 수 분석용 셀 주소 추출"""
-    cell_addresses = {}
+def get_cell_addresses_for_words(column_languages, cell_languages, matrices):
+    """단어 수 분석용 셀 주소 추출 ((카테고리, 열) -> 셀 주소 리스트)"""
+    # 전체 카테고리를 고정 인덱스에 등록
+    categories = get_word_categories(column_languages, cell_languages)
     
-    # 전체 카테고리 생성
-    all_categories = set()
-    for lang_code in column_languages.values():
-        if lang_code != 'unknown':
-            display_name = LANGUAGE_MAPPING.get(lang_code, lang_code)
-            all_categories.add(display_name)
-    all_categories.update(['html_xml', 'brackets', 'newlines', 'file_paths'])
+    cell_addresses = defaultdict(list)
     
-    # 각 카테고리별로 셀 주소 딕셔너리 초기화
-    for category in all_categories:
-        cell_addresses[category] = {col: [] for col in range(df.shape[1])}
-    
-    for r in range(df.shape[0]):
-        for c in range(df.shape[1]):
-            cell_value = df.iat[r, c]
-            if pd.isna(cell_value) or str(cell_value).strip() == '':
-                continue
-                
-            text = str(cell_value)
-            col_lang = column_languages.get(c, 'unknown')
-            
-            if col_lang != 'unknown':
-                # langdetect 코드를 표시명으로 변환
-                display_name = LANGUAGE_MAPPING.get(col_lang, col_lang)
-                # 단어가 있는지 확인
-                word_count = count_words_in_text(text, col_lang)
-                if word_count > 0:
-                    cell_address = f"{get_column_letter(c+1)}{r+1}"
-                    cell_addresses[display_name][c].append(cell_address)
-            
-            # 특수 패턴 확인
-            special_patterns = extract_special_patterns(text)
-            for pattern_name, count in special_patterns.items():
-                if count > 0:
-                    cell_address = f"{get_column_letter(c+1)}{r+1}"
-                    cell_addresses[pattern_name][c].append(cell_address)
-    
-    # 각 카테고리별로 셀 주소 정렬
-    for category in all_categories:
-        for col in range(df.shape[1]):
-            cell_addresses[category][col].sort(key=lambda x: (x[0], int(x[1:])))
+    for c, (rows, word_counts, _) in matrices.items():
+        column_letter = get_column_letter(c+1)
+        for category in categories:
+            # 단어나 특수 패턴이 있는 고유 텍스트의 행을 모아 행 순서로 정렬
+            category_rows = sorted(r for k in np.flatnonzero(word_counts[:, WORD_CATEGORY_INDEX[category]]) for r in rows[k])
+            if category_rows:
+                cell_addresses[(category, c)] = [f"{column_letter}{r+1}" for r in category_rows]
     
     return cell_addresses
 
-def count_cells_by_category_for_words(df, column_languages):
+def count_cells_by_category_for_words(df, column_languages, cell_languages, matrices):
     """단어 수 분석용 카테고리별 셀 개수 계산"""
-    cell_counts = {}
+    # 전체 카테고리를 고정 인덱스에 등록
+    get_word_categories(column_languages, cell_languages)
     
-    # 전체 카테고리 생성
-    all_categories = set()
-    for lang_code in column_languages.values():
-        if lang_code != 'unknown':
-            display_name = LANGUAGE_MAPPING.get(lang_code, lang_code)
-            all_categories.add(display_name)
-    all_categories.update(['html_xml', 'brackets', 'newlines', 'file_paths'])
+    cell_counts = new_word_matrix(df.shape[1])
     
-    # 각 카테고리별로 셀 개수 딕셔너리 초기화
-    for category in all_categories:
-        cell_counts[category] = {col: 0 for col in range(df.shape[1])}
-    
-    for r in range(df.shape[0]):
-        for c in range(df.shape[1]):
-            cell_value = df.iat[r, c]
-            if pd.isna(cell_value) or str(cell_value).strip() == '':
-                continue
-                
-            text = str(cell_value)
-            col_lang = column_languages.get(c, 'unknown')
-            
-            if col_lang != 'unknown':
-                # langdetect 코드를 표시명으로 변환
-                display_name = LANGUAGE_MAPPING.get(col_lang, col_lang)
-                # 단어가 있는지 확인
-                word_count = count_words_in_text(text, col_lang)
-                if word_count > 0:
-                    cell_counts[display_name][c] += 1
-            
-            # 특수 패턴 확인
-            special_patterns = extract_special_patterns(text)
-            for pattern_name, count in special_patterns.items():
-                if count > 0:
-                    cell_counts[pattern_name][c] += 1
+    # 단어나 특수 패턴이 있는 고유 텍스트의 출현 횟수 합
+    for c, (rows, word_counts, _) in matrices.items():
+        cell_counts[:, c] = get_occurrences(rows) @ (word_counts > 0).astype(np.int64)
     
     return cell_counts
 
-def adjust_column_widths(sheet):
-    """열 너비 조정"""
+def get_row_word_matrix(df, lang_cache=None, cell_routing=False, detect_identifiers=True):
+    """행 x 카테고리(WORD_CATEGORIES 순서) 단어 수 행렬 (표본 추정에서 행마다 값을 구하기 위함)"""
+    groups = group_distinct_values(df, text_only=True)
+    word_cache = {}
+    tokenize_incidents.clear()  # 추정 보고서에는 셀 기록을 남기지 않음
+    matrices = analyze_sheet_for_words(df, lang_cache, cell_routing, word_cache, groups, detect_identifiers)[-1]
+    row_counts = np.zeros((df.shape[0], len(WORD_CATEGORIES)), dtype=np.int64)
+    for rows, word_counts, _ in matrices.values():
+        for text_rows, counts in zip(rows, word_counts):
+            row_counts[text_rows] += counts
+    return row_counts
+
+def get_watchdog_rows(rel_path, file_name, sheet_name, groups, column_languages, cell_languages=None):
+    """시트에서 tokenize_incidents에 기록된 텍스트의 셀 주소를 찾아 Words_watchdog 행으로 변환"""
+    rows = []
+    for c, column_groups in groups.items():
+        column_letter = get_column_letter(c+1)
+        for text, text_rows in column_groups.items():
+            cell_lang = get_cell_language(column_languages, cell_languages, c, text)
+            incident = tokenize_incidents.get((cell_lang, text.strip()))
+            if incident is None:
+                continue
+            addresses = ', '.join(f"{column_letter}{r+1}" for r in text_rows)
+            print(f"{incident['status']}: {file_name} [{sheet_name}] {addresses}")
+            rows.append([rel_path, file_name, sheet_name, incident['status'], LANGUAGE_MAPPING.get(cell_lang, cell_lang),
+                         addresses, incident['chars'], incident['seconds'], incident['peak_memory'], incident['fallback_chunks']])
+    return rows
+
+def write_cell_results(cell_results, sheet_name, groups, column_languages, cell_languages=None, word_cache=None):
+    """시트의 셀별 언어, 단어 수, 특수 패턴 수를 결과 데이터베이스에 기록 (같은 텍스트의 셀은 한 번에 기록)"""
+    for c, column_groups in groups.items():
+        for text, rows in column_groups.items():
+            cell_lang = get_cell_language(column_languages, cell_languages, c, text)
+            if cell_lang == 'unknown':
+                language, word_count = None, 0
+            else:
+                language = LANGUAGE_MAPPING.get(cell_lang, cell_lang)
+                word_count = len(get_words(text, cell_lang, word_cache))
+            pattern_counts, _ = scan_special_patterns(text)
+            cell_results.add_cells(sheet_name, c, text, rows, language, (word_count, *pattern_counts))
+
+def adjust_column_widths(sheet, title=None):
+    """열 너비 조정 (title: 이어지는 시트의 원래 시트 이름)"""
+    title = title or sheet.title
     for column_cells in sheet.columns:
         max_length = 0
         column = column_cells[0].column_letter
         
         # Words_cell_address 시트에서 데이터 열만 너비를 10으로 고정
-        if sheet.title == 'Words_cell_address' and column >= 'G':
+        if title == 'Words_cell_address' and column >= 'G':
             sheet.column_dimensions[column].width = 10
             for cell in column_cells:
                 cell.alignment = Alignment(wrap_text=False, shrink_to_fit=True)
@@ -628,160 +1116,229 @@ def adjust_column_widths(sheet):
         adjusted_width = (max_length + 2)
         sheet.column_dimensions[column].width = adjusted_width
 
-def main(current_language='ko'):
-    """메인 함수"""
-    # exe 파일이 실행된 경로를 기준으로 설정
-    folder_path = os.path.dirname(os.path.abspath(sys.executable)) if getattr(sys, 'frozen', False) else os.path.dirname(os.path.abspath(__file__))
-    print(f"{t('UI_006', current_language)}: {folder_path}")
-    
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    report_name = f"WORD_COUNT_REPORT_{timestamp}.xlsx"
-    report_path = os.path.join(folder_path, report_name)
-    print(f"{t('UI_007', current_language)}: {report_path}")
+def analyze_sheet_task(rel_path, file_name, sheet_name, df, lang_cache=None, cell_routing=False, detect_identifiers=True,
+                       repetition=False, cell_results=None, current_language='ko', baseline=None):
+    """시트 하나를 분석하여 보고서 행, 유효한 열, 카테고리, 폴더 전체 고유 집합에 넣을 단어를 반환
 
-    report_wb = Workbook()
-    
-    # 6개의 시트 생성 (count_chars와 동일한 구조)
-    report_ws_real = report_wb.active
-    report_ws_real.title = 'Words_real'
-    
-    report_ws_unique_for_sheet = report_wb.create_sheet('Words_unique_for_Sheet')
-    report_ws_unique_for_folder = report_wb.create_sheet('Words_unique_for_Folder')
-    report_ws_cell_address = report_wb.create_sheet('Words_cell_address')
-    report_ws_cells = report_wb.create_sheet('Words_cells')
-    
-    # 임시 파일 매니저 초기화
-    temp_manager = TempWordManager(folder_path)
+    메인 프로세스와 시트 워커 프로세스에서 모두 실행되며, 결과는 apply_sheet_result로
+    시트 순서대로 파일 결과와 폴더 전체 고유 집합에 반영한다. cell_results는 셀 단위 결과 기록 대상,
+    baseline은 새/변경/유지 셀을 분류할 기준 색인(BaselineIndex)이다.
+    """
+    print(f"{t('UI_012', current_language)}: {sheet_name}")
+    sheet_rows = new_file_rows()
+    if repetition:
+        # 반복 분석용 세그먼트 (보고서 작성 시 모든 파일을 순서대로 색인)
+        sheet_rows['segments'] = []
+    sheet_rows['watchdog'] = []  # 토큰화 한도를 넘었거나 토크나이저 오류가 난 셀
+    if baseline is not None:
+        sheet_rows['delta'] = []  # 기준 대비 새/변경/유지 셀의 단어 수와 글자 수
 
-    # 하위 폴더를 포함한 모든 엑셀 파일 수집
-    files_to_process = []
-    for root, dirs, files in os.walk(folder_path):
-        if '__pycache__' in dirs:
-            dirs.remove('__pycache__')
-        if '.git' in dirs:
-            dirs.remove('.git')
-            
-        for file in files:
-            if file.endswith(('.xlsx', '.xlsm', '.csv')) and "REPORT_" not in file and not file.startswith('~$'):
-                rel_path = os.path.relpath(os.path.join(root, file), folder_path)
-                files_to_process.append((rel_path, file))
+    # 열별 고유 텍스트로 묶어 토큰화 결과를 시트 단위로 재사용 (텍스트마다 한 번만 분석)
+    groups = group_distinct_values(df, text_only=True)
+    word_cache = {}
+    tokenize_incidents.clear()
+    total_counts, column_counts, valid_columns, column_languages, cell_languages, matrices = analyze_sheet_for_words(df, lang_cache, cell_routing, word_cache, groups, detect_identifiers)
+    unique_counts = get_unique_words_per_column(df, column_languages, cell_languages, matrices)
+    cell_addresses = get_cell_addresses_for_words(column_languages, cell_languages, matrices)
+    cell_counts = count_cells_by_category_for_words(df, column_languages, cell_languages, matrices)
+    if cell_results is not None:
+        write_cell_results(cell_results, sheet_name, groups, column_languages, cell_languages, word_cache)
 
-    print(f"{t('UI_008', current_language)}: {[f[1] for f in files_to_process]}")
-    print(t('UI_009', current_language).format(len(files_to_process)))
-    print(t('UI_010', current_language))
+    # 시트 카테고리 (고정 인덱스 순서)
+    sheet_categories = get_word_categories(column_languages, cell_languages)
+
+    # 폴더 전체 고유 집합에 넣을 단어 ([카테고리, 단어 목록, 출현 횟수])
+    unique_words = []
+    delta_segments = []  # 기준 대비 분류할 [(열 번호, 텍스트, 행 번호 목록)]
+    delta_values = []  # 세그먼트별 (카테고리, (단어 수, 글자 수))
+    for c, column_groups in groups.items():
+        for text, rows in column_groups.items():
+            cell_lang = get_cell_language(column_languages, cell_languages, c, text)
+
+            if cell_lang != 'unknown':
+                display_name = LANGUAGE_MAPPING.get(cell_lang, cell_lang)
+                words = get_words(text, cell_lang, word_cache)
+                unique_words.append((display_name, words, len(rows)))
+                if repetition and display_name != IDENTIFIER_CATEGORY:
+                    sheet_rows['segments'].append(make_segment(display_name, text, words, len(rows)))
+                if baseline is not None:
+                    delta_segments.append((c, text, rows))
+                    delta_values.append((display_name, (len(words), len(text))))
+
+    # 기준 대비 새/변경/유지 셀 분류 (시트의 모든 세그먼트를 한 번에 조회)
+    if baseline is not None:
+        delta = {}
+        for status_cells, (display_name, values) in zip(baseline.classify(rel_path, sheet_name, delta_segments), delta_values):
+            add_delta_counts(delta.setdefault(display_name, new_delta_counts(len(values))), status_cells, values)
+        for category in sheet_categories:
+            if category in delta:
+                emoji = '🔑' if category == IDENTIFIER_CATEGORY else '🌐'
+                row_data = [rel_path, file_name, sheet_name, "Normal", emoji, category]
+                sheet_rows['delta'].append(row_data + [value for status_counts in delta[category] for value in status_counts])
+
+    # 토큰화 한도를 넘었거나 토크나이저 오류가 난 셀 주소 기록
+    if tokenize_incidents:
+        sheet_rows['watchdog'].extend(get_watchdog_rows(rel_path, file_name, sheet_name, groups, column_languages, cell_languages))
+        tokenize_incidents.clear()
+
+    # 실제 데이터 처리
+    for category in sheet_categories:
+        if category in ['html_xml', 'brackets', 'newlines', 'file_paths']:
+            emoji = '🔧'  # 특수 패턴용 이모지
+        elif category == IDENTIFIER_CATEGORY:
+            emoji = '🔑'  # 키/ID 열용 이모지
+        else:
+            emoji = '🌐'  # 언어용 이모지
+
+        category_index = WORD_CATEGORY_INDEX[category]
+        col_totals = column_counts[category_index, valid_columns].tolist()
+        total = int(total_counts[category_index])
+        sum_col_totals = sum(col_totals)
+
+        if sum_col_totals != total:
+            status = f"Error: Total words({total}) and column totals({sum_col_totals}) do not match"
+        else:
+            status = "Normal"
+
+        row_data = [rel_path, file_name, sheet_name, status, emoji, category, total] + col_totals
+        sheet_rows['real'].append(row_data)
+
+    # 고유 값 데이터 처리
+    for category in sheet_categories:
+        if category in ['html_xml', 'brackets', 'newlines', 'file_paths']:
+            emoji = '🔧'
+        elif category == IDENTIFIER_CATEGORY:
+            emoji = '🔑'
+        else:
+            emoji = '🌐'
+
+        unique_col_totals = unique_counts[WORD_CATEGORY_INDEX[category], valid_columns].tolist()
+        total_unique = sum(unique_col_totals)
+        row_data = [rel_path, file_name, sheet_name, "Normal", emoji, category, total_unique] + unique_col_totals
+        sheet_rows['unique_for_sheet'].append(row_data)
+
+    # 셀 주소 데이터 처리
+    for category in sheet_categories:
+        if category in ['html_xml', 'brackets', 'newlines', 'file_paths']:
+            emoji = '🔧'
+        elif category == IDENTIFIER_CATEGORY:
+            emoji = '🔑'
+        else:
+            emoji = '🌐'
+
+        cell_col_addresses = [', '.join(cell_addresses.get((category, col), [])) for col in valid_columns]
+        total_cells = sum(len(cell_addresses.get((category, col), [])) for col in valid_columns)
+        row_data = [rel_path, file_name, sheet_name, "Normal", emoji, category, total_cells] + cell_col_addresses
+        sheet_rows['cell_address'].append(row_data)
+
+    # 셀 갯수 데이터 처리
+    for category in sheet_categories:
+        if category in ['html_xml', 'brackets', 'newlines', 'file_paths']:
+            emoji = '🔧'
+        elif category == IDENTIFIER_CATEGORY:
+            emoji = '🔑'
+        else:
+            emoji = '🌐'
+
+        cell_col_counts = cell_counts[WORD_CATEGORY_INDEX[category], valid_columns].tolist()
+        total_cells = sum(cell_col_counts)
+        row_data = [rel_path, file_name, sheet_name, "Normal", emoji, category, total_cells] + cell_col_counts
+        sheet_rows['cells'].append(row_data)
+
+    return {'rows': sheet_rows, 'columns': valid_columns, 'categories': sheet_categories, 'unique': unique_words}
+
+# 시트 워커 프로세스의 언어 감지 캐시 (init_sheet_worker에서 설정, 워커마다 시작 시점의 복사본)
+worker_lang_cache = None
+
+# 시트 워커 프로세스의 기준 색인 (--baseline, init_sheet_worker에서 설정)
+worker_baseline = None
+
+def init_sheet_worker(lang_cache, tokenizer_profile, baseline=None):
+    """시트 워커 프로세스 초기화 (토크나이저 모델은 처음 쓸 때 워커마다 불러옴)"""
+    global worker_lang_cache, worker_baseline
+    worker_lang_cache = lang_cache
+    worker_baseline = baseline
+    set_tokenizer_profile(tokenizer_profile)
+
+def run_sheet_task_in_worker(rel_path, file_name, cell_routing, detect_identifiers, repetition, results_db,
+                             current_language, sheet_name, df):
+    """시트 워커 프로세스에서 analyze_sheet_task 실행
 
+    셀 단위 결과, 토크나이저 처리량, 언어 감지 캐시의 조회 횟수와 새 감지 결과를 함께 반환하여
+    메인 프로세스에서 반영한다.
+    """
+    lang_cache = worker_lang_cache
+    if lang_cache is not None:
+        lang_cache.hits = 0
+        lang_cache.updates = []
+    tokenizer_stats.clear()
+    cached_special_patterns.cache_clear()
+    cells = CellResultsBuffer() if results_db else None
+    result = analyze_sheet_task(rel_path, file_name, sheet_name, df, lang_cache, cell_routing, detect_identifiers,
+                                repetition, cells, current_language, worker_baseline)
+    result['cells'] = cells
+    result['tokenizers'] = get_tokenizer_state()
+    if lang_cache is not None:
+        result['lang_cache'] = (lang_cache.hits, lang_cache.updates)
+    return result
+
+def apply_sheet_result(result, file_rows, file_columns, file_categories, temp_manager, cell_results=None, lang_cache=None):
+    """시트 분석 결과를 파일 결과와 폴더 전체 고유 집합에 반영 (시트 순서대로 호출)"""
+    for kind, rows in result['rows'].items():
+        file_rows[kind].extend(rows)
+    # 유효한 열과 카테고리를 파일 목록에 추가
+    file_columns.update(result['columns'])
+    file_categories.update(result['categories'])
+    # 고유한 단어 수집 (폴더 전체 기준)
+    for category, words, occurrences in result['unique']:
+        temp_manager.add_words(category, words, occurrences)
+    if result.get('cells') is not None and cell_results is not None:
+        result['cells'].write_to(cell_results)
+    if 'tokenizers' in result:
+        merge_tokenizer_state(result['tokenizers'])
+    if result.get('lang_cache') is not None and lang_cache is not None:
+        lang_cache.merge_updates(*result['lang_cache'])
+
+def get_tokenizer_rows(profile):
+    """tokenizer_stats 기록을 언어/백엔드별 보고서 행으로 변환"""
+    rows = []
+    for (language, backend), (texts, tokens, chars, seconds) in sorted(tokenizer_stats.items()):
+        tokens_per_second = round(tokens / seconds) if seconds > 0 else 0
+        rows.append([profile, LANGUAGE_MAPPING.get(language, language), backend, texts, chars, tokens,
+                     round(seconds, 3), tokens_per_second])
+    return rows
+
+def write_report(report_path, file_order, file_records, temp_manager, current_language,
+                 tokenizer_profile=DEFAULT_TOKENIZER_PROFILE):
+    """파일별 결과 레코드로 보고서 작성 (일반 실행과 샤드 병합에서 공통 사용)
+
+    행은 file_order(상대 경로 목록) 순서대로 배치하고, 폴더 전체 고유 단어는
+    temp_manager에 모인 집합으로 계산한다. 토크나이저 처리량은 tokenizer_stats 기록을 사용한다.
+    """
     # 전체 열을 추적하기 위한 변수
     all_columns = set()
     all_categories = set()
-    processed_files = 0
 
     data_rows_real = []
     data_rows_unique_for_sheet = []
-    data_rows_unique_for_folder = []
     data_rows_cell_address = []
     data_rows_cells = []
+    data_rows_watchdog = []
+    data_rows_delta = []
 
-    # 콘솔 출력이 가능한지 확인
-    has_console = hasattr(sys.stdout, 'write') and sys.stdout is not None
-    
-    for rel_path, file_name in tqdm(files_to_process, desc="processing files", disable=not has_console):
-        try:
-            print(f"\n{t('UI_011', current_language)}: {file_name}")
-            file_path = os.path.join(folder_path, rel_path)
-            xls = pd.ExcelFile(file_path)
-
-            for sheet_name in xls.sheet_names:
-                print(f"{t('UI_012', current_language)}: {sheet_name}")
-                df = pd.read_excel(xls, sheet_name=sheet_name, header=None)
-                
-                total_counts, column_counts, valid_columns, column_languages = analyze_sheet_for_words(df)
-                unique_counts = get_unique_words_per_column(df, column_languages)
-                cell_addresses = get_cell_addresses_for_words(df, column_languages)
-                cell_counts = count_cells_by_category_for_words(df, column_languages)
-
-                # 유효한 열을 전체 열 목록에 추가
-                for col in valid_columns:
-                    all_columns.add(col)
-
-                # 전체 카테고리 업데이트
-                all_categories.update(total_counts.keys())
-
-                # 고유한 단어 수집 (폴더 전체 기준)
-                for r in range(df.shape[0]):
-                    for c in range(df.shape[1]):
-                        cell_value = df.iat[r, c]
-                        if pd.isna(cell_value) or str(cell_value).strip() == '':
-                            continue
-                        
-                        text = str(cell_value)
-                        col_lang = column_languages.get(c, 'unknown')
-                        
-                        if col_lang != 'unknown':
-                            display_name = LANGUAGE_MAPPING.get(col_lang, col_lang)
-                            words = process_text_by_language(text, col_lang)
-                            temp_manager.add_words(display_name, words)
-
-                # 실제 데이터 처리
-                for category in total_counts:
-                    if category in ['html_xml', 'brackets', 'newlines', 'file_paths']:
-                        emoji = '🔧'  # 특수 패턴용 이모지
-                    else:
-                        emoji = '🌐'  # 언어용 이모지
-                    
-                    col_totals = [column_counts[col].get(category, 0) for col in valid_columns]
-                    total = total_counts[category]
-                    sum_col_totals = sum(col_totals)
-                    
-                    if sum_col_totals != total:
-                        status = f"Error: Total words({total}) and column totals({sum_col_totals}) do not match"
-                    else:
-                        status = "Normal"
-
-                    row_data = [rel_path, file_name, sheet_name, status, emoji, category, total] + col_totals
-                    data_rows_real.append(row_data)
-
-                # 고유 값 데이터 처리
-                for category in total_counts:
-                    if category in ['html_xml', 'brackets', 'newlines', 'file_paths']:
-                        emoji = '🔧'
-                    else:
-                        emoji = '🌐'
-                    
-                    unique_col_totals = [unique_counts[col].get(category, 0) for col in valid_columns]
-                    total_unique = sum(unique_col_totals)
-                    row_data = [rel_path, file_name, sheet_name, "Normal", emoji, category, total_unique] + unique_col_totals
-                    data_rows_unique_for_sheet.append(row_data)
-                
-                # 셀 주소 데이터 처리
-                for category in total_counts:
-                    if category in ['html_xml', 'brackets', 'newlines', 'file_paths']:
-                        emoji = '🔧'
-                    else:
-                        emoji = '🌐'
-                    
-                    cell_col_addresses = [', '.join(cell_addresses[category][col]) for col in valid_columns]
-                    total_cells = sum(len(cell_addresses[category][col]) for col in valid_columns)
-                    row_data = [rel_path, file_name, sheet_name, "Normal", emoji, category, total_cells] + cell_col_addresses
-                    data_rows_cell_address.append(row_data)
-                
-                # 셀 갯수 데이터 처리
-                for category in total_counts:
-                    if category in ['html_xml', 'brackets', 'newlines', 'file_paths']:
-                        emoji = '🔧'
-                    else:
-                        emoji = '🌐'
-                    
-                    cell_col_counts = [cell_counts[category][col] for col in valid_columns]
-                    total_cells = sum(cell_col_counts)
-                    row_data = [rel_path, file_name, sheet_name, "Normal", emoji, category, total_cells] + cell_col_counts
-                    data_rows_cells.append(row_data)
-
-            processed_files += 1
-            print(t('UI_013', current_language).format(f"{processed_files}/{len(files_to_process)}"))
-
-        except Exception as e:
-            print(f"{t('UI_017', current_language)}: {file_name} {t('UI_018', current_language)}: {e}")
+    # 파일 순서대로 보고서 행 구성 (중단 없이 실행한 경우와 동일한 순서)
+    for rel_path in file_order:
+        record = file_records.get(rel_path)
+        if record is None:
             continue
+        all_columns.update(record['columns'])
+        all_categories.update(record['categories'])
+        data_rows_real.extend(record['rows']['real'])
+        data_rows_unique_for_sheet.extend(record['rows']['unique_for_sheet'])
+        data_rows_cell_address.extend(record['rows']['cell_address'])
+        data_rows_cells.extend(record['rows']['cells'])
+        data_rows_watchdog.extend(record['rows'].get('watchdog', []))
+        data_rows_delta.extend(record['rows'].get('delta', []))
 
     print(f"\n{t('UI_014', current_language)}")
     
@@ -790,53 +1347,413 @@ def main(current_language='ko'):
     column_headers = [f"Col {get_column_letter(col+1)}" for col in sorted_columns]
     headers = ['Path', 'FileName', 'SheetName', 'Status', '🏳️', 'Category', 'TotalWords'] + column_headers
     
+    # Excel 크기 한도를 넘는 시트는 이어지는 시트/워크북으로 나누어 저장
+    writer = ReportWriter(report_path, finish_sheet=adjust_column_widths)
+
     # Words_real 시트에 데이터 추가
-    report_ws_real.append(headers)
-    for row in data_rows_real:
-        report_ws_real.append(row)
-    adjust_column_widths(report_ws_real)
+    writer.write_sheet('Words_real', headers, data_rows_real)
 
     # Words_unique_for_Sheet 시트에 데이터 추가
-    report_ws_unique_for_sheet.append(headers)
-    for row in data_rows_unique_for_sheet:
-        report_ws_unique_for_sheet.append(row)
-    adjust_column_widths(report_ws_unique_for_sheet)
+    writer.write_sheet('Words_unique_for_Sheet', headers, data_rows_unique_for_sheet)
     
     # Words_unique_for_Folder 시트에 데이터 추가
-    report_ws_unique_for_folder.append(headers)
+    data_rows_unique_for_folder = []
+    folder_status = temp_manager.get_unique_status()
     for category in sorted(all_categories):
         if category in ['html_xml', 'brackets', 'newlines', 'file_paths']:
             emoji = '🔧'
+        elif category == IDENTIFIER_CATEGORY:
+            emoji = '🔑'
         else:
             emoji = '🌐'
         
-        unique_words = temp_manager.get_all_unique_words(category)
-        total_unique_words = len(unique_words)
-        row_data = ['ALL', 'ALL', 'ALL', 'Normal', emoji, category, total_unique_words] + [0] * len(sorted_columns)
-        report_ws_unique_for_folder.append(row_data)
-    adjust_column_widths(report_ws_unique_for_folder)
+        total_unique_words = temp_manager.count_unique_words(category)
+        row_data = ['ALL', 'ALL', 'ALL', folder_status, emoji, category, total_unique_words] + [0] * len(sorted_columns)
+        data_rows_unique_for_folder.append(row_data)
+    writer.write_sheet('Words_unique_for_Folder', headers, data_rows_unique_for_folder)
     
     # Words_cell_address 시트에 데이터 추가
     cell_address_headers = headers.copy()
     cell_address_headers[5] = 'TotalCells'  # F1 셀의 헤더 변경
-    report_ws_cell_address.append(cell_address_headers)
-    for row in data_rows_cell_address:
-        report_ws_cell_address.append(row)
-    adjust_column_widths(report_ws_cell_address)
+    writer.write_sheet('Words_cell_address', cell_address_headers, data_rows_cell_address)
     
     # Words_cells 시트에 데이터 추가
     cells_headers = headers.copy()
     cells_headers[5] = 'TotalCells'  # F1 셀의 헤더 변경
-    report_ws_cells.append(cells_headers)
-    for row in data_rows_cells:
-        report_ws_cells.append(row)
-    adjust_column_widths(report_ws_cells)
+    writer.write_sheet('Words_cells', cells_headers, data_rows_cells)
 
-    # 임시 파일 정리
-    temp_manager.cleanup()
+    # Words_top 시트 (--top-words 사용 시 카테고리별 빈도 상위 단어와 출현 횟수)
+    if temp_manager.frequencies is not None:
+        data_rows_top = []
+        top_status = temp_manager.get_top_words_status()
+        for category in sorted(temp_manager.frequencies):
+            for rank, (word, count, error) in enumerate(temp_manager.get_top_words(category), start=1):
+                data_rows_top.append([top_status, '🌐', category, rank, word, count, error])
+        writer.write_sheet('Words_top', ['Status', '🏳️', 'Category', 'Rank', 'Word', 'Count', 'MaxOverestimate'], data_rows_top)
+
+    # Words_watchdog 시트 (토큰화 시간/메모리 한도를 넘었거나 토크나이저 오류로 split()을 사용한 셀)
+    if data_rows_watchdog:
+        watchdog_headers = ['Path', 'FileName', 'SheetName', 'Status', 'Language', 'Cells', 'Chars', 'Seconds',
+                            'PeakMemory', 'FallbackChunks']
+        writer.write_sheet('Words_watchdog', watchdog_headers, data_rows_watchdog, key_columns=4)
 
-    report_wb.save(report_path)
+    # Words_tokenizers 시트 (토크나이저 프로필과 언어별 백엔드, 처리량)
+    writer.write_sheet('Words_tokenizers', TOKENIZER_HEADERS, get_tokenizer_rows(tokenizer_profile), key_columns=3)
+
+    # Words_repetition 시트 (--repetition 사용 시 파일 순서대로 반복/퍼지 매치 구간별 단어 수)
+    if any('segments' in record['rows'] for record in file_records.values()):
+        print(t('UI_031', current_language))
+        repetition_headers = ['Path', 'FileName', 'Status', 'Cells'] + MATCH_BAND_NAMES + ['TotalWords']
+        writer.write_sheet('Words_repetition', repetition_headers, analyze_repetitions(file_order, file_records), key_columns=4)
+
+    # Words_delta 시트 (--baseline 사용 시 기준 대비 새/변경/유지 셀의 단어 수와 글자 수, 폴더 합계는 ALL 행)
+    if any('delta' in record['rows'] for record in file_records.values()):
+        delta_rows = data_rows_delta + get_delta_total_rows(data_rows_delta)
+        writer.write_sheet('Words_delta', get_delta_headers(['Words', 'Chars']), delta_rows, key_columns=6)
+
+    report_paths = writer.close()
     print(f"{t('UI_015', current_language)}: {report_path}")
+    if writer.split:
+        print(f"{t('UI_026', current_language)}: {', '.join(os.path.basename(path) for path in report_paths)}")
+
+def select_tokenizer_profile(profile, current_language='ko'):
+    """토크나이저 프로필을 설정하고 언어별 백엔드를 미리 불러옴 (첫 셀의 토큰화 시간에 모델 로드가 섞이지 않도록)"""
+    set_tokenizer_profile(profile)
+    backends = load_tokenizers(LANGUAGE_MAPPING)
+    loaded = ', '.join(f"{language}={name}" for language, name in backends.items() if name != 'split')
+    print(f"{t('UI_034', current_language)}: {profile} ({loaded or 'split'})")
+
+def main(current_language='ko', use_lang_cache=True, lang_cache_headers=False, cell_routing=False,
+         prefetch_depth=PREFETCH_DEPTH, prefetch_process=False, resume=False, shard=None, shard_balance='hash',
+         hll_error=None, top_words=0, top_words_exact=False, detect_identifiers=True,
+         include=None, exclude=None, scan_workers=DISCOVERY_WORKERS,
+         memory_budget=None, read_workers=DEFAULT_READ_WORKERS, repetition=False, unique_memory=DEFAULT_UNIQUE_MEMORY,
+         results_db=False, tokenizer_profile=DEFAULT_TOKENIZER_PROFILE, sheet_workers=0, baseline=None):
+    """메인 함수"""
+    # exe 파일이 실행된 경로를 기준으로 설정
+    folder_path = os.path.dirname(os.path.abspath(sys.executable)) if getattr(sys, 'frozen', False) else os.path.dirname(os.path.abspath(__file__))
+    print(f"{t('UI_006', current_language)}: {folder_path}")
+    
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    report_name = f"WORD_COUNT_REPORT_{timestamp}.xlsx"
+    report_path = os.path.join(folder_path, report_name)
+    print(f"{t('UI_007', current_language)}: {report_path}")
+
+    # 열 언어 감지 캐시 초기화 (이전 실행 결과 재사용)
+    lang_cache = None
+    if use_lang_cache:
+        lang_cache = LanguageDetectionCache(os.path.join(folder_path, LANG_CACHE_FILE), use_header=lang_cache_headers)
+
+    # 토크나이저 프로필에 맞는 언어별 백엔드를 미리 불러옴
+    select_tokenizer_profile(tokenizer_profile, current_language)
+
+    # 기준 실행의 결과 데이터베이스로 새/변경/유지 셀을 분류할 색인을 만듦
+    baseline_index = None
+    if baseline:
+        baseline_index = BaselineIndex(baseline)
+        print(t('UI_037', current_language).format(baseline_index.path, len(baseline_index)))
+
+    # 하위 폴더를 포함한 엑셀 파일 탐색 (찾는 대로 분석을 시작하고 탐색은 함께 진행)
+    discovery = FileDiscovery(folder_path, include=include, exclude=exclude, workers=scan_workers)
+
+    # 샤드 실행이면 이 샤드에 배정된 파일만 처리하고, 보고서 대신 결과 묶음을 남김
+    # (샤드 배정에는 전체 파일 목록이 필요하므로 탐색을 먼저 마침)
+    if shard:
+        shard_index, shard_count = shard
+        files_to_process = discovery.collect()
+        print(f"{t('UI_008', current_language)}: {[f[1] for f in files_to_process]}")
+        work_files = select_shard_files(folder_path, files_to_process, shard_index, shard_count, shard_balance)
+        bundle_dir = get_shard_dir(folder_path, 'words', shard_index, shard_count)
+        print(t('UI_023', current_language).format(f"{shard_index}/{shard_count}", len(work_files)))
+    else:
+        print(t('UI_027', current_language))
+        work_files = discovery
+        bundle_dir = os.path.join(folder_path, CHECKPOINT_DIR_PREFIX + 'words')
+
+    # 체크포인트 (완료된 파일 결과와 폴더 전체 고유 집합 상태를 주기적으로 저장)
+    # 셀 단위 라우팅/근사 고유 값/상위 단어/키 열 판정/반복 분석/토크나이저 프로필/기준 설정에 따라 결과가 달라지므로 설정이 다르면 이어서 처리하지 않음
+    options = {'cell_routing': cell_routing, 'hll_error': hll_error,
+               'top_words': top_words, 'top_words_exact': top_words_exact,
+               'detect_identifiers': detect_identifiers, 'repetition': repetition, 'results_db': results_db,
+               'tokenizer_profile': tokenizer_profile,
+               'baseline': baseline_index.path if baseline_index is not None else None}
+    if shard:
+        options.update({'shard': [shard_index, shard_count], 'shard_balance': shard_balance,
+                        'include': include, 'exclude': exclude})
+    checkpoint = ResultBundle(bundle_dir, 'words', options=options)
+    checkpoint.files = discovery.rel_paths  # 탐색이 진행되며 채워짐
+    file_records = {}
+    if resume and checkpoint.load():
+        file_records = {record['rel_path']: record for record in checkpoint.get_file_records()}
+        print(t('UI_021', current_language).format(len(file_records)))
+    else:
+        checkpoint.reset()
+    # 토크나이저 처리량 기록 (재개 시 체크포인트까지의 기록을 이어서 셈)
+    tokenizer_stats.clear()
+    merge_tokenizer_state(checkpoint.extra_state.get('tokenizers', []))
+    tokenizer_state = {'tokenizers': get_tokenizer_state()}  # 마지막으로 완료된 파일까지의 기록 (체크포인트에 저장)
+
+    # 임시 파일 매니저 초기화 (체크포인트 디렉토리에 저장하여 재개 시 복원)
+    temp_manager = TempWordManager(folder_path, temp_dir=checkpoint.unique_dir, hll_error=hll_error,
+                                   top_words=top_words, top_words_exact=top_words_exact, unique_memory=unique_memory)
+    temp_manager.restore_state(checkpoint.unique_state)
+
+    # 셀 단위 결과 데이터베이스 (결과 묶음 안에 기록하여 재개 시 이어서 쓰고, 보고서를 저장하면 보고서 옆으로 옮김)
+    cell_results = ResultsDatabase(os.path.join(bundle_dir, RESULTS_DB_FILE), RESULTS_DB_COLUMNS) if results_db else None
+
+    if discovery.finished:
+        print(t('UI_009', current_language).format(len(work_files)))
+    print(t('UI_010', current_language))
+
+    processed_files = len(file_records)
+    pending_files = (f for f in work_files if f[0] not in file_records)
+    pending_total = sum(f[0] not in file_records for f in work_files) if discovery.finished else None
+
+    # 콘솔 출력이 가능한지 확인
+    has_console = hasattr(sys.stdout, 'write') and sys.stdout is not None
+    
+    # 현재 워크북을 분석하는 동안 다음 워크북들을 백그라운드에서 미리 읽음
+    if memory_budget:
+        # 메모리 예산 안에서 여러 워크북을 동시에 읽음 (예산보다 큰 파일은 단독으로 읽음)
+        budget = MemoryBudget(memory_budget, workers=read_workers, log_path=os.path.join(folder_path, MEMORY_LOG_FILE))
+        workbooks = prefetch_workbooks_within_budget(folder_path, pending_files, budget, prefetch_depth,
+                                                     use_process=prefetch_process)
+    else:
+        budget = None
+        workbooks = prefetch_workbooks(folder_path, pending_files, depth=prefetch_depth, use_process=prefetch_process)
+
+    # 시트가 여럿인 워크북은 시트 단위로 워커 프로세스에 나누어 분석 (0이면 순차 분석)
+    sheet_pool = SheetPool(sheet_workers, init_sheet_worker, (lang_cache, tokenizer_profile, baseline_index))
+
+    try:
+        for rel_path, file_name, sheets, read_error in tqdm(workbooks, total=pending_total, desc="processing files", disable=not has_console):
+            file_rows = new_file_rows()  # 이 파일의 보고서 행
+            if repetition:
+                # 반복 분석용 세그먼트 (보고서 작성 시 모든 파일을 순서대로 색인)
+                file_rows['segments'] = []
+            file_rows['watchdog'] = []  # 토큰화 한도를 넘었거나 토크나이저 오류가 난 셀
+            if baseline_index is not None:
+                file_rows['delta'] = []  # 기준 대비 새/변경/유지 셀의 단어 수와 글자 수
+            file_columns = set()  # 이 파일의 유효한 열
+            file_categories = set()  # 이 파일의 카테고리
+            try:
+                print(f"\n{t('UI_011', current_language)}: {file_name}")
+                if cell_results is not None:
+                    cell_results.begin_file(rel_path, file_name)
+
+                # 시트가 여럿이면 워커 프로세스에서 동시에 분석하고 결과는 시트 순서대로 반영
+                local_task = partial(analyze_sheet_task, rel_path, file_name, lang_cache=lang_cache, cell_routing=cell_routing,
+                                     detect_identifiers=detect_identifiers, repetition=repetition,
+                                     cell_results=cell_results, current_language=current_language,
+                                     baseline=baseline_index)
+                worker_task = partial(run_sheet_task_in_worker, rel_path, file_name, cell_routing, detect_identifiers,
+                                      repetition, results_db, current_language)
+                for sheet_name, result in sheet_pool.map(sheets, local_task, worker_task):
+                    apply_sheet_result(result, file_rows, file_columns, file_categories, temp_manager, cell_results, lang_cache)
+
+                if read_error is not None:
+                    raise read_error
+
+                processed_files += 1
+                print(t('UI_013', current_language).format(f"{processed_files}/{len(work_files) if shard else discovery.format_count()}"))
+
+            except Exception as e:
+                print(f"{t('UI_017', current_language)}: {file_name} {t('UI_018', current_language)}: {e}")
+
+            # 오류가 난 파일도 그때까지의 결과를 그대로 기록 (재개 시 다시 처리하지 않음)
+            if cell_results is not None:
+                cell_results.commit_file()
+            temp_manager.commit_file()
+            cached_special_patterns.cache_clear()
+            file_records[rel_path] = checkpoint.add_file(rel_path, file_name, file_rows, file_columns, file_categories)
+            tokenizer_state = {'tokenizers': get_tokenizer_state()}
+            checkpoint.maybe_save(temp_manager, tokenizer_state)
+
+        # 보고서 저장에 실패해도 --resume으로 다시 생성할 수 있도록 마지막 상태 저장
+        checkpoint.save(temp_manager, tokenizer_state)
+    except KeyboardInterrupt:
+        # 처리 중이던 파일은 재개 시 다시 토큰화하므로 완료된 파일까지의 기록만 저장 (상위 단어 빈도도 commit_file까지)
+        checkpoint.save(temp_manager, tokenizer_state)
+        if lang_cache is not None:
+            lang_cache.save()
+        print(f"\n{t('UI_022', current_language)}")
+        raise
+    finally:
+        sheet_pool.close()
+        if budget is not None:
+            budget.close()
+        if cell_results is not None:
+            cell_results.close()
+
+    if sheet_pool.parallel_sheets:
+        print(t('UI_036', current_language).format(sheet_pool.parallel_sheets, sheet_workers))
+
+    if budget is not None:
+        print(t('UI_028', current_language).format(format_memory_size(budget.peak_reserved), format_memory_size(budget.limit),
+                                                   budget.streamed_files, budget.log_path))
+
+    if temp_manager.store.spills:
+        print(t('UI_032', current_language).format(format_memory_size(temp_manager.store.memory_limit), temp_manager.store.spills))
+
+    if lang_cache is not None:
+        lang_cache.save()
+        print(t('UI_020', current_language).format(lang_cache.hits, lang_cache.misses))
+
+    if shard:
+        # 샤드 실행은 완료 표시만 남기고 보고서는 merge 단계에서 작성
+        checkpoint.finished = True
+        checkpoint.save(temp_manager, tokenizer_state)
+        print(f"{t('UI_024', current_language)}: {bundle_dir}")
+        return
+
+    print(t('UI_009', current_language).format(len(discovery)))
+    write_report(report_path, discovery.rel_paths, file_records, temp_manager, current_language, tokenizer_profile)
+    if cell_results is not None:
+        cell_results.save_as(get_results_db_path(report_path))
+        print(f"{t('UI_033', current_language)}: {cell_results.path}")
+
+    # 보고서가 저장된 후 임시 파일 및 체크포인트 정리
+    temp_manager.cleanup()
+    checkpoint.remove()
+
+def merge(current_language='ko', bundle_dirs=None, unique_memory=DEFAULT_UNIQUE_MEMORY):
+    """샤드 결과 묶음을 합쳐 일반 실행과 같은 보고서 작성
+
+    bundle_dirs를 지정하지 않으면 분석 폴더의 샤드 결과 묶음을 모두 사용한다.
+    샤드별 고유 집합 임시 파일을 합집합으로 읽으므로 폴더 전체 고유 단어 수도 정확하다.
+    """
+    # exe 파일이 실행된 경로를 기준으로 설정
+    folder_path = os.path.dirname(os.path.abspath(sys.executable)) if getattr(sys, 'frozen', False) else os.path.dirname(os.path.abspath(__file__))
+    print(f"{t('UI_006', current_language)}: {folder_path}")
+
+    if not bundle_dirs:
+        bundle_dirs = find_shard_dirs(folder_path, 'words')
+    print(t('UI_025', current_language).format(len(bundle_dirs)))
+    file_order, file_records, bundles = load_shard_bundles(bundle_dirs, 'words')
+
+    options = bundles[0].options
+    temp_manager = TempWordManager(folder_path, hll_error=options.get('hll_error'),
+                                   top_words=options.get('top_words', 0), top_words_exact=options.get('top_words_exact', False),
+                                   unique_memory=unique_memory)
+    tokenizer_stats.clear()
+    for bundle in bundles:
+        temp_manager.merge_state(bundle.unique_state, bundle.unique_dir)
+        merge_tokenizer_state(bundle.extra_state.get('tokenizers', []))
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    report_name = f"WORD_COUNT_REPORT_{timestamp}.xlsx"
+    report_path = os.path.join(folder_path, report_name)
+    print(f"{t('UI_007', current_language)}: {report_path}")
+
+    write_report(report_path, file_order, file_records, temp_manager, current_language,
+                 options.get('tokenizer_profile', DEFAULT_TOKENIZER_PROFILE))
+    temp_manager.cleanup()
+
+    if options.get('results_db'):
+        # 샤드별 셀 단위 결과 데이터베이스를 하나로 합침
+        cell_results = ResultsDatabase(get_results_db_path(report_path), RESULTS_DB_COLUMNS)
+        for bundle in bundles:
+            cell_results.merge_from(os.path.join(bundle.bundle_dir, RESULTS_DB_FILE))
+        cell_results.close()
+        print(f"{t('UI_033', current_language)}: {cell_results.path}")
+
+def estimate(current_language='ko', target_error=DEFAULT_TARGET_ERROR, use_lang_cache=True, lang_cache_headers=False,
+             cell_routing=False, prefetch_depth=PREFETCH_DEPTH, detect_identifiers=True,
+             include=None, exclude=None, scan_workers=DISCOVERY_WORKERS, tokenizer_profile=DEFAULT_TOKENIZER_PROFILE):
+    """파일과 시트별 행을 표본으로 세어 폴더 전체 단어 수를 신뢰구간과 함께 추정 (견적용 빠른 실행)"""
+    folder_path = os.path.dirname(os.path.abspath(sys.executable)) if getattr(sys, 'frozen', False) else os.path.dirname(os.path.abspath(__file__))
+    print(f"{t('UI_006', current_language)}: {folder_path}")
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    report_path = os.path.join(folder_path, f"WORD_ESTIMATE_REPORT_{timestamp}.xlsx")
+    print(f"{t('UI_007', current_language)}: {report_path}")
+
+    lang_cache = None
+    if use_lang_cache:
+        lang_cache = LanguageDetectionCache(os.path.join(folder_path, LANG_CACHE_FILE), use_header=lang_cache_headers)
+    select_tokenizer_profile(tokenizer_profile, current_language)
+
+    # 파일 표본은 전체 목록에서 뽑으므로 탐색을 먼저 마침
+    files = FileDiscovery(folder_path, include=include, exclude=exclude, workers=scan_workers).collect()
+    print(t('UI_009', current_language).format(len(files)))
+    print(t('UI_030', current_language).format(f"{target_error:.1%}"))
+
+    estimator = estimate_folder(folder_path, files,
+                                lambda df: get_row_word_matrix(df, lang_cache, cell_routing, detect_identifiers),
+                                target_error, current_language, prefetch_depth)
+    if lang_cache is not None:
+        lang_cache.save()
+    categories = []
+    for category in WORD_CATEGORIES:
+        if category in SPECIAL_PATTERNS:
+            emoji = '🔧'  # 특수 패턴용 이모지
+        elif category == IDENTIFIER_CATEGORY:
+            emoji = '🔑'  # 키/ID 열용 이모지
+        else:
+            emoji = '🌐'  # 언어용 이모지
+        categories.append((category, emoji))
+    write_estimate_report(report_path, estimator, categories, target_error, current_language, adjust_column_widths)
+
+def collect_benchmark_samples(folder_path, files, sample_texts, lang_cache=None, prefetch_depth=PREFETCH_DEPTH,
+                              current_language='ko'):
+    """파일을 표본 순서로 읽으며 열 언어별로 전처리된 텍스트를 최대 sample_texts개씩 모음
+
+    키/ID 열과 TOKENIZE_CHUNK_CHARS보다 긴 텍스트는 제외하며, 처음 읽은 INITIAL_SAMPLE_FILES개 파일의
+    언어가 모두 채워지면 나머지 파일은 읽지 않는다.
+    """
+    samples = defaultdict(list)
+    read_files = 0
+    for rel_path, file_name, sheets, read_error in prefetch_workbooks(folder_path, shuffle_files(files), depth=prefetch_depth):
+        for sheet_name, df in sheets:
+            for c, column_groups in group_distinct_values(df, text_only=True).items():
+                if is_identifier_column(column_groups):
+                    continue
+                language = detect_column_language(df, c, lang_cache)
+                if language == 'unknown':
+                    continue
+                texts = samples[language]
+                for text in column_groups:
+                    if len(texts) >= sample_texts:
+                        break
+                    text = str(text).strip()
+                    if text and len(text) <= TOKENIZE_CHUNK_CHARS:
+                        texts.append(clean_text_for_words(text))
+        if read_error is not None:
+            print(f"{t('UI_017', current_language)}: {file_name} {t('UI_018', current_language)}: {read_error}")
+        read_files += 1
+        if read_files >= INITIAL_SAMPLE_FILES and all(len(texts) >= sample_texts for texts in samples.values()):
+            break
+    return samples
+
+def benchmark_tokenizers(current_language='ko', sample_texts=DEFAULT_BENCHMARK_TEXTS, use_lang_cache=True,
+                         lang_cache_headers=False, prefetch_depth=PREFETCH_DEPTH,
+                         include=None, exclude=None, scan_workers=DISCOVERY_WORKERS):
+    """폴더의 언어별 표본 텍스트로 토크나이저 프로필/백엔드별 처리량(토큰/초)과 토큰 수 차이를 측정"""
+    folder_path = os.path.dirname(os.path.abspath(sys.executable)) if getattr(sys, 'frozen', False) else os.path.dirname(os.path.abspath(__file__))
+    print(f"{t('UI_006', current_language)}: {folder_path}")
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    report_path = os.path.join(folder_path, f"TOKENIZER_BENCHMARK_{timestamp}.xlsx")
+    print(f"{t('UI_007', current_language)}: {report_path}")
+
+    lang_cache = None
+    if use_lang_cache:
+        lang_cache = LanguageDetectionCache(os.path.join(folder_path, LANG_CACHE_FILE), use_header=lang_cache_headers)
+
+    files = FileDiscovery(folder_path, include=include, exclude=exclude, workers=scan_workers).collect()
+    print(t('UI_009', current_language).format(len(files)))
+    print(t('UI_035', current_language).format(sample_texts))
+
+    samples = collect_benchmark_samples(folder_path, files, sample_texts, lang_cache, prefetch_depth, current_language)
+    if lang_cache is not None:
+        lang_cache.save()
+    # 모델 로드 시간은 측정에서 제외
+    for profile in TOKENIZER_PROFILES:
+        set_tokenizer_profile(profile)
+        load_tokenizers(samples)
+    set_tokenizer_profile(DEFAULT_TOKENIZER_PROFILE)
+    rows = run_benchmark(samples, LANGUAGE_MAPPING)
+    write_benchmark_report(report_path, rows, current_language, adjust_column_widths)
 
 if __name__ == "__main__":
     try:
@@ -0,0 +1,285 @@
+import os
+import math
+import random
+import numpy as np
+from translations import t
+from report_writer import ReportWriter
+from workbook_reader import prefetch_workbooks, PREFETCH_DEPTH
+
+# --estimate 값을 생략했을 때의 목표 상대 오차 (95% 신뢰구간 반폭 / 추정치)
+DEFAULT_TARGET_ERROR = 0.05
+
+# 95% 신뢰구간의 정규분포 분위수
+CONFIDENCE_Z = 1.96
+
+# 첫 라운드에서 읽을 파일 수 (목표 오차에 못 미치면 라운드마다 표본 파일 수를 두 배로 늘림)
+INITIAL_SAMPLE_FILES = 10
+
+# 파일 하나에서 셀 표본 행 수 (시트 크기에 비례해 배분, 행 표본 오차가 크면 다음 라운드부터 두 배)
+INITIAL_SAMPLE_ROWS = 200
+MAX_SAMPLE_ROWS = 12800
+
+# 시트마다 셀 최소 표본 행 수 (시트 안 분산 추정에 2행 이상 필요)
+MIN_SHEET_SAMPLE_ROWS = 10
+
+# 전체 추정치에서 이 비율 이상인 카테고리만 목표 오차를 확인 (작은 카테고리는 신뢰구간만 보고)
+MIN_CATEGORY_SHARE = 0.05
+
+# 파일 순서와 행 표본을 정하는 시드 (같은 폴더는 항상 같은 표본)
+SAMPLE_SEED = 0
+
+def shuffle_files(files, seed=SAMPLE_SEED):
+    """파일 목록을 상대 경로 순으로 정렬한 뒤 고정 시드로 섞음 (앞에서부터 n개가 단순 무작위 표본)"""
+    order = sorted(files)
+    random.Random(seed).shuffle(order)
+    return order
+
+def allocate_sheet_rows(sheet_rows, sample_rows):
+    """파일의 표본 행 수를 시트 크기에 비례해 배분 (시트별 표본 행 수 목록, 첫 행 제외)
+
+    첫 행(머리글)은 항상 세므로 나머지 행 수를 기준으로 배분하며, 시트마다 최소
+    MIN_SHEET_SAMPLE_ROWS행을 배정하고 시트보다 많이 배정되면 시트 전체를 센다.
+    """
+    body_rows = [max(rows - 1, 0) for rows in sheet_rows]
+    total = sum(body_rows)
+    allocation = []
+    for rows in body_rows:
+        share = math.ceil(sample_rows * rows / total) if total else 0
+        allocation.append(min(rows, max(share, MIN_SHEET_SAMPLE_ROWS)))
+    return allocation
+
+def sample_sheet_rows(num_rows, sample_size, rng):
+    """표본으로 셀 행 번호 (첫 행 + 나머지 행에서 비복원 무작위 추출, 오름차순)"""
+    if num_rows == 0:
+        return []
+    if sample_size >= num_rows - 1:
+        return list(range(num_rows))
+    return [0] + sorted(rng.sample(range(1, num_rows), sample_size))
+
+def estimate_sheet_total(row_counts, num_rows):
+    """표본 행의 카테고리별 값(행 x 카테고리)으로 시트 합계와 분산 추정
+
+    첫 행은 그대로 더하고 나머지 행은 표본 평균 x 행 수로 확장한다
+    (분산은 비복원 추출의 유한 모집단 보정 포함, 전체를 셌으면 0).
+    """
+    num_categories = row_counts.shape[1]
+    if num_rows == 0 or len(row_counts) == 0:
+        return np.zeros(num_categories), np.zeros(num_categories)
+    body = row_counts[1:].astype(np.float64)
+    body_rows = num_rows - 1
+    sampled = len(body)
+    total = row_counts[0].astype(np.float64)
+    variance = np.zeros(num_categories)
+    if sampled:
+        total = total + body_rows * body.mean(axis=0)
+        if 1 < sampled < body_rows:
+            variance = body_rows ** 2 * (1 - sampled / body_rows) * body.var(axis=0, ddof=1) / sampled
+    return total, variance
+
+def pad_vector(vector, size):
+    """카테고리 수가 늘어난 경우(단어 수 분석의 새 언어) 뒤를 0으로 채움"""
+    return np.pad(vector, (0, size - len(vector)))
+
+# 파일 표본과 시트별 행 표본으로 폴더 전체 합계를 추정
+class SampleEstimate:
+    """표본 파일(1단계)과 시트별 표본 행(2단계)으로 폴더 전체의 카테고리별 합계와 95% 신뢰구간을 추정
+
+    파일 합계는 파일 크기 비율 추정(표본 합계 / 표본 파일 크기 x 전체 파일 크기)으로 확장하며,
+    분산은 파일 간 분산(유한 모집단 보정)과 파일 안 행 표본 분산의 합이다.
+    """
+    def __init__(self, population_files, population_bytes):
+        self.population_files = population_files
+        self.population_bytes = population_bytes
+        self.file_totals = []  # 표본 파일별 카테고리 합계 추정
+        self.file_variances = []  # 표본 파일별 행 표본 분산
+        self.file_sizes = []
+        self.sheet_rows = []  # 보고서용 시트별 표본 정보
+        self.total_rows = 0
+        self.sampled_rows = 0
+
+    def add_file(self, rel_path, file_name, file_size, sheets, status="Normal"):
+        """표본 파일 하나의 결과 추가 (sheets: (시트 이름, 행 수, 표본 행 수, 합계, 분산) 목록)"""
+        size = max([len(sheet[3]) for sheet in sheets], default=0)
+        total, variance = np.zeros(size), np.zeros(size)
+        for sheet_name, num_rows, sample_size, sheet_total, sheet_variance in sheets:
+            total += pad_vector(sheet_total, size)
+            variance += pad_vector(sheet_variance, size)
+            self.total_rows += num_rows
+            self.sampled_rows += sample_size
+            self.sheet_rows.append([rel_path, file_name, sheet_name, status, num_rows, sample_size, file_size])
+        if not sheets:
+            self.sheet_rows.append([rel_path, file_name, '', status, 0, 0, file_size])
+        self.file_totals.append(total)
+        self.file_variances.append(variance)
+        self.file_sizes.append(file_size)
+
+    def summed(self):
+        """모든 카테고리를 합친 하나의 값으로 같은 표본을 다시 담은 추정기"""
+        summed = SampleEstimate(self.population_files, self.population_bytes)
+        summed.file_totals = [np.array([total.sum()]) for total in self.file_totals]
+        summed.file_variances = [np.array([variance.sum()]) for variance in self.file_variances]
+        summed.file_sizes = self.file_sizes
+        return summed
+
+    @property
+    def sampled_files(self):
+        return len(self.file_totals)
+
+    def compute(self):
+        """(추정치, 파일 간 분산, 행 표본 분산) 배열을 카테고리 순서로 반환"""
+        size = max([len(total) for total in self.file_totals], default=0)
+        totals = np.array([pad_vector(total, size) for total in self.file_totals]).reshape(-1, size)
+        variances = np.array([pad_vector(variance, size) for variance in self.file_variances]).reshape(-1, size)
+        sizes = np.array(self.file_sizes, dtype=np.float64)
+        sampled = len(totals)
+        if sampled == 0:
+            return np.zeros(size), np.zeros(size), np.zeros(size)
+
+        if sizes.sum() > 0:
+            # 파일 크기 비율 추정 (글자/단어 수가 파일 크기에 비례하는 부분은 파일 간 분산에서 빠짐)
+            weight = self.population_bytes / sizes.sum()
+            residuals = totals - np.outer(sizes, totals.sum(axis=0) / sizes.sum())
+        else:
+            weight = self.population_files / sampled
+            residuals = totals - totals.mean(axis=0)
+        estimate = weight * totals.sum(axis=0)
+
+        if sampled >= self.population_files:
+            between = np.zeros(size)
+        elif sampled > 1:
+            between = (self.population_files ** 2 * (1 - sampled / self.population_files)
+                       * (residuals ** 2).sum(axis=0) / (sampled - 1) / sampled)
+        else:
+            between = np.full(size, np.inf)
+        within = weight ** 2 * variances.sum(axis=0)
+        return estimate, between, within
+
+    def relative_errors(self):
+        """카테고리별 (추정치, 신뢰구간 반폭, 상대 오차)"""
+        estimate, between, within = self.compute()
+        half_width = CONFIDENCE_Z * np.sqrt(between + within)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            relative = np.where(estimate > 0, half_width / estimate, 0.0)
+        return estimate, half_width, relative
+
+    def checked_categories(self, estimate):
+        """목표 오차를 확인할 카테고리 (전체 추정치에서 MIN_CATEGORY_SHARE 이상)"""
+        total = estimate.sum()
+        return estimate >= total * MIN_CATEGORY_SHARE if total > 0 else np.zeros(len(estimate), dtype=bool)
+
+    def max_relative_error(self):
+        estimate, _, relative = self.relative_errors()
+        checked = self.checked_categories(estimate)
+        return float(relative[checked].max()) if checked.any() else 0.0
+
+    def rows_limit_error(self):
+        """행 표본 분산이 파일 간 분산보다 크면 True (행 표본을 늘려야 오차가 줄어듦)"""
+        _, between, within = self.compute()
+        return bool(within.sum() > between[np.isfinite(between)].sum())
+
+def estimate_folder(folder_path, files, count_rows, target_error, current_language, prefetch_depth=PREFETCH_DEPTH):
+    """파일과 행을 표본으로 세어 폴더 전체 합계를 추정 (목표 오차에 도달하거나 모든 파일을 셀 때까지 표본 확대)
+
+    count_rows(df)는 표본 행만 남긴 DataFrame의 행 x 카테고리 값 행렬을 반환한다
+    (일반 분석과 같은 계산을 표본에 적용).
+    """
+    order = shuffle_files(files)
+    file_sizes = {}
+    for rel_path, _ in order:
+        try:
+            file_sizes[rel_path] = os.path.getsize(os.path.join(folder_path, rel_path))
+        except OSError:
+            file_sizes[rel_path] = 0
+    population_bytes = sum(file_sizes.values())
+    estimator = SampleEstimate(len(order), population_bytes)
+
+    sample_rows = INITIAL_SAMPLE_ROWS
+    sample_count = min(INITIAL_SAMPLE_FILES, len(order))
+    round_number = 0
+    while order:
+        round_number += 1
+        batch = order[estimator.sampled_files:sample_count]
+        for rel_path, file_name, sheets, read_error in prefetch_workbooks(folder_path, batch, depth=prefetch_depth):
+            # 행 표본은 파일마다 고정 시드로 정하므로 라운드/순서와 무관하게 같음
+            rng = random.Random(f"{SAMPLE_SEED}:{rel_path}")
+            sheet_results = []
+            status = "Normal"
+            try:
+                allocation = allocate_sheet_rows([df.shape[0] for _, df in sheets], sample_rows)
+                for (sheet_name, df), sample_size in zip(sheets, allocation):
+                    rows = sample_sheet_rows(df.shape[0], sample_size, rng)
+                    row_counts = count_rows(df.iloc[rows].reset_index(drop=True))
+                    sheet_total, sheet_variance = estimate_sheet_total(row_counts, df.shape[0])
+                    sheet_results.append((sheet_name, df.shape[0], len(rows), sheet_total, sheet_variance))
+                if read_error is not None:
+                    raise read_error
+            except Exception as e:
+                # 일반 분석과 같이 오류가 난 파일은 그때까지의 결과로 집계
+                print(f"{t('UI_017', current_language)}: {file_name} {t('UI_018', current_language)}: {e}")
+                status = f"Error: {e}"
+            estimator.add_file(rel_path, file_name, file_sizes[rel_path], sheet_results, status)
+
+        max_error = estimator.max_relative_error()
+        print(t('UI_029', current_language).format(round_number, estimator.sampled_files, len(order),
+                                                   estimator.sampled_rows, max_error, target_error))
+        if max_error <= target_error:
+            break
+        if estimator.sampled_files < len(order):
+            # 파일 표본을 두 배로 늘리고, 행 표본 오차가 더 크면 새로 읽는 파일의 행 표본도 두 배로
+            if estimator.rows_limit_error():
+                sample_rows = min(sample_rows * 2, MAX_SAMPLE_ROWS)
+            sample_count = min(estimator.sampled_files * 2, len(order))
+        elif sample_rows < MAX_SAMPLE_ROWS and estimator.sampled_rows < estimator.total_rows:
+            # 모든 파일을 읽었으면 남은 오차는 행 표본에서 오므로 행 표본을 두 배로 늘려 처음부터 다시 셈
+            sample_rows = min(sample_rows * 2, MAX_SAMPLE_ROWS)
+            estimator = SampleEstimate(len(order), population_bytes)
+        else:
+            break
+    return estimator
+
+def write_estimate_report(report_path, estimator, categories, target_error, current_language, finish_sheet=None):
+    """추정 보고서 작성 (categories: 추정치 배열 순서의 (카테고리, 이모지) 목록)"""
+    estimate, half_width, relative = estimator.relative_errors()
+    checked = estimator.checked_categories(estimate)
+
+    writer = ReportWriter(report_path, finish_sheet=finish_sheet)
+    headers = ['Category', '🏳️', 'Estimate', 'CI95_Low', 'CI95_High', 'RelError', 'Status']
+    rows = []
+    for k, (category, emoji) in enumerate(categories):
+        if k >= len(estimate) or estimate[k] == 0:
+            continue
+        if relative[k] <= target_error:
+            status = "Normal"
+        elif checked[k]:
+            status = f"Warning: Relative error above target ({target_error:.1%})"
+        else:
+            status = f"Minor category: below {MIN_CATEGORY_SHARE:.0%} of total, target not applied"
+        rows.append([category, emoji, round(estimate[k]), max(0, round(estimate[k] - half_width[k])),
+                     round(estimate[k] + half_width[k]), round(float(relative[k]), 4), status])
+    # 전체 합계의 신뢰구간 (카테고리 사이의 공분산을 포함하도록 파일별 합계로 다시 추정)
+    total, total_half_width, total_relative = estimator.summed().relative_errors()
+    if len(total):
+        status = "Normal" if total_relative[0] <= target_error else f"Warning: Relative error above target ({target_error:.1%})"
+        rows.append(['Total', '∑', round(total[0]), max(0, round(total[0] - total_half_width[0])),
+                     round(total[0] + total_half_width[0]), round(float(total_relative[0]), 4), status])
+    writer.write_sheet('Estimate', headers, rows, key_columns=2)
+
+    settings = [
+        ['Files', estimator.population_files],
+        ['SampledFiles', estimator.sampled_files],
+        ['Bytes', estimator.population_bytes],
+        ['SampledBytes', sum(estimator.file_sizes)],
+        ['SampledRowsOfSampledFiles', f"{estimator.sampled_rows}/{estimator.total_rows}"],
+        ['TargetRelError', target_error],
+        ['MaxRelError', round(estimator.max_relative_error(), 4)],
+        ['Confidence', '95%'],
+        ['Seed', SAMPLE_SEED],
+    ]
+    writer.write_sheet('Estimate_settings', ['Setting', 'Value'], settings, key_columns=1)
+    writer.write_sheet('Estimate_sample', ['Path', 'FileName', 'SheetName', 'Status', 'Rows', 'SampledRows', 'FileSize'],
+                       estimator.sheet_rows, key_columns=3)
+
+    report_paths = writer.close()
+    print(f"{t('UI_015', current_language)}: {report_path}")
+    if writer.split:
+        print(f"{t('UI_026', current_language)}: {', '.join(os.path.basename(path) for path in report_paths)}")
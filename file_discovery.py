@@ -0,0 +1,135 @@
+import os
+import fnmatch
+from concurrent.futures import ThreadPoolExecutor
+
+# 분석 대상 파일 확장자
+SUPPORTED_EXTENSIONS = ('.xlsx', '.xlsm', '.csv')
+
+# 항상 건너뛰는 폴더 이름
+EXCLUDED_DIR_NAMES = ('__pycache__', '.git')
+
+# 디렉토리를 동시에 읽을 스레드 수 (네트워크 드라이브처럼 디렉토리 읽기가 느린 경우 효과가 큼)
+DISCOVERY_WORKERS = 8
+
+def matches_any(rel_path, name, patterns):
+    """glob 패턴 중 하나라도 맞는지 확인
+
+    패턴에 '/'가 있으면 분석 폴더 기준 상대 경로 전체와, 없으면 파일/폴더 이름과 비교한다.
+    """
+    if not patterns:
+        return False
+    posix_path = rel_path.replace(os.sep, '/')
+    return any(fnmatch.fnmatch(posix_path if '/' in pattern else name, pattern) for pattern in patterns)
+
+def is_target_file(rel_path, name, include=None, exclude=None):
+    """분석할 파일인지 확인 (보고서, Excel 잠금 파일 제외 후 include/exclude 패턴 적용)"""
+    if not name.endswith(SUPPORTED_EXTENSIONS) or "REPORT_" in name or name.startswith('~$'):
+        return False
+    if include and not matches_any(rel_path, name, include):
+        return False
+    return not matches_any(rel_path, name, exclude)
+
+def is_excluded_dir(rel_path, name, exclude=None):
+    """하위 전체를 건너뛸 폴더인지 확인"""
+    return name in EXCLUDED_DIR_NAMES or matches_any(rel_path, name, exclude)
+
+def scan_directory(path):
+    """디렉토리 하나를 읽어 (파일 이름 목록, 하위 폴더 이름 목록)을 이름 순으로 반환
+
+    os.walk와 같이 폴더를 가리키는 심볼릭 링크는 따라가지 않으며, 읽을 수 없는 디렉토리는 건너뛴다.
+    """
+    files, dirs = [], []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        dirs.append(entry.name)
+                    elif entry.is_file():
+                        files.append(entry.name)
+                except OSError:
+                    continue
+    except OSError as e:
+        print(f"Warning: Cannot scan directory {path}: {e}")
+    return sorted(files), sorted(dirs)
+
+def iter_target_files(folder_path, include=None, exclude=None, workers=DISCOVERY_WORKERS):
+    """하위 폴더를 포함한 분석 대상 파일을 찾는 대로 (rel_path, file_name)으로 yield 하는 제너레이터
+
+    순서는 실행/머신과 무관하게 항상 같다 (폴더마다 파일을 이름 순으로 낸 뒤 하위 폴더를 이름 순으로
+    내려감). workers가 1 이상이면 발견한 하위 폴더를 미리 스레드에서 읽어 두므로, 현재 폴더의
+    파일을 분석하는 동안 나머지 탐색이 계속된다.
+    """
+    if workers <= 0:
+        stack = [('', None)]
+        while stack:
+            rel_dir, _ = stack.pop()
+            files, dirs = scan_directory(os.path.join(folder_path, rel_dir))
+            stack.extend((os.path.join(rel_dir, name), None) for name in reversed(dirs)
+                         if not is_excluded_dir(os.path.join(rel_dir, name), name, exclude))
+            for name in files:
+                rel_path = os.path.join(rel_dir, name)
+                if is_target_file(rel_path, name, include, exclude):
+                    yield rel_path, name
+        return
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        stack = [('', executor.submit(scan_directory, folder_path))]
+        try:
+            while stack:
+                rel_dir, future = stack.pop()
+                files, dirs = future.result()
+                # 하위 폴더 읽기를 먼저 제출하여 이 폴더의 파일을 내보내는 동안 함께 진행
+                children = []
+                for name in dirs:
+                    child = os.path.join(rel_dir, name)
+                    if not is_excluded_dir(child, name, exclude):
+                        children.append((child, executor.submit(scan_directory, os.path.join(folder_path, child))))
+                stack.extend(reversed(children))
+                for name in files:
+                    rel_path = os.path.join(rel_dir, name)
+                    if is_target_file(rel_path, name, include, exclude):
+                        yield rel_path, name
+        finally:
+            # 중단(Ctrl+C 등) 시 아직 시작하지 않은 디렉토리 읽기 취소
+            for _, future in stack:
+                future.cancel()
+
+# 탐색 결과를 분석과 동시에 받아 쓰는 파일 목록
+class FileDiscovery:
+    """분석 대상 파일을 한 번만 탐색하며 찾은 파일을 차례로 내주는 반복자
+
+    files에는 지금까지 찾은 (rel_path, file_name)이, rel_paths에는 상대 경로가 쌓이며,
+    탐색이 끝나면 finished가 True가 된다. len()은 지금까지 찾은 파일 수이다.
+    """
+    def __init__(self, folder_path, include=None, exclude=None, workers=DISCOVERY_WORKERS):
+        self.files = []
+        self.rel_paths = []
+        self.finished = False
+        self._iterator = iter_target_files(folder_path, include, exclude, workers)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        try:
+            rel_path, file_name = next(self._iterator)
+        except StopIteration:
+            self.finished = True
+            raise
+        self.files.append((rel_path, file_name))
+        self.rel_paths.append(rel_path)
+        return rel_path, file_name
+
+    def __len__(self):
+        return len(self.files)
+
+    def collect(self):
+        """남은 탐색을 모두 마치고 전체 파일 목록을 반환"""
+        for _ in self:
+            pass
+        return self.files
+
+    def format_count(self):
+        """진행 표시용 파일 수 (탐색 중이면 '120+'처럼 표시)"""
+        return f"{len(self.files)}" if self.finished else f"{len(self.files)}+"
@@ -1,8 +1,24 @@
 import os
 import sys
-from count_chars import main as count_chars_main
-from count_words import main as count_words_main
+import argparse
+import multiprocessing
+from count_chars import main as count_chars_main, merge as count_chars_merge, estimate as count_chars_estimate
+from count_words import (main as count_words_main, merge as count_words_merge, estimate as count_words_estimate,
+                         benchmark_tokenizers as count_words_benchmark)
 from translations import t
+from workbook_reader import PREFETCH_DEPTH, NON_TEXT_POLICIES, XLSX_READERS
+from result_bundle import SHARD_BALANCE_MODES
+from sketches import DEFAULT_HLL_ERROR, HLL_MIN_ERROR, HLL_MAX_ERROR
+from file_discovery import DISCOVERY_WORKERS
+from memory_budget import parse_memory_size, format_memory_size, DEFAULT_READ_WORKERS
+from unique_store import DEFAULT_UNIQUE_MEMORY
+from sheet_pool import DEFAULT_SHEET_WORKERS
+from estimate import DEFAULT_TARGET_ERROR
+from word_tokenizers import TOKENIZER_PROFILES, DEFAULT_TOKENIZER_PROFILE
+from tokenizer_benchmark import DEFAULT_BENCHMARK_TEXTS
+
+# --top-words 값을 생략했을 때 보고할 상위 단어 수
+DEFAULT_TOP_WORDS = 100
 
 def select_language():
     """언어 선택 함수"""
@@ -43,20 +59,223 @@ def select_analysis_type(lang):
         return 'chars'  # 기본값
 
 
-def main():
+def shard_spec(value):
+    """--shard 값('i/N', i는 1부터 N까지)을 (i, N)으로 변환"""
+    try:
+        index, count = (int(part) for part in value.split('/'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected I/N (e.g. 1/4), got {value!r}")
+    if count < 1 or not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(f"shard index must be between 1 and N, got {value!r}")
+    return index, count
+
+
+def memory_size(value):
+    """--memory-budget 값('512M', '4G' 등)을 바이트 수로 변환"""
+    try:
+        return parse_memory_size(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def relative_error(value):
+    """--estimate 값(0.05 또는 5%)을 0과 1 사이의 비율로 변환"""
+    try:
+        error = float(value[:-1]) / 100 if value.endswith('%') else float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected a relative error such as 0.05 or 5%, got {value!r}")
+    if not 0 < error < 1:
+        raise argparse.ArgumentTypeError(f"relative error must be between 0 and 1, got {value!r}")
+    return error
+
+
+def hll_error(value):
+    """--approx-unique 값(0.02 또는 2%)을 HyperLogLog 정밀도 범위에서 얻을 수 있는 비율로 변환"""
+    error = relative_error(value)
+    if not HLL_MIN_ERROR <= error <= HLL_MAX_ERROR:
+        raise argparse.ArgumentTypeError(f"HyperLogLog error must be between {HLL_MIN_ERROR:.2%} and "
+                                         f"{HLL_MAX_ERROR:.0%}, got {value!r}")
+    return error
+
+
+def parse_args(argv=None):
+    """명령줄 옵션 파싱 (옵션 없이 실행하면 기본 동작)"""
+    parser = argparse.ArgumentParser(description='CountLocales - Excel multilingual character/word counter')
+    parser.add_argument('--no-lang-cache', action='store_true',
+                        help='disable the column language detection cache (word count)')
+    parser.add_argument('--lang-cache-headers', action='store_true',
+                        help='also reuse cached languages for columns with the same header value (word count)')
+    parser.add_argument('--cell-routing', action='store_true',
+                        help='route each cell to its own language tokenizer instead of one language per column (word count)')
+    parser.add_argument('--no-id-columns', action='store_true',
+                        help='do not detect key/ID columns (UI_001, btn_confirm_title, GUIDs); analyze them as text (word count)')
+    parser.add_argument('--prefetch', type=int, default=PREFETCH_DEPTH, metavar='N',
+                        help=f'number of workbooks to read ahead while analyzing (0 = sequential, default {PREFETCH_DEPTH})')
+    parser.add_argument('--prefetch-process', action='store_true',
+                        help='read ahead in a separate process instead of a thread')
+    parser.add_argument('--sheet-workers', type=int, nargs='?', const=DEFAULT_SHEET_WORKERS, default=0, metavar='N',
+                        help=f'analyze the sheets of a multi-sheet workbook in N worker processes and merge the results in '
+                             f'sheet order (0 = sequential, default when given without N: {DEFAULT_SHEET_WORKERS} = CPU count)')
+    parser.add_argument('--memory-budget', type=memory_size, metavar='SIZE',
+                        help='read several workbooks at once while their estimated memory fits in SIZE (e.g. 4G); '
+                             'files estimated above half of it are read with streaming in character count')
+    parser.add_argument('--read-workers', type=int, default=DEFAULT_READ_WORKERS, metavar='N',
+                        help=f'maximum number of workbooks read at once with --memory-budget (default {DEFAULT_READ_WORKERS})')
+    parser.add_argument('--unique-memory', type=memory_size, default=DEFAULT_UNIQUE_MEMORY, metavar='SIZE',
+                        help=f'memory for the folder-wide unique sets across all languages before the largest one is '
+                             f'spilled to disk (e.g. 1G, default {format_memory_size(DEFAULT_UNIQUE_MEMORY)})')
+    parser.add_argument('--resume', action='store_true',
+                        help='continue an interrupted run from its checkpoint instead of starting over')
+    parser.add_argument('--shard', type=shard_spec, metavar='I/N',
+                        help='process only shard I of N and save a result bundle instead of a report')
+    parser.add_argument('--shard-balance', choices=SHARD_BALANCE_MODES, default='hash',
+                        help='assign files to shards by path hash or by balancing file sizes (default hash)')
+    parser.add_argument('--approx-unique', type=hll_error, nargs='?', const=DEFAULT_HLL_ERROR, metavar='ERROR',
+                        help=f'estimate folder-wide unique counts with HyperLogLog sketches instead of exact sets '
+                             f'(relative standard error, e.g. 0.02 or 2%%, default {DEFAULT_HLL_ERROR})')
+    parser.add_argument('--top-words', type=int, nargs='?', const=DEFAULT_TOP_WORDS, default=0, metavar='N',
+                        help=f'add a Words_top sheet with the N most frequent words per language (word count, default {DEFAULT_TOP_WORDS})')
+    parser.add_argument('--top-words-exact', action='store_true',
+                        help='count every word exactly for --top-words instead of using a bounded-memory sketch')
+    parser.add_argument('--repetition', action='store_true',
+                        help='add a Words_repetition sheet with word counts per match band (repetitions, 95-99%%, 85-94%%, '
+                             '75-84%%, no match) across the whole folder (word count)')
+    parser.add_argument('--results-db', action='store_true',
+                        help='also write per-cell results (file, sheet, address, language, counts per category, pattern counts) '
+                             'to an indexed SQLite database next to the report')
+    parser.add_argument('--baseline', metavar='PATH',
+                        help='classify every cell as new, changed (same address, different text) or unchanged against a previous '
+                             'delivery and report new/changed characters and words; PATH is the results database (.sqlite) of a '
+                             'previous --results-db run or a result bundle directory containing results.sqlite')
+    parser.add_argument('--tokenizer-profile', choices=TOKENIZER_PROFILES, default=DEFAULT_TOKENIZER_PROFILE,
+                        help='accurate: POS-tagging pipelines (spaCy models, jieba posseg, Stanza); fast: dictionary/rule '
+                             'tokenizers (spaCy tokenizer only, jieba without POS, fugashi or per-character CJK, PyThaiNLP); '
+                             f'Korean always uses Kiwi (word count, default {DEFAULT_TOKENIZER_PROFILE})')
+    parser.add_argument('--benchmark-tokenizers', type=int, nargs='?', const=DEFAULT_BENCHMARK_TEXTS, metavar='N',
+                        help=f'measure tokens/sec of each tokenizer profile and backend on up to N sample texts per language '
+                             f'from the folder and save a benchmark report instead of counting (default {DEFAULT_BENCHMARK_TEXTS})')
+    parser.add_argument('--non-text', choices=NON_TEXT_POLICIES, default='count',
+                        help='count digits of numeric/date columns directly from their values, or skip them (character count, default count)')
+    parser.add_argument('--xlsx-reader', choices=XLSX_READERS, default='xml',
+                        help='read XLSX/XLSM by streaming shared strings and sheet XML directly, or through pandas DataFrames '
+                             '(character count, default xml)')
+    parser.add_argument('--include', action='append', metavar='PATTERN',
+                        help='analyze only files matching this glob pattern; patterns with "/" match the relative path, '
+                             'others the file name (repeatable)')
+    parser.add_argument('--exclude', action='append', metavar='PATTERN',
+                        help='skip files and folders matching this glob pattern (repeatable)')
+    parser.add_argument('--scan-workers', type=int, default=DISCOVERY_WORKERS, metavar='N',
+                        help=f'number of threads reading directories during file discovery (0 = sequential, default {DISCOVERY_WORKERS})')
+    parser.add_argument('--estimate', type=relative_error, nargs='?', const=DEFAULT_TARGET_ERROR, metavar='ERROR',
+                        help=f'quickly estimate totals per language from sampled files and rows with 95%% confidence intervals, '
+                             f'growing the sample until the relative error reaches ERROR, e.g. 0.05 or 5%% (default {DEFAULT_TARGET_ERROR:g})')
+    parser.add_argument('--merge', nargs='*', metavar='BUNDLE_DIR',
+                        help='merge finished shard result bundles into one report (default: all shard bundles in the folder)')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
     # 언어 선택
     current_language = select_language()
     
     # 분석 방식 선택
     analysis_type = select_analysis_type(current_language)
     
+    # 샤드 결과 병합 (분석은 각 샤드 실행에서 완료됨)
+    if args.merge is not None:
+        if analysis_type == 'chars':
+            count_chars_merge(current_language, args.merge, unique_memory=args.unique_memory)
+        elif analysis_type == 'words':
+            count_words_merge(current_language, args.merge, unique_memory=args.unique_memory)
+        return
+
+    # 토크나이저 벤치마크 (단어 수 분석의 토크나이저 프로필별 처리량 측정)
+    if args.benchmark_tokenizers is not None:
+        count_words_benchmark(current_language,
+                              sample_texts=args.benchmark_tokenizers,
+                              use_lang_cache=not args.no_lang_cache,
+                              lang_cache_headers=args.lang_cache_headers,
+                              prefetch_depth=args.prefetch,
+                              include=args.include,
+                              exclude=args.exclude,
+                              scan_workers=args.scan_workers)
+        return
+
+    # 표본 추정 (전체 분석 없이 견적용 합계와 신뢰구간만 보고)
+    if args.estimate is not None:
+        if analysis_type == 'chars':
+            count_chars_estimate(current_language,
+                                 target_error=args.estimate,
+                                 prefetch_depth=args.prefetch,
+                                 non_text=args.non_text,
+                                 include=args.include,
+                                 exclude=args.exclude,
+                                 scan_workers=args.scan_workers)
+        elif analysis_type == 'words':
+            count_words_estimate(current_language,
+                                 target_error=args.estimate,
+                                 use_lang_cache=not args.no_lang_cache,
+                                 lang_cache_headers=args.lang_cache_headers,
+                                 cell_routing=args.cell_routing,
+                                 prefetch_depth=args.prefetch,
+                                 detect_identifiers=not args.no_id_columns,
+                                 include=args.include,
+                                 exclude=args.exclude,
+                                 scan_workers=args.scan_workers,
+                                 tokenizer_profile=args.tokenizer_profile)
+        return
+
     # 선택된 분석 방식에 따라 실행
     if analysis_type == 'chars':
-        count_chars_main(current_language)
+        count_chars_main(current_language,
+                         prefetch_depth=args.prefetch,
+                         prefetch_process=args.prefetch_process,
+                         resume=args.resume,
+                         shard=args.shard,
+                         shard_balance=args.shard_balance,
+                         hll_error=args.approx_unique,
+                         non_text=args.non_text,
+                         include=args.include,
+                         exclude=args.exclude,
+                         scan_workers=args.scan_workers,
+                         memory_budget=args.memory_budget,
+                         read_workers=args.read_workers,
+                         xlsx_reader=args.xlsx_reader,
+                         unique_memory=args.unique_memory,
+                         results_db=args.results_db,
+                         sheet_workers=args.sheet_workers,
+                         baseline=args.baseline)
     elif analysis_type == 'words':
-        count_words_main(current_language)
+        count_words_main(current_language,
+                         use_lang_cache=not args.no_lang_cache,
+                         lang_cache_headers=args.lang_cache_headers,
+                         cell_routing=args.cell_routing,
+                         prefetch_depth=args.prefetch,
+                         prefetch_process=args.prefetch_process,
+                         resume=args.resume,
+                         shard=args.shard,
+                         shard_balance=args.shard_balance,
+                         hll_error=args.approx_unique,
+                         top_words=args.top_words or (DEFAULT_TOP_WORDS if args.top_words_exact else 0),
+                         top_words_exact=args.top_words_exact,
+                         detect_identifiers=not args.no_id_columns,
+                         include=args.include,
+                         exclude=args.exclude,
+                         scan_workers=args.scan_workers,
+                         memory_budget=args.memory_budget,
+                         read_workers=args.read_workers,
+                         repetition=args.repetition,
+                         unique_memory=args.unique_memory,
+                         results_db=args.results_db,
+                         tokenizer_profile=args.tokenizer_profile,
+                         sheet_workers=args.sheet_workers,
+                         baseline=args.baseline)
 
 if __name__ == "__main__":
+    # PyInstaller 실행 파일에서 워커 프로세스 사용을 위해 필요
+    multiprocessing.freeze_support()
     try:
         main()
     except Exception as e:
@@ -0,0 +1,276 @@
+import os
+import re
+import sys
+import json
+import ctypes
+import zipfile
+import threading
+import tracemalloc
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from xml.parsers import expat
+from workbook_reader import (read_workbook, read_workbook_groups, get_sheet_paths, get_workbook_rels,
+                             get_rel_target, read_declared_dimension, SHARED_STRINGS_REL_TYPE)
+
+# 메모리 사용량 기록 파일 (분석 폴더에 저장, 추정 계수 조정용)
+MEMORY_LOG_FILE = '.countlocales_memory_log.jsonl'
+
+# 예산을 쓸 때 동시에 읽을 최대 워크북 수 (실제 동시 수는 메모리 예산이 결정)
+DEFAULT_READ_WORKERS = 4
+
+# 셀 하나를 읽는 동안의 최대 메모리 (pandas: openpyxl 셀 + DataFrame, 스트리밍: 열별 묶음, 측정값 기준)
+PANDAS_BYTES_PER_CELL = 100
+STREAMING_BYTES_PER_CELL = 60
+
+# 시트 XML에서 셀 하나의 최소 크기 (<c r="A1"><v>1</v></c>), 압축 해제 크기로 셀 수의 상한을 계산
+XML_BYTES_PER_CELL = 25
+
+# CSV 셀 하나의 평균 크기
+CSV_BYTES_PER_CELL = 8
+
+# 공유 문자열 XML 크기 대비 메모리 (문자열 객체와 목록)
+SHARED_STRINGS_MEMORY_FACTOR = 3
+
+# 읽는 동안의 메모리 최대치를 측정할 파일 간격 (tracemalloc 추적 중에는 읽기가 몇 배 느려지므로 일부 파일만 측정)
+MEASURE_EVERY_FILES = 10
+
+# 예산의 이 비율보다 많이 필요할 것으로 추정되는 파일은 스트리밍 읽기로 처리
+STREAMING_THRESHOLD_SHARE = 0.5
+
+MEMORY_SIZE_PATTERN = re.compile(r'^\s*(\d+(?:\.\d+)?)\s*([KMGT]?)I?B?\s*$', re.IGNORECASE)
+MEMORY_UNITS = {'': 1, 'K': 1 << 10, 'M': 1 << 20, 'G': 1 << 30, 'T': 1 << 40}
+
+def parse_memory_size(value):
+    """'512M', '4G', '1.5GB' 같은 크기를 바이트 수로 변환"""
+    match = MEMORY_SIZE_PATTERN.match(value)
+    if not match:
+        raise ValueError(f"Invalid memory size {value!r} (expected e.g. 512M or 4G)")
+    size = int(float(match.group(1)) * MEMORY_UNITS[match.group(2).upper()])
+    if size <= 0:
+        raise ValueError(f"Memory size must be positive, got {value!r}")
+    return size
+
+def format_memory_size(size):
+    """바이트 수를 읽기 쉬운 크기로 표시 (예: 1.5G)"""
+    for unit in ('T', 'G', 'M', 'K'):
+        if size >= MEMORY_UNITS[unit]:
+            return f"{size / MEMORY_UNITS[unit]:.1f}{unit}"
+    return f"{size}B"
+
+def estimate_workbook_cells(file_path):
+    """파일을 읽지 않고 (셀 수, 공유 문자열 XML 크기)를 추정
+
+    XLSX/XLSM은 시트마다 선언된 사용 범위(dimension)와 압축 해제된 시트 XML 크기로 계산한
+    셀 수 중 작은 값을 쓰므로, 서식만 있는 유령 범위로 추정치가 커지지 않는다.
+    CSV나 구조를 읽을 수 없는 파일은 파일 크기로 계산한다.
+    """
+    try:
+        file_size = os.path.getsize(file_path)
+    except OSError:
+        return 0, 0
+    if not file_path.lower().endswith(('.xlsx', '.xlsm')):
+        return file_size // CSV_BYTES_PER_CELL, 0
+    try:
+        with zipfile.ZipFile(file_path) as archive:
+            cells = 0
+            for sheet_path in get_sheet_paths(archive).values():
+                sheet_cells = archive.getinfo(sheet_path).file_size // XML_BYTES_PER_CELL
+                declared = read_declared_dimension(archive, sheet_path)
+                if declared:
+                    sheet_cells = min(sheet_cells, declared[0] * declared[1])
+                cells += sheet_cells
+            shared_path = get_rel_target(get_workbook_rels(archive), SHARED_STRINGS_REL_TYPE)
+            shared_size = archive.getinfo(shared_path).file_size if shared_path in archive.namelist() else 0
+            return cells, shared_size
+    except (zipfile.BadZipFile, KeyError, OSError, SyntaxError, ValueError, expat.ExpatError):
+        return file_size // XML_BYTES_PER_CELL, 0
+
+def read_with_peak_memory(reader, file_path, measure=True):
+    """reader(file_path)를 실행하고 (sheets, error, 읽는 동안의 메모리 최대치)를 반환
+
+    최대치는 읽기 시작 시점 대비 tracemalloc 최대치로, 파이썬/numpy가 할당한 메모리만 센다.
+    추적은 프로세스 전체에 걸리므로 한 번에 한 파일만 읽는 워커 프로세스에서 실행해야 그 파일만의
+    값이 된다. measure가 False이면 측정하지 않고 최대치는 None이다.
+    """
+    if not measure:
+        sheets, error = reader(file_path)
+        return sheets, error, None
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    else:
+        tracemalloc.reset_peak()
+    baseline = tracemalloc.get_traced_memory()[0]
+    try:
+        sheets, error = reader(file_path)
+        return sheets, error, max(0, tracemalloc.get_traced_memory()[1] - baseline)
+    finally:
+        if started:
+            tracemalloc.stop()
+
+def get_process_memory():
+    """현재 프로세스의 상주 메모리(RSS) 바이트 수 (측정할 수 없으면 None)
+
+    Linux는 /proc/self/statm, Windows는 작업 집합 크기(GetProcessMemoryInfo)를 읽고,
+    그 외(macOS 등)는 getrusage의 최대 상주 메모리로 대신한다. 추적 없이 한 번 읽기만 하므로
+    다른 스레드를 느리게 하지 않는다.
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    if sys.platform == 'win32':
+        return get_windows_working_set()
+    try:
+        import resource
+    except ImportError:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss if sys.platform == 'darwin' else max_rss * 1024  # macOS는 바이트, 그 외는 KB
+
+class ProcessMemoryCounters(ctypes.Structure):
+    """Windows PROCESS_MEMORY_COUNTERS 구조체"""
+    _fields_ = [('cb', ctypes.c_uint32), ('PageFaultCount', ctypes.c_uint32)] + \
+               [(name, ctypes.c_size_t) for name in ('PeakWorkingSetSize', 'WorkingSetSize', 'QuotaPeakPagedPoolUsage',
+                                                     'QuotaPagedPoolUsage', 'QuotaPeakNonPagedPoolUsage',
+                                                     'QuotaNonPagedPoolUsage', 'PagefileUsage', 'PeakPagefileUsage')]
+
+def get_windows_working_set():
+    """Windows에서 현재 프로세스의 작업 집합 크기 (실패하면 None)"""
+    try:
+        kernel32 = ctypes.WinDLL('kernel32')
+        kernel32.GetCurrentProcess.restype = ctypes.c_void_p
+        get_memory_info = ctypes.WinDLL('psapi').GetProcessMemoryInfo
+        get_memory_info.argtypes = [ctypes.c_void_p, ctypes.POINTER(ProcessMemoryCounters), ctypes.c_uint32]
+        counters = ProcessMemoryCounters()
+        counters.cb = ctypes.sizeof(counters)
+        if not get_memory_info(kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb):
+            return None
+        return counters.WorkingSetSize
+    except (AttributeError, OSError):
+        return None
+
+# 전체 메모리 예산 안에서만 워크북 읽기를 시작하도록 관리
+class MemoryBudget:
+    """워크북마다 필요한 메모리를 추정하여 예산 안에서만 동시에 읽도록 예약/해제
+
+    읽는 중이거나 분석을 기다리는 워크북의 추정치 합이 limit을 넘지 않을 때만 다음 파일을
+    시작하며, 예약된 파일이 없으면 예산보다 큰 파일도 단독으로 읽는다. 예산의
+    STREAMING_THRESHOLD_SHARE보다 클 것으로 추정되는 파일은 stream_reader가 있으면 그것으로 읽는다.
+    log_path를 주면 파일마다 추정치를 JSON Lines로 기록하고, 워커 프로세스에서 읽을 때는
+    MEASURE_EVERY_FILES개 중 한 파일의 읽는 동안의 메모리 최대치도 함께 기록한다.
+    """
+    def __init__(self, limit, stream_reader=None, workers=DEFAULT_READ_WORKERS, log_path=None):
+        self.limit = limit
+        self.stream_reader = stream_reader
+        self.workers = max(1, workers)
+        self.reserved = 0
+        self.peak_reserved = 0
+        self.streamed_files = 0
+        self.submitted_files = 0
+        self.lock = threading.Lock()
+        self.log_file = open(log_path, 'w', encoding='utf-8') if log_path else None
+        self.log_path = log_path
+
+    def plan(self, file_path, reader):
+        """파일을 읽을 (추정 메모리, 읽기 함수, 추정 셀 수) 결정"""
+        cells, shared_size = estimate_workbook_cells(file_path)
+        shared_bytes = shared_size * SHARED_STRINGS_MEMORY_FACTOR
+        streaming = reader is read_workbook_groups
+        estimate = cells * (STREAMING_BYTES_PER_CELL if streaming else PANDAS_BYTES_PER_CELL) + shared_bytes
+        if not streaming and self.stream_reader is not None and estimate > self.limit * STREAMING_THRESHOLD_SHARE:
+            # 큰 파일은 DataFrame 없이 스트리밍으로 읽음
+            reader = self.stream_reader
+            estimate = cells * STREAMING_BYTES_PER_CELL + shared_bytes
+            self.streamed_files += 1
+        return estimate, reader, cells
+
+    def reserve(self, estimate):
+        """예산이 남아 있으면(또는 예약된 파일이 없으면) 예약하고 True 반환"""
+        with self.lock:
+            if self.reserved > 0 and self.reserved + estimate > self.limit:
+                return False
+            self.reserved += estimate
+            self.peak_reserved = max(self.peak_reserved, self.reserved)
+            return True
+
+    def should_measure(self):
+        """이번에 읽기 시작하는 파일의 메모리 최대치를 측정할지 (기록할 때만, MEASURE_EVERY_FILES개마다 하나)"""
+        if self.log_file is None:
+            return False
+        self.submitted_files += 1
+        return (self.submitted_files - 1) % MEASURE_EVERY_FILES == 0
+
+    def release(self, estimate):
+        with self.lock:
+            self.reserved -= estimate
+
+    def record(self, rel_path, plan, peak):
+        """추정치와 읽는 동안의 메모리 최대치(read_with_peak_memory, 측정하지 않은 파일은 None)를 기록 (추정 계수 조정용)"""
+        if self.log_file is None:
+            return
+        estimate, reader, cells = plan
+        entry = {'file': rel_path, 'reader': 'xml' if reader is read_workbook_groups else 'pandas',
+                 'cells': cells, 'estimate': estimate, 'peak': peak,
+                 'ratio': round(peak / estimate, 3) if estimate and peak is not None else None,
+                 'reserved': self.reserved}
+        self.log_file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        self.log_file.flush()
+
+    def close(self):
+        if self.log_file is not None:
+            self.log_file.close()
+            self.log_file = None
+
+def prefetch_workbooks_within_budget(folder_path, files_to_process, budget, depth, use_process=False, reader=read_workbook):
+    """prefetch_workbooks와 같이 (rel_path, file_name, sheets, error)를 파일 순서대로 yield 하되,
+    메모리 예산이 허용하는 만큼만 여러 워크북을 동시에 읽는 제너레이터
+
+    파일의 예약은 분석이 끝나고 다음 파일을 요청할 때 해제되며, 동시에 읽거나 기다리는
+    워크북은 최대 budget.workers + depth개이다. 읽는 동안의 메모리 최대치는 워커 프로세스에서 읽을
+    때만 측정한다 (스레드에서는 추적이 분석 중인 메인 스레드까지 느리게 하고 동시에 읽는 파일의
+    값이 섞임).
+    """
+    executor_class = ProcessPoolExecutor if use_process else ThreadPoolExecutor
+    pending = deque()
+    files = iter(files_to_process)
+    waiting = None  # 예산이 날 때까지 기다리는 파일 (rel_path, file_name, plan)
+
+    def submit_ready():
+        nonlocal waiting
+        while len(pending) < budget.workers + depth:
+            if waiting is None:
+                for rel_path, file_name in files:
+                    waiting = (rel_path, file_name, budget.plan(os.path.join(folder_path, rel_path), reader))
+                    break
+                else:
+                    return
+            rel_path, file_name, plan = waiting
+            if not budget.reserve(plan[0]):
+                return
+            future = executor.submit(read_with_peak_memory, plan[1], os.path.join(folder_path, rel_path),
+                                     use_process and budget.should_measure())
+            pending.append((rel_path, file_name, plan, future))
+            waiting = None
+
+    with executor_class(max_workers=budget.workers) as executor:
+        try:
+            submit_ready()
+            while pending:
+                rel_path, file_name, plan, future = pending.popleft()
+                try:
+                    sheets, error, peak = future.result()
+                except Exception as e:
+                    # 워커 프로세스 자체의 오류 (예: 결과 직렬화 실패)
+                    sheets, error, peak = [], e, None
+                budget.record(rel_path, plan, peak)
+                submit_ready()
+                yield rel_path, file_name, sheets, error
+                # 이 파일의 분석이 끝났으므로 예약을 해제하고 다음 파일을 시작
+                budget.release(plan[0])
+                submit_ready()
+        finally:
+            # 중단(Ctrl+C 등) 시 아직 시작하지 않은 읽기 작업 취소
+            for _, _, _, future in pending:
+                future.cancel()
@@ -0,0 +1,175 @@
+import base64
+import numpy as np
+from collections import Counter
+from sketches import hash64, mix64
+
+# 매치 구간 (이름, 최소 유사도 %) - 정확히 같은 세그먼트는 반복, 나머지는 가장 비슷한 이전 세그먼트로 구분
+MATCH_BANDS = (('Repetitions', 100), ('95-99%', 95), ('85-94%', 85), ('75-84%', 75), ('No match', 0))
+MATCH_BAND_NAMES = [name for name, _ in MATCH_BANDS]
+NO_MATCH_BAND = len(MATCH_BANDS) - 1
+
+# 퍼지 매치로 인정하는 최소 유사도 (길이 차이만으로 이보다 낮아지는 후보는 비교하지 않음)
+MIN_FUZZY_SIMILARITY = 75
+
+# MinHash 서명 길이와 LSH 밴드 수 (24밴드 x 3행: 자카드 0.6에서 후보가 될 확률 99.7%, 0.3에서 48%)
+MINHASH_PERMUTATIONS = 72
+LSH_BANDS = 24
+
+# 세그먼트마다 편집 거리로 확인할 최대 후보 수 (밴드가 많이 겹치는 순)
+MAX_CANDIDATES = 50
+
+# 버킷마다 보관할 최대 세그먼트 수 (흔한 단어 하나짜리 세그먼트 등으로 버킷이 커져도 조회 비용이 일정)
+MAX_BUCKET_SIZE = 100
+
+# 편집 거리로 확인하는 최대 토큰 수 (긴 쪽 기준, 넘으면 공통 토큰 수로 유사도를 근사)
+MAX_EDIT_DISTANCE_TOKENS = 300
+
+# MinHash 순열(해시 시드)을 정하는 시드 (같은 폴더는 항상 같은 결과)
+MINHASH_SEED = 0
+
+def token_similarity(a, b):
+    """두 토큰 목록의 유사도 (1 - 토큰 단위 편집 거리 / 긴 쪽 길이)"""
+    if a == b:
+        return 1.0
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, x in enumerate(a, 1):
+        current = [i]
+        for j, y in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (x != y)))
+        previous = current
+    return 1 - previous[-1] / len(a)
+
+def encode_tokens(words):
+    """단어 목록을 소문자 토큰 해시(uint64) 배열의 base64 문자열로 변환 (세그먼트 저장용)"""
+    hashes = np.array([hash64(word.lower()) for word in words], dtype=np.uint64)
+    return base64.b64encode(hashes.tobytes()).decode('ascii')
+
+def decode_tokens(encoded):
+    """encode_tokens로 저장한 토큰 해시 배열 복원"""
+    return np.frombuffer(base64.b64decode(encoded), dtype=np.uint64)
+
+def make_segment(category, text, words, occurrences):
+    """반복 분석용 세그먼트 [카테고리, 텍스트 해시, 토큰 해시, 출현 횟수] (단어 대신 해시만 보관)"""
+    return [category, hash64(text), encode_tokens(words), occurrences]
+
+def get_match_band(similarity):
+    """유사도(0~1)의 매치 구간 번호 (텍스트가 다르면 토큰이 같아도 99%로 봄)"""
+    percent = min(int(similarity * 100 + 1e-9), 99)
+    for band, (_, minimum) in enumerate(MATCH_BANDS):
+        if percent >= minimum:
+            return band
+    return NO_MATCH_BAND
+
+# 폴더 전체 세그먼트의 반복/퍼지 매치 판정
+class RepetitionIndex:
+    """세그먼트(셀 텍스트)를 나온 순서대로 넣으며 이전 세그먼트와의 최고 유사도로 매치 구간을 판정
+
+    같은 텍스트는 반복으로 바로 판정하고, 새 텍스트는 토큰 집합의 MinHash 서명을 LSH 밴드로
+    나누어 같은 버킷에 있는 이전 세그먼트만 후보로 삼는다. 후보는 토큰 단위 편집 거리로
+    확인하므로 전체 쌍을 비교하지 않으며, 세그먼트당 비용은 밴드 수 x 버킷 크기로 제한된다.
+    긴 쪽이 MAX_EDIT_DISTANCE_TOKENS개를 넘는 쌍은 편집 거리 대신 공통 토큰 수 / 긴 쪽 길이로
+    근사한다 (치환/삽입/삭제만 있으면 편집 거리 유사도와 같고, 순서가 바뀌면 높게 나옴).
+    언어(카테고리)가 다른 세그먼트끼리는 비교하지 않는다. 토큰은 소문자 단어의 64비트 해시이다.
+    """
+    def __init__(self, permutations=MINHASH_PERMUTATIONS, bands=LSH_BANDS):
+        seeds = np.random.default_rng(MINHASH_SEED).integers(0, 1 << 63, size=permutations, dtype=np.uint64)
+        self.seeds = seeds[:, None]
+        self.bands = bands
+        self.rows_per_band = permutations // bands
+        self.buckets = {}  # (카테고리, 밴드, 밴드 서명) -> 세그먼트 번호 목록
+        self.segments = []  # 세그먼트 번호 -> 토큰 해시 배열
+        self.seen = {}  # 카테고리 -> 이미 나온 텍스트 해시 집합
+
+    def signature(self, tokens):
+        """토큰 집합의 MinHash 서명 (순열마다 시드를 섞은 64비트 해시의 최솟값)"""
+        hashes = np.unique(tokens)
+        return mix64(hashes[None, :] ^ self.seeds).min(axis=1)
+
+    def get_band_keys(self, category, signature):
+        size = self.rows_per_band
+        return [(category, band, signature[band * size:(band + 1) * size].tobytes()) for band in range(self.bands)]
+
+    def find_best_similarity(self, tokens, keys):
+        """LSH 후보 중 가장 비슷한 이전 세그먼트와의 유사도"""
+        collisions = Counter()
+        for key in keys:
+            collisions.update(self.buckets.get(key, ()))
+        best = 0.0
+        tokens = tokens.tolist()
+        token_counts = Counter(tokens)
+        for segment_id, _ in collisions.most_common(MAX_CANDIDATES):
+            candidate = self.segments[segment_id]
+            longest = max(len(candidate), len(tokens))
+            # 길이 차이만으로 최소 유사도에 못 미치는 후보는 건너뜀
+            if min(len(candidate), len(tokens)) * 100 < MIN_FUZZY_SIMILARITY * longest:
+                continue
+            # 공통 토큰 수 / 긴 쪽 길이는 유사도의 상한이므로 지금까지의 최고값을 넘을 수 없으면 편집 거리를 생략
+            candidate = candidate.tolist()
+            bound = sum((token_counts & Counter(candidate)).values()) / longest
+            if bound * 100 < MIN_FUZZY_SIMILARITY or bound <= best:
+                continue
+            if longest > MAX_EDIT_DISTANCE_TOKENS:
+                # 긴 세그먼트는 O(n x m) 편집 거리 대신 상한값으로 근사
+                best = bound
+            else:
+                best = max(best, token_similarity(tokens, candidate))
+            if best >= 1.0:
+                break
+        return best
+
+    def match(self, category, text_hash, tokens):
+        """세그먼트의 매치 구간 번호를 판정하고 색인에 추가 (tokens: 토큰 해시 배열)"""
+        seen = self.seen.setdefault(category, set())
+        if text_hash in seen:
+            return 0
+        seen.add(text_hash)
+        if not len(tokens):
+            return NO_MATCH_BAND
+        keys = self.get_band_keys(category, self.signature(tokens))
+        band = get_match_band(self.find_best_similarity(tokens, keys))
+
+        segment_id = len(self.segments)
+        self.segments.append(tokens)
+        for key in keys:
+            bucket = self.buckets.setdefault(key, [])
+            if len(bucket) < MAX_BUCKET_SIZE:
+                bucket.append(segment_id)
+        return band
+
+    def add_segments(self, segments):
+        """파일 하나의 세그먼트 [카테고리, 텍스트 해시, 토큰 해시, 출현 횟수]를 넣고 구간별 단어 수 반환
+
+        같은 텍스트가 여러 셀에 나오면 첫 셀만 판정하고 나머지는 반복으로 센다.
+        """
+        band_words = [0] * len(MATCH_BANDS)
+        for category, text_hash, encoded_tokens, occurrences in segments:
+            tokens = decode_tokens(encoded_tokens)
+            band = self.match(category, text_hash, tokens)
+            band_words[band] += len(tokens)
+            band_words[0] += len(tokens) * (occurrences - 1)
+        return band_words
+
+def analyze_repetitions(file_order, file_records):
+    """파일 순서대로 세그먼트를 색인하여 파일별 매치 구간 단어 수 행과 폴더 합계 행 반환
+
+    체크포인트/샤드 결과 레코드에 보관된 세그먼트로 계산하므로, 재개나 샤드 병합으로
+    만든 보고서도 한 번에 분석한 경우와 같다.
+    """
+    index = RepetitionIndex()
+    rows = []
+    totals = [0] * len(MATCH_BANDS)
+    total_cells = 0
+    for rel_path in file_order:
+        record = file_records.get(rel_path)
+        if record is None or 'segments' not in record['rows']:
+            continue
+        segments = record['rows']['segments']
+        band_words = index.add_segments(segments)
+        cells = sum(segment[3] for segment in segments)
+        total_cells += cells
+        totals = [total + words for total, words in zip(totals, band_words)]
+        rows.append([rel_path, record['file_name'], "Normal", cells] + band_words + [sum(band_words)])
+    rows.append(['ALL', 'ALL', "Normal", total_cells] + totals + [sum(totals)])
+    return rows
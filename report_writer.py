@@ -0,0 +1,135 @@
+import os
+from openpyxl import Workbook
+from openpyxl.worksheet.hyperlink import Hyperlink
+
+# Excel 시트 크기 한도 (행은 헤더 포함)
+EXCEL_MAX_ROWS = 1048576
+EXCEL_MAX_COLUMNS = 16384
+EXCEL_MAX_SHEET_TITLE = 31
+
+# 워크북 하나에 담을 최대 셀 수 (넘으면 다음 시트부터 _partN 워크북에 저장하여 메모리 사용량 제한)
+REPORT_MAX_CELLS_PER_WORKBOOK = 20000000
+
+# 보고서 행 앞쪽의 고정 열 수 (Path ~ Total, 열 방향으로 나눌 때 각 부분에 반복)
+REPORT_KEY_COLUMNS = 7
+
+INDEX_SHEET_TITLE = 'Index'
+INDEX_HEADERS = ['Sheet', 'Part', 'Workbook', 'SheetName', 'Rows', 'Columns']
+
+def get_part_path(report_path, part_number):
+    """n번째 보고서 워크북 경로 (첫 번째는 report_path 그대로, 이후 _part2, _part3...)"""
+    if part_number == 1:
+        return report_path
+    base, ext = os.path.splitext(report_path)
+    return f"{base}_part{part_number}{ext}"
+
+def get_part_title(title, part_number):
+    """n번째 이어지는 시트 이름 (Excel 시트 이름 길이 한도 안에서 _2, _3...을 붙임)"""
+    if part_number == 1:
+        return title[:EXCEL_MAX_SHEET_TITLE]
+    suffix = f"_{part_number}"
+    return title[:EXCEL_MAX_SHEET_TITLE - len(suffix)] + suffix
+
+# Excel 시트 크기 한도를 넘는 보고서를 이어지는 시트/워크북으로 나누어 쓰는 작성기
+class ReportWriter:
+    """시트 단위로 보고서를 쓰면서 Excel 한도를 넘는 부분을 자동으로 나눔
+
+    행이 max_rows를 넘으면 같은 이름에 _2, _3...을 붙인 시트로 이어 쓰고, 열이
+    max_columns를 넘으면 앞쪽 고정 열을 반복한 시트로 나눈다. 워크북의 셀 수가
+    max_cells를 넘으면 이후 시트는 _part2.xlsx 등 다음 워크북에 쓰며 (가득 찬 워크북은
+    바로 저장), 나누어진 경우 첫 워크북 맨 앞의 Index 시트에 각 부분으로 가는 링크를 남긴다.
+    """
+    def __init__(self, report_path, finish_sheet=None, max_rows=EXCEL_MAX_ROWS,
+                 max_columns=EXCEL_MAX_COLUMNS, max_cells=REPORT_MAX_CELLS_PER_WORKBOOK):
+        self.report_path = report_path
+        self.finish_sheet = finish_sheet  # 시트를 다 쓴 뒤 호출 (sheet, 원래 시트 이름), 열 너비 조정 등
+        self.max_rows = max_rows
+        self.max_columns = max_columns
+        self.max_cells = max_cells
+        self.paths = [report_path]
+        self.first_workbook = Workbook()
+        self.workbook = self.first_workbook
+        self.workbook_cells = 0
+        self.workbook_empty = True   # 기본 시트만 있는 새 워크북
+        self.index_rows = []         # (원래 시트 이름, 부분 번호, 워크북 경로, 시트 이름, 행 범위, 열 범위)
+
+    @property
+    def split(self):
+        """보고서가 여러 시트/워크북으로 나누어졌는지 여부"""
+        return len(self.paths) > 1 or any(part > 1 for _, part, *_ in self.index_rows)
+
+    def write_sheet(self, title, headers, rows, key_columns=REPORT_KEY_COLUMNS):
+        """헤더와 행을 title 시트에 쓰고, 한도를 넘으면 이어지는 시트로 나눔 (행은 헤더보다 길지 않음)"""
+        rows = list(rows)
+        width = len(headers)
+        if width <= self.max_columns:
+            column_ranges = [(None, 0, width)]
+        else:
+            # 앞쪽 고정 열은 모든 부분에 반복하고 나머지 열을 한도 안에서 나눔
+            chunk = self.max_columns - key_columns
+            column_ranges = [(key_columns, start, min(start + chunk, width))
+                             for start in range(key_columns, width, chunk)]
+        rows_per_sheet = self.max_rows - 1  # 헤더 행 제외
+
+        part_number = 0
+        for key, start, end in column_ranges:
+            for first in range(0, max(len(rows), 1), rows_per_sheet):
+                part_rows = rows[first:first + rows_per_sheet]
+                part_number += 1
+                sheet = self._new_sheet(get_part_title(title, part_number), len(part_rows) + 1, end - start + (key or 0))
+                for row in [headers] + part_rows:
+                    sheet.append(row if key is None else row[:key] + row[start:end])
+                if self.finish_sheet:
+                    self.finish_sheet(sheet, title)
+
+                row_range = f"{first + 1}-{first + len(part_rows)}" if part_rows else '-'
+                column_range = 'ALL' if key is None else f"{headers[start]} - {headers[end - 1]}"
+                self.index_rows.append((title, part_number, self.paths[-1], sheet.title, row_range, column_range))
+
+    def _new_sheet(self, sheet_title, num_rows, num_columns):
+        """현재 워크북에 시트 추가 (셀 수 한도를 넘으면 현재 워크북을 저장하고 다음 워크북으로 넘어감)"""
+        cells = num_rows * num_columns
+        if not self.workbook_empty and self.workbook_cells + cells > self.max_cells:
+            self._roll_workbook()
+        self.workbook_cells += cells
+        if self.workbook_empty:
+            sheet = self.workbook.active
+            sheet.title = sheet_title
+            self.workbook_empty = False
+            return sheet
+        return self.workbook.create_sheet(sheet_title)
+
+    def _roll_workbook(self):
+        # 첫 워크북은 Index 시트를 추가해야 하므로 마지막에 저장
+        if self.workbook is not self.first_workbook:
+            self.workbook.save(self.paths[-1])
+        self.paths.append(get_part_path(self.report_path, len(self.paths) + 1))
+        self.workbook = Workbook()
+        self.workbook_cells = 0
+        self.workbook_empty = True
+
+    def _write_index(self):
+        """첫 워크북 맨 앞에 각 부분으로 가는 링크 시트 추가"""
+        index_sheet = self.first_workbook.create_sheet(INDEX_SHEET_TITLE, 0)
+        index_sheet.append(INDEX_HEADERS)
+        for title, part_number, path, sheet_title, row_range, column_range in self.index_rows:
+            workbook_name = os.path.basename(path)
+            index_sheet.append([title, part_number, workbook_name, sheet_title, row_range, column_range])
+            link_cell = index_sheet.cell(row=index_sheet.max_row, column=INDEX_HEADERS.index('SheetName') + 1)
+            if path == self.report_path:
+                # 같은 워크북 안의 시트는 외부 링크가 아닌 위치(location)로 연결
+                link_cell.hyperlink = Hyperlink(ref=link_cell.coordinate, location=f"'{sheet_title}'!A1")
+            else:
+                link_cell.hyperlink = f"{workbook_name}#'{sheet_title}'!A1"
+            link_cell.style = 'Hyperlink'
+        if self.finish_sheet:
+            self.finish_sheet(index_sheet, INDEX_SHEET_TITLE)
+
+    def close(self):
+        """남은 워크북을 저장하고 저장된 워크북 경로 목록을 반환 (첫 워크북은 마지막에 저장)"""
+        if self.workbook is not self.first_workbook:
+            self.workbook.save(self.paths[-1])
+        if self.split:
+            self._write_index()
+        self.first_workbook.save(self.report_path)
+        return list(self.paths)
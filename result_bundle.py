@@ -0,0 +1,251 @@
+import os
+import glob
+import json
+import time
+import shutil
+import hashlib
+
+# 결과 묶음(체크포인트) 형식 버전 (2: 반복 분석 세그먼트를 단어 대신 해시로 저장)
+BUNDLE_VERSION = 2
+
+# 체크포인트 저장 주기 (둘 중 먼저 도달하는 조건)
+CHECKPOINT_EVERY_FILES = 10
+CHECKPOINT_EVERY_SECONDS = 60
+
+# 분석 폴더 안의 체크포인트 디렉토리 이름 (분석 방식별)
+CHECKPOINT_DIR_PREFIX = '.countlocales_checkpoint_'
+
+# 샤드 실행 결과 묶음 디렉토리 이름 (예: .countlocales_shard_chars_1of4)
+SHARD_DIR_PREFIX = '.countlocales_shard_'
+
+# 샤드 파일 배정 방식
+SHARD_BALANCE_MODES = ('hash', 'size')
+
+# 파일별 보고서 행 종류 (Summary/Words 시트 순서)
+ROW_KINDS = ('real', 'unique_for_sheet', 'cell_address', 'cells')
+
+def new_file_rows():
+    """파일 하나의 보고서 행을 담을 딕셔너리 생성"""
+    return {kind: [] for kind in ROW_KINDS}
+
+# 파일별 결과 행과 폴더 전체 고유 집합 상태를 디스크에 보관하는 결과 묶음
+class ResultBundle:
+    def __init__(self, bundle_dir, kind, options=None):
+        self.bundle_dir = bundle_dir
+        self.kind = kind
+        self.options = options   # None이면 불러올 때 설정을 확인하지 않음 (병합용)
+        self.manifest_path = os.path.join(bundle_dir, 'manifest.json')
+        self.rows_path = os.path.join(bundle_dir, 'rows.jsonl')
+        self.unique_dir = os.path.join(bundle_dir, 'unique')
+        self.completed = []      # 처리 완료된 파일 (rel_path, 처리 순서)
+        self.unique_state = {}   # 고유 집합 임시 파일 목록
+        self.extra_state = {}    # 분석 방식별 추가 상태
+        self.files = []          # 전체 파일 순서 (상대 경로, 샤드 병합 시 행 순서 기준)
+        self.finished = False    # 샤드 실행이 끝까지 완료되었는지 여부
+        self._pending = []       # 아직 디스크에 기록하지 않은 파일 결과
+        self._last_save = time.time()
+
+    def load(self):
+        """저장된 묶음을 불러옴 (없거나 형식/설정이 다르면 False)"""
+        if not os.path.exists(self.manifest_path):
+            return False
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Warning: Could not read checkpoint {self.manifest_path}: {e}")
+            return False
+
+        if manifest.get('version') != BUNDLE_VERSION or manifest.get('kind') != self.kind:
+            return False
+        if self.options is not None and manifest.get('options', {}) != self.options:
+            print(f"Warning: Checkpoint {self.bundle_dir} was created with different options; starting over.")
+            return False
+
+        self.options = manifest.get('options', {})
+        self.completed = manifest.get('completed', [])
+        self.unique_state = manifest.get('unique', {})
+        self.extra_state = manifest.get('extra', {})
+        self.files = manifest.get('files', [])
+        self.finished = manifest.get('finished', False)
+        return True
+
+    def reset(self):
+        """기존 묶음을 지우고 빈 묶음으로 새로 시작"""
+        if os.path.exists(self.bundle_dir):
+            shutil.rmtree(self.bundle_dir, ignore_errors=True)
+        os.makedirs(self.unique_dir, exist_ok=True)
+        self.completed = []
+        self.unique_state = {}
+        self.extra_state = {}
+        self.finished = False
+        self._pending = []
+
+    def get_file_records(self):
+        """완료된 파일의 결과 레코드를 처리 순서대로 반환"""
+        completed = set(self.completed)
+        records = {}
+        if os.path.exists(self.rows_path):
+            with open(self.rows_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # 중단 시점에 잘린 마지막 줄
+                    # 마지막 체크포인트 이후 기록된 레코드는 무시 (같은 파일은 나중 기록 우선)
+                    if record['rel_path'] in completed:
+                        records[record['rel_path']] = record
+        return [records[rel_path] for rel_path in self.completed if rel_path in records]
+
+    def add_file(self, rel_path, file_name, rows, columns, categories=()):
+        """처리가 끝난 파일의 결과를 묶음에 추가하고 레코드를 반환"""
+        record = {
+            'rel_path': rel_path,
+            'file_name': file_name,
+            'rows': rows,
+            'columns': sorted(columns),
+            'categories': sorted(categories)
+        }
+        self._pending.append(record)
+        return record
+
+    def maybe_save(self, unique_store, extra_state=None):
+        """저장 주기가 되었으면 체크포인트 저장"""
+        if (len(self._pending) >= CHECKPOINT_EVERY_FILES
+                or time.time() - self._last_save >= CHECKPOINT_EVERY_SECONDS):
+            self.save(unique_store, extra_state)
+
+    def save(self, unique_store, extra_state=None):
+        """완료된 파일 결과와 고유 집합 상태를 디스크에 기록
+
+        행 레코드를 먼저 추가 기록하고 고유 집합을 임시 파일로 내보낸 뒤,
+        마지막으로 manifest를 원자적으로 교체한다. 중간에 중단되어도
+        이전 manifest 기준의 상태로 재개할 수 있다.
+        """
+        os.makedirs(self.unique_dir, exist_ok=True)
+        if self._pending:
+            with open(self.rows_path, 'a', encoding='utf-8') as f:
+                for record in self._pending:
+                    f.write(json.dumps(record, ensure_ascii=False) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+
+        unique_store.flush()
+        self.completed.extend(record['rel_path'] for record in self._pending)
+        self.unique_state = unique_store.get_state()
+        if extra_state is not None:
+            self.extra_state = extra_state
+
+        manifest = {
+            'version': BUNDLE_VERSION,
+            'kind': self.kind,
+            'options': self.options or {},
+            'completed': self.completed,
+            'unique': self.unique_state,
+            'extra': self.extra_state,
+            'files': self.files,
+            'finished': self.finished
+        }
+        temp_path = f"{self.manifest_path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.manifest_path)
+
+        self._pending = []
+        self._last_save = time.time()
+
+    def remove(self):
+        """정상 완료 후 묶음 디렉토리 삭제"""
+        shutil.rmtree(self.bundle_dir, ignore_errors=True)
+
+def get_shard_dir(folder_path, kind, shard_index, shard_count):
+    """샤드 결과 묶음 디렉토리 경로 (샤드 번호는 1부터 시작)"""
+    return os.path.join(folder_path, f"{SHARD_DIR_PREFIX}{kind}_{shard_index}of{shard_count}")
+
+def find_shard_dirs(folder_path, kind):
+    """분석 폴더에 있는 해당 분석 방식의 샤드 결과 묶음 디렉토리 목록"""
+    return sorted(glob.glob(os.path.join(folder_path, f"{SHARD_DIR_PREFIX}{kind}_*")))
+
+def stable_file_hash(rel_path):
+    """실행/머신과 무관하게 같은 값을 주는 파일 경로 해시 (내장 hash()는 실행마다 달라짐)"""
+    normalized = rel_path.replace(os.sep, '/')
+    return int.from_bytes(hashlib.md5(normalized.encode('utf-8')).digest()[:8], 'big')
+
+def select_shard_files(folder_path, files_to_process, shard_index, shard_count, balance='hash'):
+    """files_to_process 중 샤드 shard_index/shard_count에 배정된 파일을 원래 순서대로 반환
+
+    hash: 상대 경로의 안정 해시로 배정 (파일 추가/삭제 시 다른 파일의 배정이 유지됨)
+    size: 큰 파일부터 누적 크기가 가장 작은 샤드에 배정 (샤드별 처리 시간 균형)
+    두 방식 모두 같은 파일 목록이면 어느 머신에서 실행해도 같은 결과를 준다.
+    """
+    if balance == 'size':
+        sizes = []
+        for rel_path, _ in files_to_process:
+            try:
+                size = os.path.getsize(os.path.join(folder_path, rel_path))
+            except OSError:
+                size = 0
+            sizes.append((-size, rel_path.replace(os.sep, '/')))
+        loads = [0] * shard_count
+        assigned = set()
+        for negative_size, rel_path in sorted(sizes):
+            target = min(range(shard_count), key=lambda i: (loads[i], i))
+            loads[target] -= negative_size
+            if target == shard_index - 1:
+                assigned.add(rel_path)
+        return [f for f in files_to_process if f[0].replace(os.sep, '/') in assigned]
+
+    return [f for f in files_to_process if stable_file_hash(f[0]) % shard_count == shard_index - 1]
+
+def load_shard_bundles(bundle_dirs, kind):
+    """샤드 결과 묶음을 불러와 (파일 순서, 파일별 레코드, 묶음 목록)으로 반환
+
+    모든 샤드가 완료되었고 설정과 샤드 수가 같아야 한다. 빠진 샤드가 있으면
+    폴더 전체 고유 값이 정확하지 않으므로 병합하지 않는다.
+    """
+    bundles = []
+    for bundle_dir in bundle_dirs:
+        bundle = ResultBundle(bundle_dir, kind)
+        if not bundle.load():
+            raise ValueError(f"Not a {kind} result bundle: {bundle_dir}")
+        if not bundle.finished:
+            raise ValueError(f"Shard bundle {bundle_dir} is not finished; rerun that shard with --resume")
+        bundles.append(bundle)
+    if not bundles:
+        raise ValueError(f"No {kind} shard bundles to merge")
+
+    first = bundles[0]
+    shard_count = first.options.get('shard', [1, 1])[1]
+    seen = {}
+    for bundle in bundles:
+        bundle_index, bundle_count = bundle.options.get('shard', [1, 1])
+        if bundle_count != shard_count:
+            raise ValueError(f"Shard count mismatch: {bundle.bundle_dir} has {bundle_count}, expected {shard_count}")
+        if {k: v for k, v in bundle.options.items() if k != 'shard'} != {k: v for k, v in first.options.items() if k != 'shard'}:
+            raise ValueError(f"Shard bundle {bundle.bundle_dir} was created with different options")
+        if bundle_index in seen:
+            raise ValueError(f"Shard {bundle_index}/{shard_count} appears twice: {seen[bundle_index]}, {bundle.bundle_dir}")
+        seen[bundle_index] = bundle.bundle_dir
+    missing = [i for i in range(1, shard_count + 1) if i not in seen]
+    if missing:
+        raise ValueError(f"Missing shards: {', '.join(f'{i}/{shard_count}' for i in missing)}")
+
+    # 행 순서는 샤드를 나누기 전의 전체 파일 순서를 따름
+    file_order = list(first.files)
+    for bundle in bundles[1:]:
+        if bundle.files != first.files:
+            print(f"Warning: Shard {bundle.bundle_dir} saw a different file list; rows follow the first shard's order.")
+    known = set(file_order)
+    file_records = {}
+    for bundle in bundles:
+        for record in bundle.get_file_records():
+            file_records[record['rel_path']] = record
+            if record['rel_path'] not in known:
+                file_order.append(record['rel_path'])
+                known.add(record['rel_path'])
+    return file_order, file_records, bundles
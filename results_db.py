@@ -0,0 +1,145 @@
+import os
+import sqlite3
+from openpyxl.utils import get_column_letter
+from sketches import hash64
+
+# 체크포인트/샤드 결과 묶음 안의 작업 데이터베이스 이름 (보고서를 저장하면 보고서 옆으로 옮김)
+RESULTS_DB_FILE = 'results.sqlite'
+
+# 데이터베이스 형식 버전 (PRAGMA user_version)
+RESULTS_DB_VERSION = 1
+
+# 한 번에 executemany로 넣을 셀 행 수
+RESULTS_DB_BATCH_ROWS = 10000
+
+def to_sqlite_id(text):
+    """문자열의 64비트 해시를 SQLite INTEGER(부호 있는 64비트) 범위로 변환"""
+    value = hash64(text)
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+def quote_identifier(name):
+    return '"' + name.replace('"', '""') + '"'
+
+def get_results_db_path(report_path):
+    """보고서 경로에 대응하는 결과 데이터베이스 경로 (예: CHAR_COUNT_REPORT_....sqlite)"""
+    return os.path.splitext(report_path)[0] + '.sqlite'
+
+# 셀 단위 결과를 색인된 SQLite 데이터베이스에 기록
+class ResultsDatabase:
+    """셀마다 (파일, 시트, 주소, 언어, 글자 수, 카테고리별 개수)를 cells 테이블에 기록
+
+    count_columns는 셀마다 기록할 개수 열 이름이다 (글자 수 분석: 언어 카테고리, 단어 수 분석:
+    Words와 특수 패턴). 텍스트는 texts 테이블에 한 번만 저장하고 셀은 text_id로 참조한다.
+    파일과 텍스트의 id는 경로/텍스트의 64비트 해시이므로 샤드별 데이터베이스를 그대로 합칠 수 있다.
+    WAL 모드에서 RESULTS_DB_BATCH_ROWS 행씩 넣고 파일마다 커밋하며, 같은 파일을 다시 기록하면
+    (재개 시 마지막 체크포인트 이후 파일) 이전 행을 지우고 새로 넣는다.
+    """
+    def __init__(self, path, count_columns):
+        self.path = path
+        self.count_columns = list(count_columns)
+        self.connection = sqlite3.connect(path)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.create_schema()
+        self.file_id = None
+        self.pending_cells = []
+        self.pending_texts = {}
+        placeholders = ', '.join('?' * (8 + len(self.count_columns)))
+        self.insert_cell_sql = f"INSERT INTO cells VALUES ({placeholders})"
+
+    def create_schema(self):
+        counts = ''.join(f", {quote_identifier(name)} INTEGER NOT NULL DEFAULT 0" for name in self.count_columns)
+        count_names = ''.join(f", c.{quote_identifier(name)}" for name in self.count_columns)
+        self.connection.executescript(f"""
+            CREATE TABLE IF NOT EXISTS files (
+                file_id INTEGER PRIMARY KEY, rel_path TEXT NOT NULL, file_name TEXT NOT NULL);
+            CREATE TABLE IF NOT EXISTS texts (
+                text_id INTEGER PRIMARY KEY, text TEXT NOT NULL);
+            CREATE TABLE IF NOT EXISTS cells (
+                file_id INTEGER NOT NULL, sheet_name TEXT NOT NULL, address TEXT NOT NULL,
+                row INTEGER NOT NULL, col INTEGER NOT NULL, language TEXT, length INTEGER NOT NULL,
+                text_id INTEGER NOT NULL{counts});
+            CREATE INDEX IF NOT EXISTS cells_by_file ON cells (file_id, sheet_name);
+            CREATE INDEX IF NOT EXISTS cells_by_language ON cells (language, length);
+            CREATE INDEX IF NOT EXISTS cells_by_text ON cells (text_id);
+            CREATE VIEW IF NOT EXISTS cell_results AS
+                SELECT f.rel_path, f.file_name, c.sheet_name, c.address, c.row, c.col, c.language, c.length{count_names}, t.text
+                FROM cells c JOIN files f ON f.file_id = c.file_id JOIN texts t ON t.text_id = c.text_id;
+            PRAGMA user_version = {RESULTS_DB_VERSION};
+        """)
+
+    def begin_file(self, rel_path, file_name):
+        """파일의 셀 기록 시작 (이전에 기록된 같은 파일의 셀은 삭제)"""
+        self.file_id = to_sqlite_id(rel_path)
+        self.connection.execute("DELETE FROM cells WHERE file_id = ?", (self.file_id,))
+        self.connection.execute("INSERT OR REPLACE INTO files VALUES (?, ?, ?)", (self.file_id, rel_path, file_name))
+
+    def add_cells(self, sheet_name, col, text, rows, language, counts):
+        """같은 텍스트가 있는 셀들(열 번호, 0부터 시작하는 행 번호 목록)을 기록"""
+        text_id = to_sqlite_id(text)
+        self.pending_texts[text_id] = text
+        column_letter = get_column_letter(col + 1)
+        for r in rows:
+            self.pending_cells.append((self.file_id, sheet_name, f"{column_letter}{r+1}", r + 1, col + 1,
+                                       language, len(text), text_id, *counts))
+        if len(self.pending_cells) >= RESULTS_DB_BATCH_ROWS:
+            self.flush()
+
+    def flush(self):
+        """모아 둔 텍스트와 셀 행을 배치로 기록"""
+        if self.pending_texts:
+            self.connection.executemany("INSERT OR IGNORE INTO texts VALUES (?, ?)", self.pending_texts.items())
+            self.pending_texts = {}
+        if self.pending_cells:
+            self.connection.executemany(self.insert_cell_sql, self.pending_cells)
+            self.pending_cells = []
+
+    def commit_file(self):
+        """파일의 셀 기록을 마치고 커밋"""
+        self.flush()
+        self.connection.commit()
+
+    def merge_from(self, path):
+        """다른 실행(샤드)의 데이터베이스 내용을 추가"""
+        self.connection.execute("ATTACH DATABASE ? AS shard", (path,))
+        try:
+            self.connection.execute("DELETE FROM cells WHERE file_id IN (SELECT file_id FROM shard.files)")
+            self.connection.execute("INSERT OR REPLACE INTO files SELECT * FROM shard.files")
+            self.connection.execute("INSERT OR IGNORE INTO texts SELECT * FROM shard.texts")
+            self.connection.execute("INSERT INTO cells SELECT * FROM shard.cells")
+            self.connection.commit()
+        finally:
+            self.connection.execute("DETACH DATABASE shard")
+
+    def close(self):
+        """남은 행을 기록하고 WAL을 본 파일에 반영한 뒤 닫음"""
+        if self.connection is None:
+            return
+        self.commit_file()
+        self.connection.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+        self.connection.close()
+        self.connection = None
+
+    def save_as(self, path):
+        """닫은 뒤 데이터베이스 파일을 path로 옮김"""
+        self.close()
+        if os.path.exists(path):
+            os.remove(path)
+        os.replace(self.path, path)
+        for suffix in ('-wal', '-shm'):
+            if os.path.exists(self.path + suffix):
+                os.remove(self.path + suffix)
+        self.path = path
+
+# 시트 워커 프로세스의 셀 단위 결과 (메인 프로세스에서 ResultsDatabase에 시트 순서대로 기록)
+class CellResultsBuffer:
+    """ResultsDatabase.add_cells와 같은 인자를 모아 두었다가 write_to()로 데이터베이스에 기록"""
+    def __init__(self):
+        self.cells = []
+
+    def add_cells(self, sheet_name, col, text, rows, language, counts):
+        self.cells.append((sheet_name, col, text, rows, language, counts))
+
+    def write_to(self, cell_results):
+        for cell in self.cells:
+            cell_results.add_cells(*cell)
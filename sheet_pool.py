@@ -0,0 +1,89 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+# --sheet-workers 값을 생략했을 때의 워커 프로세스 수
+DEFAULT_SHEET_WORKERS = os.cpu_count() or 1
+
+# 한 워크북의 시트들을 워커 프로세스에 나누어 분석
+class SheetPool:
+    """워크북 하나의 시트들을 워커 프로세스에서 동시에 분석하고 결과를 시트 순서대로 반환
+
+    워크북은 메인 프로세스(또는 미리 읽기 워커)에서 한 번만 읽고, 시트마다 작업 하나를
+    워커에 보낸다. workers가 1 이하이거나 시트가 하나뿐이면 호출한 프로세스에서 차례로
+    실행한다. 워커 프로세스는 시트가 여럿인 워크북을 처음 만났을 때 시작하여 close()까지
+    재사용하며, initializer(*initargs)로 워커마다 한 번 초기화한다. 워커가 비정상 종료되면
+    (메모리 부족 강제 종료 등) 풀을 버리고 그 워크북의 남은 시트는 호출한 프로세스에서 분석하며,
+    다음 워크북에서 새 풀을 시작한다.
+    """
+    def __init__(self, workers, initializer=None, initargs=()):
+        self.workers = workers
+        self.initializer = initializer
+        self.initargs = initargs
+        self.executor = None
+        self.parallel_sheets = 0  # 워커에서 분석한 시트 수
+
+    def map(self, sheets, task, worker_task=None, to_worker=None):
+        """sheets [(시트 이름, 시트)]마다 (시트 이름, 결과)를 시트 순서대로 yield
+
+        호출한 프로세스에서는 task(시트 이름, 시트)를, 워커에서는 worker_task(없으면 task)를 실행한다.
+        to_worker는 워커로 보내기 전에 시트를 바꾸는 함수이다 (워커에 필요 없는 큰 공유 데이터 제거 등).
+        시트의 오류는 그 시트 차례에 발생하며, 그때 아직 시작하지 않은 시트는 취소한다.
+        """
+        sheets = list(sheets)
+        if self.workers <= 1 or len(sheets) < 2:
+            for sheet_name, sheet in sheets:
+                yield sheet_name, task(sheet_name, sheet)
+            return
+
+        worker_task = worker_task or task
+        futures = []
+        try:
+            futures = self.submit(sheets, worker_task, to_worker)
+        except BrokenProcessPool:
+            # 앞의 워크북 이후 유휴 중에 워커가 종료된 풀은 버리고 새 풀로 다시 보냄
+            self.discard()
+            try:
+                futures = self.submit(sheets, worker_task, to_worker)
+            except BrokenProcessPool as e:
+                yield from self.run_after_failure(sheets, task, e)
+                return
+        try:
+            for index, (sheet_name, future) in enumerate(futures):
+                try:
+                    result = future.result()
+                except BrokenProcessPool as e:
+                    yield from self.run_after_failure(sheets[index:], task, e)
+                    return
+                self.parallel_sheets += 1
+                yield sheet_name, result
+        finally:
+            # 오류/중단 시 아직 시작하지 않은 시트 작업 취소
+            for _, future in futures:
+                future.cancel()
+
+    def submit(self, sheets, worker_task, to_worker=None):
+        """시트마다 작업 하나를 워커에 보내고 [(시트 이름, future)] 반환 (풀이 없으면 시작)"""
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=self.initializer,
+                                                initargs=self.initargs)
+        return [(sheet_name, self.executor.submit(worker_task, sheet_name, to_worker(sheet) if to_worker else sheet))
+                for sheet_name, sheet in sheets]
+
+    def run_after_failure(self, sheets, task, error):
+        """워커가 비정상 종료된 풀을 버리고 남은 시트를 호출한 프로세스에서 차례로 분석"""
+        print(f"Warning: Sheet worker process stopped unexpectedly ({error}), analyzing the remaining sheets sequentially")
+        self.discard()
+        for sheet_name, sheet in sheets:
+            yield sheet_name, task(sheet_name, sheet)
+
+    def discard(self):
+        """사용할 수 없게 된 풀을 기다리지 않고 종료 (다음 map에서 새로 시작)"""
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
@@ -0,0 +1,231 @@
+import math
+import heapq
+import base64
+import hashlib
+import numpy as np
+
+# 근사 고유 개수(HyperLogLog)의 기본 상대 오차 (표준 오차 기준)
+DEFAULT_HLL_ERROR = 0.02
+
+# 레지스터 수 2^p의 허용 범위 (p=4: 16바이트, p=18: 256KB)
+HLL_MIN_PRECISION = 4
+HLL_MAX_PRECISION = 18
+
+# 위 정밀도 범위로 얻을 수 있는 상대 오차 범위 (p=18: 약 0.2%, p=4: 26%)
+HLL_MIN_ERROR = 1.04 / math.sqrt(1 << HLL_MAX_PRECISION)
+HLL_MAX_ERROR = 1.04 / math.sqrt(1 << HLL_MIN_PRECISION)
+
+# 상위 N개 빈도 집계에서 N당 유지할 카운터 수 (Space-Saving)
+TOP_COUNTERS_PER_ITEM = 10
+
+# 가중치 항목을 슬롯으로 펼칠 때 쓰는 64비트 상수 (splitmix64)
+GOLDEN_GAMMA = np.uint64(0x9E3779B97F4A7C15)
+MIX_MULTIPLIER_1 = np.uint64(0xBF58476D1CE4E5B9)
+MIX_MULTIPLIER_2 = np.uint64(0x94D049BB133111EB)
+
+def precision_for_error(error):
+    """목표 상대 오차(표준 오차 1.04/sqrt(m))를 만족하는 최소 정밀도 p 계산"""
+    if error <= 0:
+        raise ValueError(f"HyperLogLog error must be positive, got {error}")
+    registers = (1.04 / error) ** 2
+    precision = math.ceil(math.log2(registers))
+    return min(max(precision, HLL_MIN_PRECISION), HLL_MAX_PRECISION)
+
+def hash64(item):
+    """문자열의 64비트 해시 (실행/머신과 무관하게 같은 값이므로 샤드 간 병합 가능)"""
+    return int.from_bytes(hashlib.blake2b(item.encode('utf-8'), digest_size=8).digest(), 'big')
+
+def mix64(values):
+    """uint64 배열의 비트를 고르게 섞음 (splitmix64 최종 단계)"""
+    with np.errstate(over='ignore'):
+        values = values ^ (values >> np.uint64(30))
+        values = values * MIX_MULTIPLIER_1
+        values = values ^ (values >> np.uint64(27))
+        values = values * MIX_MULTIPLIER_2
+        values = values ^ (values >> np.uint64(31))
+    return values
+
+def bit_length64(values):
+    """uint64 배열 각 원소의 비트 길이 (부동소수점 log2의 반올림 오차 없이 계산)"""
+    lengths = np.zeros(values.shape, dtype=np.uint8)
+    remaining = values.copy()
+    for shift in (32, 16, 8, 4, 2, 1):
+        large = remaining >= np.uint64(1 << shift)
+        lengths[large] += shift
+        remaining[large] >>= np.uint64(shift)
+    lengths += (remaining > 0).astype(np.uint8)
+    return lengths
+
+# 고정 메모리(2^p 바이트)로 고유 항목 수를 추정하는 스케치
+class HyperLogLog:
+    def __init__(self, precision):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    @classmethod
+    def from_error(cls, error):
+        return cls(precision_for_error(error))
+
+    @property
+    def error(self):
+        """이 정밀도의 상대 표준 오차"""
+        return 1.04 / math.sqrt(len(self.registers))
+
+    def add_hashes(self, hashes):
+        """64비트 해시 배열 추가"""
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        if hashes.size == 0:
+            return
+        value_bits = 64 - self.precision
+        indexes = (hashes >> np.uint64(value_bits)).astype(np.intp)
+        remainders = hashes & np.uint64((1 << value_bits) - 1)
+        # 남은 비트에서 첫 1비트의 위치 (모두 0이면 value_bits + 1)
+        ranks = (value_bits + 1 - bit_length64(remainders)).astype(np.uint8)
+        np.maximum.at(self.registers, indexes, ranks)
+
+    def add(self, item):
+        """문자열 항목 추가"""
+        self.add_hashes([hash64(item)])
+
+    def add_many(self, items):
+        """문자열 항목 여러 개 추가"""
+        self.add_hashes([hash64(item) for item in items])
+
+    def add_weighted(self, item, weight):
+        """항목을 weight개의 서로 다른 슬롯으로 추가
+
+        같은 항목은 항상 같은 슬롯이 되므로, 추정치는 고유 항목들의 가중치 합이 된다
+        (예: 고유 텍스트들의 글자 수 합).
+        """
+        if weight <= 0:
+            return
+        base = np.uint64(hash64(item))
+        with np.errstate(over='ignore'):
+            slots = base + np.arange(1, weight + 1, dtype=np.uint64) * GOLDEN_GAMMA
+        self.add_hashes(mix64(slots))
+
+    def merge(self, other):
+        """다른 스케치(다른 파일/샤드)를 합침 (합집합의 스케치가 됨)"""
+        if other.precision != self.precision:
+            raise ValueError(f"Cannot merge HyperLogLog sketches with precision {self.precision} and {other.precision}")
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def count(self):
+        """고유 항목 수 추정"""
+        m = len(self.registers)
+        alpha = {16: 0.673, 32: 0.697, 64: 0.709}.get(m, 0.7213 / (1 + 1.079 / m))
+        estimate = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int32)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros > 0:
+            # 작은 범위는 선형 계수(linear counting)가 더 정확함
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+    def to_state(self):
+        """체크포인트/결과 묶음에 저장할 수 있는 JSON 값으로 변환"""
+        return {'precision': self.precision,
+                'registers': base64.b64encode(self.registers.tobytes()).decode('ascii')}
+
+    @classmethod
+    def from_state(cls, state):
+        sketch = cls(state['precision'])
+        sketch.registers[:] = np.frombuffer(base64.b64decode(state['registers']), dtype=np.uint8)
+        return sketch
+
+# 고정 개수의 카운터로 빈도 상위 항목을 추적하는 스케치 (Space-Saving)
+class SpaceSaving:
+    """capacity개의 카운터만 유지하며 빈도 상위 항목과 횟수를 집계
+
+    카운터가 가득 차면 가장 작은 카운터를 새 항목에 넘겨주므로, 횟수는 실제보다
+    최대 errors[item]만큼 클 수 있다 (전체 횟수/capacity보다 자주 나온 항목은 항상 포함됨).
+    capacity가 None이면 모든 항목을 정확히 센다 (작은 데이터용).
+    """
+    def __init__(self, capacity=None):
+        self.capacity = capacity
+        self.counts = {}
+        self.errors = {}
+        # (횟수, 항목) 최소 힙. 증가 시에는 갱신하지 않고 꺼낼 때 최신 횟수로 다시 넣음
+        self._heap = []
+
+    @property
+    def exact(self):
+        return self.capacity is None
+
+    def add(self, item, count=1):
+        counts = self.counts
+        if item in counts:
+            counts[item] += count
+        elif self.capacity is None or len(counts) < self.capacity:
+            counts[item] = count
+            self.errors[item] = 0
+            if self.capacity is not None:
+                heapq.heappush(self._heap, (count, item))
+        else:
+            minimum, evicted = self._pop_min()
+            del counts[evicted]
+            del self.errors[evicted]
+            counts[item] = minimum + count
+            self.errors[item] = minimum
+            heapq.heappush(self._heap, (minimum + count, item))
+
+    def add_many(self, items, count=1):
+        """항목 여러 개를 각각 count번 추가 (같은 텍스트가 여러 셀에 반복된 경우)"""
+        for item in items:
+            self.add(item, count)
+
+    def _pop_min(self):
+        """가장 작은 카운터를 힙에서 꺼냄 (오래된 항목은 최신 횟수로 다시 넣음)"""
+        heap = self._heap
+        while True:
+            count, item = heapq.heappop(heap)
+            current = self.counts[item]
+            if current == count:
+                return count, item
+            heapq.heappush(heap, (current, item))
+
+    def _min_count(self):
+        """카운터가 가득 찼으면 가장 작은 횟수, 아니면 0 (없는 항목의 최대 횟수)"""
+        if self.capacity is None or len(self.counts) < self.capacity:
+            return 0
+        return min(self.counts.values())
+
+    def merge(self, other):
+        """다른 스케치(다른 샤드)를 합침
+
+        한쪽에만 있는 항목은 다른 쪽에서 최대 그쪽의 최소 카운터만큼 나왔을 수 있으므로
+        그만큼을 횟수와 오차에 더한 뒤 상위 capacity개만 남긴다.
+        """
+        if other.capacity != self.capacity:
+            raise ValueError(f"Cannot merge Space-Saving sketches with capacity {self.capacity} and {other.capacity}")
+        self_min = self._min_count()
+        other_min = other._min_count()
+        merged = []
+        for item in set(self.counts) | set(other.counts):
+            count = self.counts.get(item, self_min) + other.counts.get(item, other_min)
+            error = self.errors.get(item, self_min) + other.errors.get(item, other_min)
+            merged.append((count, error, item))
+        if self.capacity is not None:
+            merged = heapq.nlargest(self.capacity, merged, key=lambda entry: (entry[0], entry[2]))
+        self._load(merged)
+
+    def _load(self, entries):
+        self.counts = {item: count for count, _, item in entries}
+        self.errors = {item: error for _, error, item in entries}
+        self._heap = [(count, item) for item, count in self.counts.items()] if self.capacity is not None else []
+        heapq.heapify(self._heap)
+
+    def top(self, n):
+        """빈도 상위 n개 항목을 [(항목, 횟수, 최대 과대 추정치)]로 반환 (횟수 내림차순, 같으면 항목 순)"""
+        items = heapq.nsmallest(n, self.counts.items(), key=lambda pair: (-pair[1], pair[0]))
+        return [(item, count, self.errors[item]) for item, count in items]
+
+    def to_state(self):
+        """체크포인트/결과 묶음에 저장할 수 있는 JSON 값으로 변환"""
+        return {'capacity': self.capacity,
+                'items': [[item, count, self.errors[item]] for item, count in self.counts.items()]}
+
+    @classmethod
+    def from_state(cls, state):
+        sketch = cls(state['capacity'])
+        sketch._load([(count, error, item) for item, count, error in state['items']])
+        return sketch
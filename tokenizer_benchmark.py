@@ -0,0 +1,66 @@
+import time
+from translations import t
+from report_writer import ReportWriter
+from word_tokenizers import TOKENIZER_PROFILES, DEFAULT_TOKENIZER_PROFILE, get_tokenizer
+
+# --benchmark-tokenizers 값을 생략했을 때 언어마다 측정할 표본 텍스트 수
+DEFAULT_BENCHMARK_TEXTS = 2000
+
+# 같은 표본을 반복 측정하여 가장 빠른 시간을 사용 (캐시/JIT 준비 시간 제외)
+BENCHMARK_REPEATS = 3
+
+# 표본을 토크나이저에 넘기는 배치 크기 (분석 시 시트 단위 배치와 비슷한 크기)
+BENCHMARK_BATCH_TEXTS = 500
+
+BENCHMARK_HEADERS = ['Category', 'Profile', 'Backend', 'Status', 'Texts', 'Chars', 'Tokens', 'Seconds',
+                     'TokensPerSecond', 'TokenDiff%']
+
+def time_backend(backend, texts):
+    """백엔드로 표본을 BENCHMARK_REPEATS번 토큰화하여 (토큰 수, 가장 빠른 시간) 반환"""
+    best = None
+    tokens = 0
+    for _ in range(BENCHMARK_REPEATS):
+        start = time.perf_counter()
+        tokens = 0
+        for first in range(0, len(texts), BENCHMARK_BATCH_TEXTS):
+            tokens += sum(len(words) for words in backend.tokenize(texts[first:first + BENCHMARK_BATCH_TEXTS]))
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return tokens, best
+
+def run_benchmark(samples, language_names=None, profiles=TOKENIZER_PROFILES):
+    """언어별 표본 텍스트(전처리된 텍스트 목록)를 프로필마다 토큰화하여 처리량 행 목록 반환
+
+    TokenDiff%는 같은 표본에서 기본 프로필(accurate)보다 토큰 수가 얼마나 많거나 적은지를 나타낸다.
+    """
+    language_names = language_names or {}
+    rows = []
+    for language in sorted(samples):
+        texts = samples[language]
+        chars = sum(len(text) for text in texts)
+        baseline = None
+        for profile in profiles:
+            backend = get_tokenizer(language, profile)
+            try:
+                tokens, seconds = time_backend(backend, texts)
+                status = "Normal"
+            except Exception as e:
+                tokens, seconds = 0, 0.0
+                status = f"Warning: Tokenizer error ({e})"
+            if profile == DEFAULT_TOKENIZER_PROFILE:
+                baseline = tokens
+            tokens_per_second = round(tokens / seconds) if seconds > 0 else 0
+            diff = round((tokens - baseline) / baseline * 100, 1) if baseline else 0.0
+            rows.append([language_names.get(language, language), profile, backend.name, status, len(texts), chars,
+                         tokens, round(seconds, 4), tokens_per_second, diff])
+    return rows
+
+def write_benchmark_report(report_path, rows, current_language, finish_sheet=None):
+    """벤치마크 결과를 콘솔에 출력하고 Tokenizer_benchmark 시트로 저장"""
+    for category, profile, backend, status, texts, chars, tokens, seconds, tokens_per_second, diff in rows:
+        print(f"{category:<20} {profile:<9} {backend:<28} {tokens:>9} tokens {tokens_per_second:>10}/s {diff:>+7.1f}%"
+              + ("" if status == "Normal" else f"  {status}"))
+    writer = ReportWriter(report_path, finish_sheet=finish_sheet)
+    writer.write_sheet('Tokenizer_benchmark', BENCHMARK_HEADERS, rows, key_columns=3)
+    writer.close()
+    print(f"{t('UI_015', current_language)}: {report_path}")
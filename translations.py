@@ -20,6 +20,24 @@ TRANSLATIONS = {
         'UI_017': '주의',
         'UI_018': '오류 발생',
         'UI_019': '계속하려면 아무 키나 누르세요...',
+        'UI_020': '언어 감지 캐시: 적중 {}회, 신규 감지 {}회',
+        'UI_021': '체크포인트에서 이어서 처리합니다: {}개 파일 완료됨',
+        'UI_022': '중단되었습니다. 체크포인트가 저장되었습니다. --resume 옵션으로 이어서 처리할 수 있습니다.',
+        'UI_023': '샤드 {}: {}개 파일 배정됨',
+        'UI_024': '샤드 결과 저장됨 (모든 샤드가 끝나면 --merge로 보고서 생성)',
+        'UI_025': '{}개 샤드 결과 병합 중...',
+        'UI_026': '보고서가 Excel 크기 한도를 넘어 나누어 저장되었습니다 (Index 시트 참고)',
+        'UI_027': '파일을 탐색하는 중입니다. 찾은 파일부터 바로 분석합니다.',
+        'UI_028': '메모리 예산: 최대 예약 {} / 예산 {}, 스트리밍으로 읽은 파일 {}개 (추정치와 실제 크기 기록: {})',
+        'UI_029': '추정 {}회차: 파일 {}/{}개, 표본 행 {}개, 최대 상대 오차 {:.1%} (목표 {:.1%})',
+        'UI_030': '표본 추정 모드: 목표 상대 오차 {} (95% 신뢰구간)에 도달할 때까지 표본을 늘립니다.',
+        'UI_031': '반복/퍼지 매치 분석 중...',
+        'UI_032': '고유 집합 메모리 한도 {}를 넘어 가장 큰 언어의 집합을 {}번 디스크로 내보냈습니다.',
+        'UI_033': '셀 단위 결과 데이터베이스 저장',
+        'UI_034': '토크나이저 프로필',
+        'UI_035': '토크나이저 벤치마크: 언어별 표본 {}개 텍스트로 프로필별 처리량을 측정합니다.',
+        'UI_036': '시트 {}개를 워커 프로세스 {}개에서 병렬로 분석했습니다.',
+        'UI_037': '기준 결과 데이터베이스를 불러왔습니다: {} (고유 텍스트 {}개)',
         'MAIN_001': '분석 방식을 선택하세요 / Select analysis type:',
         'MAIN_002': '1. 글자 수 분석 (Character Count)',
         'MAIN_003': '2. 단어 수 분석 (Word Count)',
@@ -46,6 +64,24 @@ TRANSLATIONS = {
         'UI_017': 'Caution',
         'UI_018': 'caused an error',
         'UI_019': 'Press any key to continue...',
+        'UI_020': 'Language detection cache: {} hits, {} new detections',
+        'UI_021': 'Resuming from checkpoint: {} files already completed',
+        'UI_022': 'Interrupted. Checkpoint saved. Run again with --resume to continue.',
+        'UI_023': 'Shard {}: {} files assigned',
+        'UI_024': 'Shard result saved (run --merge after all shards finish)',
+        'UI_025': 'Merging {} shard results...',
+        'UI_026': 'Report exceeded Excel size limits and was split into parts (see the Index sheet)',
+        'UI_027': 'Searching for files. Analysis starts as soon as files are found.',
+        'UI_028': 'Memory budget: peak reserved {} of {}, {} files read with streaming (estimates vs. actual sizes logged to {})',
+        'UI_029': 'Estimate round {}: {}/{} files, {} sampled rows, max relative error {:.1%} (target {:.1%})',
+        'UI_030': 'Sampled estimate mode: growing the sample until the relative error reaches {} (95% confidence interval)',
+        'UI_031': 'Analyzing repetitions and fuzzy matches...',
+        'UI_032': 'Unique sets exceeded the {} memory limit; the largest language set was spilled to disk {} times.',
+        'UI_033': 'Cell results database saved',
+        'UI_034': 'Tokenizer profile',
+        'UI_035': 'Tokenizer benchmark: measuring throughput per profile on up to {} sample texts per language.',
+        'UI_036': '{} sheets were analyzed in parallel by {} worker processes.',
+        'UI_037': 'Loaded baseline results database: {} ({} unique texts)',
         'MAIN_001': '분석 방식을 선택하세요 / Select analysis type:',
         'MAIN_002': '1. 글자 수 분석 (Character Count)',
         'MAIN_003': '2. 단어 수 분석 (Word Count)',
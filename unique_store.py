@@ -0,0 +1,219 @@
+import os
+import sys
+import json
+import zlib
+import struct
+from array import array
+
+# 폴더 전체 고유 집합이 메모리에 둘 수 있는 기본 크기 (모든 카테고리 합계, --unique-memory로 변경)
+DEFAULT_UNIQUE_MEMORY = 512 << 20
+
+# 집합 항목 하나의 추가 메모리 (해시 테이블 슬롯과 여유 공간, 문자열 객체 크기는 따로 셈)
+SET_ENTRY_BYTES = 40
+
+# 내보낸 파일을 나누는 해시 구간 수 (합칠 때는 구간 하나의 합집합만 메모리에 올림)
+SPILL_PARTITIONS = 16
+
+# 카테고리마다 체크포인트 파일이 이만큼 쌓이면 다음 체크포인트에서 메모리 집합 전체를 파일 하나로 다시 씀
+CHECKPOINT_FILES_PER_CATEGORY = 8
+
+# 내보낸 파일 형식: 매직, 구간 수, 구간별 (항목 수, 바이트 수), 구간마다 길이 배열(uint32) + UTF-8 바이트
+SPILL_MAGIC = b'CLU1'
+SPILL_FILE_EXTENSION = '.bin'
+
+def get_partition(value):
+    """값의 해시 구간 (실행/프로세스와 무관하게 같은 값은 항상 같은 구간)"""
+    return zlib.crc32(value.encode('utf-8', 'surrogatepass')) % SPILL_PARTITIONS
+
+def get_file_number(name):
+    """내보낸 파일 이름({카테고리}_{번호}.bin)의 번호"""
+    return int(os.path.splitext(name)[0].rsplit('_', 1)[1])
+
+def write_spill_file(path, values):
+    """값 목록을 해시 구간별로 나누어 이진 형식으로 저장"""
+    partitions = [[] for _ in range(SPILL_PARTITIONS)]
+    for value in values:
+        encoded = value.encode('utf-8', 'surrogatepass')
+        partitions[zlib.crc32(encoded) % SPILL_PARTITIONS].append(encoded)
+    with open(path, 'wb') as f:
+        f.write(SPILL_MAGIC + struct.pack('<I', SPILL_PARTITIONS))
+        blobs = []
+        for partition in partitions:
+            lengths = array('I', map(len, partition))
+            blob = lengths.tobytes() + b''.join(partition)
+            f.write(struct.pack('<IQ', len(partition), len(blob)))
+            blobs.append(blob)
+        for blob in blobs:
+            f.write(blob)
+
+def read_spill_partition(path, partition):
+    """내보낸 파일에서 해시 구간 하나의 값 목록을 읽음 (이전 버전의 JSON 파일도 읽음)"""
+    if path.endswith('.json'):
+        with open(path, 'r', encoding='utf-8') as f:
+            return [value for value in json.load(f) if get_partition(value) == partition]
+    with open(path, 'rb') as f:
+        header = f.read(8)
+        if header[:4] != SPILL_MAGIC or struct.unpack('<I', header[4:])[0] != SPILL_PARTITIONS:
+            raise ValueError(f"Unsupported unique set file: {path}")
+        table = [struct.unpack('<IQ', f.read(12)) for _ in range(SPILL_PARTITIONS)]
+        f.seek(sum(size for _, size in table[:partition]), os.SEEK_CUR)
+        count, size = table[partition]
+        blob = memoryview(f.read(size))
+    lengths = array('I')
+    lengths.frombytes(blob[:count * lengths.itemsize])
+    values = []
+    offset = count * lengths.itemsize
+    for length in lengths:
+        values.append(str(blob[offset:offset + length], 'utf-8', 'surrogatepass'))
+        offset += length
+    return values
+
+# 카테고리별 폴더 전체 고유 값 집합 (메모리 예산을 넘으면 가장 큰 카테고리부터 파일로 내보냄)
+class UniqueStore:
+    """카테고리(언어)별 고유 값 집합을 모든 카테고리 합계 memory_limit 바이트 안에서 유지
+
+    값마다 문자열 크기와 집합 슬롯 크기로 대략의 메모리를 세고, 합계가 한도를 넘으면 메모리에서
+    가장 큰 카테고리의 집합을 해시 구간으로 나눈 이진 파일로 내보낸다. 고유 값을 셀 때는 구간마다
+    메모리 집합과 내보낸 파일의 같은 구간만 합치므로, 전체 합집합을 한 번에 메모리에 올리지 않는다.
+
+    체크포인트(flush)는 마지막 체크포인트 이후 새로 추가된 값만 파일로 쓰고 메모리 집합은 그대로
+    두므로 중복 제거가 이어진다. 이 체크포인트 파일들은 항상 메모리 집합의 부분집합이므로 셀 때는
+    읽지 않으며, 카테고리를 내보낼 때 메모리 집합 전체를 쓴 파일 하나로 대체된다.
+    """
+    def __init__(self, temp_dir, memory_limit=DEFAULT_UNIQUE_MEMORY):
+        self.temp_dir = temp_dir
+        self.memory_limit = memory_limit
+        self.current_sets = {}
+        self.current_bytes = {}
+        self.total_bytes = 0
+        self.pending = {}  # 카테고리별 마지막 체크포인트 이후 메모리 집합에 새로 추가된 값
+        self.temp_files = {}
+        self.checkpoint_files = {}  # 카테고리별 메모리 집합에 모두 들어 있는 체크포인트 파일
+        self.file_numbers = {}  # 카테고리별 다음 파일 번호
+        self.obsolete_files = []  # 대체되었지만 마지막으로 저장된 체크포인트가 아직 참조할 수 있는 파일
+        self.removable_files = []  # 다음 체크포인트에서 삭제할 파일 (저장된 체크포인트가 참조하지 않음)
+        self.spills = 0  # 메모리 한도를 넘어 내보낸 횟수 (체크포인트 저장은 제외)
+
+    def add(self, category, value):
+        """값 추가 (메모리 집합에 이미 있으면 무시)"""
+        current = self.current_sets.get(category)
+        if current is None:
+            current = self.current_sets[category] = set()
+            self.current_bytes[category] = 0
+            self.pending[category] = []
+        if value in current:
+            return
+        current.add(value)
+        self.pending[category].append(value)
+        size = sys.getsizeof(value) + SET_ENTRY_BYTES
+        self.current_bytes[category] += size
+        self.total_bytes += size
+        if self.total_bytes > self.memory_limit:
+            self.spill_largest()
+
+    def add_many(self, category, values):
+        for value in values:
+            self.add(category, value)
+
+    def spill_largest(self):
+        """한도 안으로 들어올 때까지 메모리에서 가장 큰 카테고리부터 파일로 내보냄"""
+        while self.total_bytes > self.memory_limit:
+            category = max(self.current_bytes, key=self.current_bytes.get)
+            if not self.current_sets[category]:
+                break
+            self.spill(category)
+            self.spills += 1
+
+    def write_file(self, category, values):
+        """카테고리의 값 목록을 새 파일로 쓰고 경로 반환"""
+        number = self.file_numbers.get(category, 0)
+        self.file_numbers[category] = number + 1
+        temp_file = os.path.join(self.temp_dir, f"{category}_{number}{SPILL_FILE_EXTENSION}")
+        write_spill_file(temp_file, values)
+        self.temp_files.setdefault(category, []).append(temp_file)
+        return temp_file
+
+    def replace_checkpoint_files(self, category):
+        """메모리 집합 전체를 쓴 파일로 대체된 체크포인트 파일을 목록에서 빼고 삭제 예정으로 둠"""
+        replaced = self.checkpoint_files.pop(category, [])
+        if replaced:
+            self.temp_files[category] = [path for path in self.temp_files[category] if path not in replaced]
+            self.obsolete_files.extend(replaced)
+
+    def spill(self, category):
+        """카테고리의 메모리 집합을 파일로 내보내고 비움"""
+        current = self.current_sets.get(category)
+        if not current:
+            return
+        self.replace_checkpoint_files(category)
+        self.write_file(category, current)
+        current.clear()
+        self.pending[category] = []
+        self.total_bytes -= self.current_bytes[category]
+        self.current_bytes[category] = 0
+
+    def flush(self):
+        """마지막 체크포인트 이후 새로 추가된 값을 파일로 기록 (체크포인트용, 메모리 집합은 유지)
+
+        체크포인트 파일이 CHECKPOINT_FILES_PER_CATEGORY개 쌓인 카테고리는 메모리 집합 전체를 파일 하나로
+        다시 쓴다. 대체된 파일은 그 다음 체크포인트에서 삭제한다 (그 사이에 중단되면 이전 체크포인트가 참조함).
+        """
+        for path in self.removable_files:
+            if os.path.exists(path):
+                os.remove(path)
+        self.removable_files = self.obsolete_files
+        self.obsolete_files = []
+        for category, values in self.pending.items():
+            if not values:
+                continue
+            if len(self.checkpoint_files.get(category, [])) >= CHECKPOINT_FILES_PER_CATEGORY:
+                self.replace_checkpoint_files(category)
+                values = self.current_sets[category]
+            self.checkpoint_files.setdefault(category, []).append(self.write_file(category, values))
+            self.pending[category] = []
+
+    def iter_partitions(self, category):
+        """해시 구간마다 그 구간의 고유 값 집합을 yield"""
+        current = self.current_sets.get(category, ())
+        # 체크포인트 파일의 값은 모두 메모리 집합에 있으므로 내보낸 파일만 읽음
+        checkpoint_files = self.checkpoint_files.get(category, [])
+        paths = [path for path in self.temp_files.get(category, []) if path not in checkpoint_files]
+        if not paths:
+            # 내보낸 파일이 없으면 메모리 집합이 곧 전체 고유 값
+            yield current
+            return
+        current_partitions = [[] for _ in range(SPILL_PARTITIONS)]
+        for value in current:
+            current_partitions[get_partition(value)].append(value)
+        for partition in range(SPILL_PARTITIONS):
+            values = set(current_partitions[partition])
+            for path in paths:
+                values.update(read_spill_partition(path, partition))
+            yield values
+
+    def iter_unique(self, category):
+        """카테고리의 모든 고유 값을 차례로 yield"""
+        for values in self.iter_partitions(category):
+            yield from values
+
+    def count_unique(self, category):
+        """카테고리의 고유 값 수"""
+        return sum(len(values) for values in self.iter_partitions(category))
+
+    def get_state(self):
+        """내보낸 파일 목록 반환 (체크포인트에 저장)"""
+        return {category: [os.path.basename(path) for path in paths] for category, paths in self.temp_files.items() if paths}
+
+    def merge_state(self, state, temp_dir):
+        """다른 실행(샤드)의 내보낸 파일 목록을 추가 (병합용, 원본 파일은 삭제하지 않음)"""
+        for category, names in state.items():
+            self.temp_files.setdefault(category, []).extend(os.path.join(temp_dir, name) for name in names)
+
+    def restore_state(self, state):
+        """체크포인트의 내보낸 파일 목록을 복원하고 복원한 파일 이름 집합 반환"""
+        keep = set()
+        for category, names in state.items():
+            self.temp_files[category] = [os.path.join(self.temp_dir, name) for name in names]
+            self.file_numbers[category] = 1 + max(get_file_number(name) for name in names)
+            keep.update(names)
+        return keep
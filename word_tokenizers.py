@@ -0,0 +1,391 @@
+import os
+import re
+import sys
+import time
+
+# 토크나이저 프로필 (accurate: 형태소/품사 분석 파이프라인, fast: 사전/규칙 기반 토크나이저)
+TOKENIZER_PROFILES = ('accurate', 'fast')
+DEFAULT_TOKENIZER_PROFILE = 'accurate'
+
+# 지원하는 spacy 모델들 (현재 버전에서 사용 가능한 것들만)
+SPACY_MODELS = {
+    'en': 'en_core_web_sm',
+    'es': 'es_core_news_sm',
+    'fr': 'fr_core_news_sm',
+    'de': 'de_core_news_sm',
+    'pt': 'pt_core_news_sm',
+    'it': 'it_core_news_sm',
+    'ru': 'ru_core_news_sm'
+    # tr, vi, th, id 모델들은 현재 spaCy 버전에서 지원되지 않음
+}
+
+# 규칙 토크나이저 결과에서 제외할 토큰 (구두점, 숫자, 밑줄만으로 된 토큰)
+NON_WORD_TOKEN = re.compile(r'^[\W\d_]+$')
+
+# 한자/가나는 글자 하나를 한 단어로 셈 (CAT 도구의 CJK 단어 수 관례), 나머지는 글자/숫자 연속을 한 단어로 셈
+CJK_CHARACTER_TOKEN = re.compile(r'[぀-ヿ㐀-䶿一-鿿豈-﫿]'
+                                 r'|[^\W぀-ヿ㐀-䶿一-鿿豈-﫿]+')
+
+# fugashi(MeCab, UniDic) 결과에서 제외할 품사 (조사, 조동사, 기호, 공백)
+FUGASHI_SKIP_POS = ('助詞', '助動詞', '補助記号', '記号', '空白')
+
+def filter_kiwi_tokens(tokens):
+    """Kiwi 토큰에서 조사, 접속조사, 구두점, 숫자, 보조사, 접미사, 어미 제외"""
+    # 조사(J), 접속조사(JC), 구두점(SF), 숫자(SN), 보조사(XS), 접미사(XP), 어미(E) 제외
+    # 단, 명사(N), 동사(V), 형용사(VA), 부사(MA), 감탄사(IC)는 포함
+    return [token.form for token in tokens
+            if token.form.strip()
+            and not token.tag.startswith(('J', 'JC', 'SF', 'SN', 'XS', 'XP', 'E'))]  # 조사, 접속조사, 구두점, 숫자, 보조사, 접미사, 어미 제외
+
+def filter_spacy_tokens(doc):
+    """spaCy 토큰에서 전치사, 접속사, 관사, 대명사, 구두점, 숫자 제외"""
+    # 전치사(ADP), 접속사(CCONJ, SCONJ), 관사(DET), 대명사(PRON), 구두점(PUNCT), 숫자(NUM) 제외
+    # 감탄사(INTJ), 명사(NOUN), 동사(VERB), 형용사(ADJ), 부사(ADV) 등은 포함
+    return [token.text for token in doc
+            if not token.is_space
+            and token.text.strip()
+            and len(token.text) > 1  # 1글자 단어 제외 (단, 의미있는 단어는 예외)
+            and token.pos_ not in ('ADP', 'CCONJ', 'SCONJ', 'DET', 'PRON', 'PUNCT', 'NUM')
+            and not token.is_punct  # 구두점 추가 체크
+            and not token.like_num]  # 숫자 패턴 추가 체크
+
+def filter_spacy_rule_tokens(doc):
+    """품사 없이 규칙 토크나이저 결과에서 불용어(전치사, 관사, 대명사 등), 구두점, 숫자 제외"""
+    return [token.text for token in doc
+            if not token.is_space
+            and token.text.strip()
+            and len(token.text) > 1
+            and not token.is_stop
+            and not token.is_punct
+            and not token.like_num]
+
+def filter_jieba_tokens(pairs):
+    """jieba posseg 결과에서 조사, 어조사, 접속사, 구두점, 숫자 제외"""
+    # 조사(u), 어조사(y), 접속사(c), 구두점(x), 숫자(m) 제외
+    # 감탄사(e), 명사(n), 동사(v), 형용사(a), 부사(d) 등은 포함
+    return [word for word, flag in pairs
+            if word.strip()
+            and flag not in ('u', 'y', 'c', 'x', 'm')]
+
+def filter_stanza_tokens(doc):
+    """Stanza 토큰에서 조사, 조동사, 접속사, 구두점, 숫자 제외"""
+    words = []
+    for sent in doc.sentences:
+        for token in sent.tokens:
+            # 조사(ADP), 조동사(AUX), 접속사(CCONJ, SCONJ), 구두점(PUNCT), 숫자(NUM) 제외
+            # 감탄사(INTJ), 명사(NOUN), 동사(VERB), 형용사(ADJ), 부사(ADV) 등은 포함
+            if (token.pos not in ('ADP', 'AUX', 'CCONJ', 'SCONJ', 'PUNCT', 'NUM')
+                and token.text.strip()):
+                words.append(token.text)
+    return words
+
+def filter_rule_tokens(tokens):
+    """품사 정보가 없는 토큰에서 공백, 구두점, 숫자만으로 된 토큰 제외"""
+    return [token for token in tokens if token.strip() and not NON_WORD_TOKEN.match(token)]
+
+# 라이브러리/모델 (이름 -> 불러온 객체, 실패하면 None), 프로필이 달라도 한 번만 불러옴
+_libraries = {}
+
+def load_library(key, loader):
+    if key not in _libraries:
+        _libraries[key] = loader()
+    return _libraries[key]
+
+def _load_kiwi():
+    try:
+        from kiwipiepy import Kiwi
+        kiwi = Kiwi()
+        print("Korean processor: Kiwi loaded successfully")
+        return kiwi
+    except (ImportError, Exception) as e:
+        print(f"Warning: kiwipiepy not available ({e}). Korean text will use basic split().")
+        return None
+
+def _load_spacy():
+    try:
+        import spacy
+        return spacy
+    except ImportError:
+        print("Warning: spacy not installed. Please install with: pip install spacy")
+        return None
+
+def _load_spacy_model(lang_code):
+    spacy = load_library('spacy', _load_spacy)
+    if spacy is None:
+        return None
+    model_name = SPACY_MODELS[lang_code]
+    try:
+        # PyInstaller 환경에서 모델 경로 찾기
+        if getattr(sys, 'frozen', False):
+            # 실행 파일 환경
+            base_path = sys._MEIPASS
+            model_path = os.path.join(base_path, 'spacy_models', model_name)
+
+            # 모델 경로 확인 및 로드
+            if os.path.exists(model_path):
+                # config.cfg 파일이 있는지 확인
+                config_path = os.path.join(model_path, f'{model_name}-3.8.0', 'config.cfg')
+                if os.path.exists(config_path):
+                    nlp = spacy.load(model_path)
+                    print(f"Loaded {lang_code} model from bundled path: {model_path}")
+                    return nlp
+                # 전체 모델 디렉토리에서 찾기
+                for root, dirs, files in os.walk(model_path):
+                    if 'config.cfg' in files:
+                        nlp = spacy.load(root)
+                        print(f"Loaded {lang_code} model from: {root}")
+                        return nlp
+                raise Exception(f"config.cfg not found in {model_path}")
+        # 개발 환경 (또는 번들에 모델이 없으면 기본 경로로 시도)
+        nlp = spacy.load(model_name)
+        print(f"Loaded {lang_code} model: {model_name}")
+        return nlp
+    except Exception as e:
+        print(f"Warning: {model_name} not available ({e}). Will use basic split().")
+        return None
+
+def _load_spacy_blank(lang_code):
+    spacy = load_library('spacy', _load_spacy)
+    if spacy is None:
+        return None
+    try:
+        return spacy.blank(lang_code)
+    except Exception as e:
+        print(f"Warning: spaCy tokenizer for {lang_code} not available ({e}). Will use basic split().")
+        return None
+
+def _load_jieba():
+    try:
+        import jieba
+        import jieba.posseg as pseg
+        return jieba, pseg
+    except ImportError:
+        print("Warning: jieba not installed. Please install with: pip install jieba")
+        return None
+
+def _load_stanza_ja():
+    try:
+        import stanza
+        # 일본어 모델 다운로드 및 로드
+        try:
+            nlp_ja = stanza.Pipeline('ja', verbose=False)
+        except:
+            # 모델이 없으면 다운로드 시도
+            stanza.download('ja', verbose=False)
+            nlp_ja = stanza.Pipeline('ja', verbose=False)
+        print("Japanese processor: Stanza loaded successfully")
+        return stanza, nlp_ja
+    except (ImportError, Exception) as e:
+        print(f"Warning: stanza not available ({e}). Japanese text will use basic split().")
+        return None
+
+def _load_fugashi():
+    try:
+        import fugashi
+        tagger = fugashi.Tagger()
+        print("Japanese processor: fugashi (MeCab) loaded successfully")
+        return tagger
+    except (ImportError, Exception) as e:
+        print(f"Warning: fugashi not available ({e}). Japanese text will be counted per character.")
+        return None
+
+def _load_pythainlp():
+    try:
+        from pythainlp.tokenize import word_tokenize
+        print("Thai processor: PyThaiNLP loaded successfully")
+        return word_tokenize
+    except (ImportError, Exception) as e:
+        print(f"Warning: pythainlp not available ({e}). Thai text will use basic split().")
+        return None
+
+# 토크나이저 백엔드 인터페이스
+class TokenizerBackend:
+    """전처리된 텍스트 목록을 받아 텍스트별 단어 목록을 반환하는 토크나이저
+
+    name은 보고서에 표시할 이름이다. load()는 필요한 라이브러리/모델을 준비하고 사용할 수
+    있으면 True를 반환하며, tokenize()에서 난 오류는 호출하는 쪽이 처리한다.
+    기본 구현은 공백 기준 split()이며 항상 사용할 수 있다.
+    """
+    name = 'split'
+
+    def load(self):
+        return True
+
+    def tokenize(self, clean_texts):
+        return [clean_text.split() for clean_text in clean_texts]
+
+class KiwiBackend(TokenizerBackend):
+    """한국어: Kiwi 형태소 분석 (사전 기반이므로 두 프로필 공통)"""
+    name = 'kiwi'
+
+    def load(self):
+        self.kiwi = load_library('kiwi', _load_kiwi)
+        return self.kiwi is not None
+
+    def tokenize(self, clean_texts):
+        return [filter_kiwi_tokens(tokens) for tokens in self.kiwi.tokenize(clean_texts)]
+
+class SpacyPipelineBackend(TokenizerBackend):
+    """spaCy 언어 모델 전체 파이프라인 (품사로 기능어 제외)"""
+    def __init__(self, lang_code):
+        self.lang_code = lang_code
+        self.name = f'spacy ({SPACY_MODELS[lang_code]})'
+
+    def load(self):
+        self.nlp = load_library(('spacy', self.lang_code), lambda: _load_spacy_model(self.lang_code))
+        return self.nlp is not None
+
+    def tokenize(self, clean_texts):
+        return [filter_spacy_tokens(doc) for doc in self.nlp.pipe(clean_texts)]
+
+class SpacyRuleBackend(TokenizerBackend):
+    """spaCy 규칙 토크나이저만 사용 (모델 없이 spacy.blank, 기능어는 불용어 목록으로 제외)"""
+    def __init__(self, lang_code):
+        self.lang_code = lang_code
+        self.name = f'spacy tokenizer ({lang_code})'
+
+    def load(self):
+        self.nlp = load_library(('spacy-blank', self.lang_code), lambda: _load_spacy_blank(self.lang_code))
+        return self.nlp is not None
+
+    def tokenize(self, clean_texts):
+        return [filter_spacy_rule_tokens(doc) for doc in self.nlp.tokenizer.pipe(clean_texts)]
+
+class JiebaPosBackend(TokenizerBackend):
+    """중국어: jieba posseg (품사로 기능어 제외)"""
+    name = 'jieba posseg'
+
+    def load(self):
+        self.jieba = load_library('jieba', _load_jieba)
+        return self.jieba is not None
+
+    def tokenize(self, clean_texts):
+        pseg = self.jieba[1]
+        return [filter_jieba_tokens(pseg.cut(clean_text)) for clean_text in clean_texts]
+
+class JiebaBackend(JiebaPosBackend):
+    """중국어: jieba 사전 분할만 사용 (품사 태깅 없음)"""
+    name = 'jieba'
+
+    def tokenize(self, clean_texts):
+        jieba = self.jieba[0]
+        return [filter_rule_tokens(jieba.lcut(clean_text)) for clean_text in clean_texts]
+
+class StanzaBackend(TokenizerBackend):
+    """일본어: Stanza 신경망 파이프라인"""
+    name = 'stanza'
+
+    def load(self):
+        self.stanza = load_library('stanza-ja', _load_stanza_ja)
+        return self.stanza is not None
+
+    def tokenize(self, clean_texts):
+        stanza, nlp_ja = self.stanza
+        docs = nlp_ja([stanza.Document([], text=clean_text) for clean_text in clean_texts])
+        return [filter_stanza_tokens(doc) for doc in docs]
+
+class FugashiBackend(TokenizerBackend):
+    """일본어: fugashi (MeCab + UniDic 사전)"""
+    name = 'fugashi'
+
+    def load(self):
+        self.tagger = load_library('fugashi', _load_fugashi)
+        return self.tagger is not None
+
+    def tokenize(self, clean_texts):
+        results = []
+        for clean_text in clean_texts:
+            words = [word.surface for word in self.tagger(clean_text)
+                     if getattr(word.feature, 'pos1', None) not in FUGASHI_SKIP_POS]
+            results.append(filter_rule_tokens(words))
+        return results
+
+class PythaiBackend(TokenizerBackend):
+    """태국어: PyThaiNLP newmm 사전 기반 분할"""
+    name = 'pythainlp newmm'
+
+    def load(self):
+        self.word_tokenize = load_library('pythainlp', _load_pythainlp)
+        return self.word_tokenize is not None
+
+    def tokenize(self, clean_texts):
+        return [filter_rule_tokens(self.word_tokenize(clean_text, engine='newmm')) for clean_text in clean_texts]
+
+class CjkCharacterBackend(TokenizerBackend):
+    """한자/가나는 글자마다, 나머지는 글자 연속마다 한 단어 (사전 없는 중국어/일본어 대체)"""
+    name = 'cjk characters'
+
+    def tokenize(self, clean_texts):
+        return [filter_rule_tokens(CJK_CHARACTER_TOKEN.findall(clean_text)) for clean_text in clean_texts]
+
+def get_backend_candidates(language, profile):
+    """언어와 프로필의 백엔드 후보 (앞에서부터 처음 불러지는 것을 사용, 마지막은 항상 split())"""
+    fast = profile == 'fast'
+    candidates = []
+    if language == 'ko':
+        candidates.append(KiwiBackend())
+    elif language in SPACY_MODELS:
+        candidates.append(SpacyRuleBackend(language) if fast else SpacyPipelineBackend(language))
+    elif language in ('zh-cn', 'zh-tw'):
+        candidates.extend([JiebaBackend(), CjkCharacterBackend()] if fast else [JiebaPosBackend()])
+    elif language == 'ja':
+        candidates.extend([FugashiBackend(), CjkCharacterBackend()] if fast else [StanzaBackend()])
+    elif language == 'th' and fast:
+        candidates.append(PythaiBackend())
+    candidates.append(TokenizerBackend())
+    return candidates
+
+# 현재 프로필과 (프로필, 언어)별로 선택된 백엔드
+active_profile = DEFAULT_TOKENIZER_PROFILE
+_backends = {}
+
+# (언어, 백엔드 이름) -> [텍스트 수, 토큰 수, 글자 수, 초], 보고서의 Words_tokenizers 시트와 벤치마크용
+tokenizer_stats = {}
+
+def set_tokenizer_profile(profile):
+    global active_profile
+    if profile not in TOKENIZER_PROFILES:
+        raise ValueError(f"Unknown tokenizer profile {profile!r} (expected one of {', '.join(TOKENIZER_PROFILES)})")
+    active_profile = profile
+
+def get_tokenizer(language, profile=None):
+    """언어의 백엔드 (처음 요청할 때 후보를 차례로 불러 사용할 수 있는 것을 선택)"""
+    profile = profile or active_profile
+    key = (profile, language)
+    backend = _backends.get(key)
+    if backend is None:
+        for backend in get_backend_candidates(language, profile):
+            if backend.load():
+                break
+        _backends[key] = backend
+    return backend
+
+def load_tokenizers(languages, profile=None):
+    """분석 시작 전에 언어들의 백엔드를 미리 불러옴 (첫 셀의 토큰화 시간에 모델 로드가 섞이지 않도록)"""
+    return {language: get_tokenizer(language, profile).name for language in languages}
+
+def tokenize_texts(clean_texts, language, profile=None):
+    """전처리된 텍스트 목록을 언어의 백엔드로 토큰화하고 처리량을 기록 (토크나이저 오류는 그대로 발생)"""
+    backend = get_tokenizer(language, profile)
+    start = time.perf_counter()
+    results = backend.tokenize(clean_texts)
+    elapsed = time.perf_counter() - start
+    stats = tokenizer_stats.setdefault((language, backend.name), [0, 0, 0, 0.0])
+    stats[0] += len(clean_texts)
+    stats[1] += sum(len(words) for words in results)
+    stats[2] += sum(len(clean_text) for clean_text in clean_texts)
+    stats[3] += elapsed
+    return results
+
+def get_tokenizer_state():
+    """처리량 기록을 체크포인트에 저장할 수 있는 형태로 반환"""
+    return [[language, name] + stats for (language, name), stats in tokenizer_stats.items()]
+
+def merge_tokenizer_state(state):
+    """체크포인트/샤드 결과의 처리량 기록을 더함"""
+    for language, name, texts, tokens, chars, seconds in state:
+        stats = tokenizer_stats.setdefault((language, name), [0, 0, 0, 0.0])
+        stats[0] += texts
+        stats[1] += tokens
+        stats[2] += chars
+        stats[3] += seconds
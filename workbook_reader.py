@@ -0,0 +1,567 @@
+import os
+import re
+import posixpath
+import zipfile
+from xml.etree.ElementTree import fromstring
+from xml.parsers import expat
+from collections import deque
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from openpyxl.styles.numbers import BUILTIN_FORMATS, is_date_format, is_timedelta_format
+from openpyxl.utils.datetime import from_excel, from_ISO8601, WINDOWS_EPOCH, MAC_EPOCH
+
+# 분석 중 미리 읽어 둘 워크북 수 (메모리 사용량은 이 깊이로 제한됨)
+PREFETCH_DEPTH = 2
+
+# 선언된 사용 범위(dimension)가 이 셀 수보다 크면 실제 데이터 범위를 XML에서 다시 계산
+PHANTOM_CHECK_MIN_CELLS = 200000
+
+# XLSX(OOXML) 네임스페이스
+MAIN_NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+DOC_REL_NS = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+PKG_REL_NS = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+# 텍스트 대신 값으로 처리하는 숫자/날짜 열의 dtype 종류 (정수, 부호 없는 정수, 실수, 날짜)
+NON_TEXT_DTYPE_KINDS = 'iufM'
+
+# object 열에 섞인 숫자/날짜 셀을 모을 배열 dtype (날짜는 Excel 최대 날짜 9999-12-31까지 표현 가능한 단위,
+# int64 범위를 넘는 정수(Excel의 1E+20 등)는 파이썬 int 그대로 object 배열)
+NON_TEXT_DTYPES = {'i': np.int64, 'f': np.float64, 'M': 'datetime64[us]', 'O': object}
+INT64_MIN, INT64_MAX = -2 ** 63, 2 ** 63 - 1
+
+# 숫자/날짜 열 처리 방식 (count: 값에서 바로 글자 수 계산, skip: 분석에서 제외)
+NON_TEXT_POLICIES = ('count', 'skip')
+
+# 글자 수 분석의 XLSX/XLSM 읽기 방식 (xml: 시트 XML에서 바로 집계, pandas: DataFrame으로 읽음)
+XLSX_READERS = ('xml', 'pandas')
+
+# 워크북 관계(rels)의 파트 종류
+WORKSHEET_REL_TYPE = '/worksheet'
+SHARED_STRINGS_REL_TYPE = '/sharedStrings'
+STYLES_REL_TYPE = '/styles'
+
+CELL_REF_PATTERN = re.compile(r'([A-Z]+)(\d+)')
+DIMENSION_PATTERN = re.compile(rb'<(?:\w+:)?dimension[^>]*\sref="([^"]+)"')
+
+def column_index_from_letters(letters):
+    """열 문자(A, B, ..., XFD)를 1부터 시작하는 열 번호로 변환"""
+    index = 0
+    for ch in letters:
+        index = index * 26 + (ord(ch) - 64)
+    return index
+
+def parse_cell_reference(reference):
+    """셀 주소(예: 'AB12')를 (행, 열) 번호로 변환 (1부터 시작)"""
+    match = CELL_REF_PATTERN.match(reference)
+    if not match:
+        return None
+    return int(match.group(2)), column_index_from_letters(match.group(1))
+
+def get_workbook_rels(archive):
+    """워크북 관계 ID -> (관계 종류, 파트 경로) 매핑"""
+    rels = fromstring(archive.read('xl/_rels/workbook.xml.rels'))
+    targets = {}
+    for rel in rels.iter(f'{PKG_REL_NS}Relationship'):
+        target = rel.get('Target')
+        if target.startswith('/'):
+            target = target.lstrip('/')
+        else:
+            target = posixpath.normpath(posixpath.join('xl', target))
+        targets[rel.get('Id')] = (rel.get('Type', ''), target)
+    return targets
+
+def get_sheet_paths(archive, worksheets_only=False):
+    """워크북의 시트 이름 -> 시트 XML 경로 매핑"""
+    workbook = fromstring(archive.read('xl/workbook.xml'))
+    targets = get_workbook_rels(archive)
+
+    sheet_paths = {}
+    for sheet in workbook.iter(f'{MAIN_NS}sheet'):
+        rel_type, target = targets.get(sheet.get(f'{DOC_REL_NS}id'), ('', None))
+        if target and (not worksheets_only or rel_type.endswith(WORKSHEET_REL_TYPE)):
+            sheet_paths[sheet.get('name')] = target
+    return sheet_paths
+
+def read_declared_dimension(archive, sheet_path):
+    """시트 XML 앞부분의 <dimension ref>에서 선언된 (행 수, 열 수)를 읽음 (없으면 None)"""
+    with archive.open(sheet_path) as f:
+        head = f.read(4096)
+    match = DIMENSION_PATTERN.search(head)
+    if not match:
+        return None
+    last_ref = match.group(1).decode('ascii').split(':')[-1]
+    return parse_cell_reference(last_ref)
+
+def local_name(name):
+    """네임스페이스 접두사를 제외한 XML 태그 이름"""
+    return name.rpartition(':')[2]
+
+def scan_sheet_data_bounds(archive, sheet_path):
+    """시트 XML에 실제로 값이 있는 셀만 보고 데이터 범위 (마지막 행, 마지막 열)를 계산
+
+    서식만 있는 셀(<c s="..."/>)과 빈 행은 무시한다. 요소 트리를 만들지 않도록
+    expat 시작 태그 핸들러만 사용한다.
+    """
+    state = {'row': 0, 'col': 0, 'max_row': 0, 'max_col': 0}
+
+    def start_element(name, attrs):
+        tag = local_name(name)
+        if tag == 'c':
+            reference = attrs.get('r')
+            position = parse_cell_reference(reference) if reference else None
+            state['col'] = position[1] if position else state['col'] + 1
+        elif tag == 'row':
+            row_ref = attrs.get('r')
+            state['row'] = int(row_ref) if row_ref else state['row'] + 1
+            state['col'] = 0
+        elif tag == 'v' or tag == 'is':
+            # 값(<v>) 또는 인라인 문자열(<is>)이 있는 셀만 데이터로 취급
+            if state['row'] > state['max_row']:
+                state['max_row'] = state['row']
+            if state['col'] > state['max_col']:
+                state['max_col'] = state['col']
+
+    parser = expat.ParserCreate()
+    parser.StartElementHandler = start_element
+    with archive.open(sheet_path) as f:
+        parser.ParseFile(f)
+    return state['max_row'], state['max_col']
+
+def get_workbook_data_bounds(file_path):
+    """사용 범위가 크게 선언된 시트의 실제 데이터 범위 계산 (시트 이름 -> (행 수, 열 수))
+
+    XLSX/XLSM이 아니거나 구조를 읽을 수 없으면 빈 딕셔너리를 반환한다.
+    """
+    bounds = {}
+    if not file_path.lower().endswith(('.xlsx', '.xlsm')):
+        return bounds
+    try:
+        with zipfile.ZipFile(file_path) as archive:
+            for sheet_name, sheet_path in get_sheet_paths(archive).items():
+                declared = read_declared_dimension(archive, sheet_path)
+                if declared and declared[0] * declared[1] <= PHANTOM_CHECK_MIN_CELLS:
+                    continue  # 선언된 범위가 작으면 그대로 읽음
+                bounds[sheet_name] = scan_sheet_data_bounds(archive, sheet_path)
+    except (zipfile.BadZipFile, KeyError, OSError, SyntaxError, ValueError, expat.ExpatError):
+        return {}
+    return bounds
+
+def trim_phantom_range(df):
+    """뒤쪽의 빈 행/열(서식만 있는 셀, 공백 문자열 등)을 분석 전에 제거
+
+    앞쪽 행/열은 그대로 두므로 셀 주소는 바뀌지 않는다.
+    """
+    if df.empty:
+        return df
+    present = df.notna().to_numpy(copy=True)  # pandas 3에서는 읽기 전용 뷰일 수 있음
+    for c in range(df.shape[1]):
+        column = df.iloc[:, c]
+        if pd.api.types.is_object_dtype(column) or pd.api.types.is_string_dtype(column):
+            # 공백만 있는 문자열은 빈 셀로 취급 (분석에서도 무시됨, pandas 3의 텍스트 열은 StringDtype)
+            blank = column.map(lambda value: isinstance(value, str) and value.strip() == '').to_numpy(dtype=bool)
+            present[:, c] &= ~blank
+    rows = np.flatnonzero(present.any(axis=1))
+    cols = np.flatnonzero(present.any(axis=0))
+    if len(rows) == 0:
+        return df.iloc[0:0, 0:0]
+    if rows[-1] + 1 == df.shape[0] and cols[-1] + 1 == df.shape[1]:
+        return df
+    return df.iloc[:rows[-1] + 1, :cols[-1] + 1]
+
+def is_non_text_column(column):
+    """숫자/날짜 dtype 열인지 여부 (정수, 실수, 날짜만 해당, bool 열은 텍스트로 처리)"""
+    return column.dtype.kind in NON_TEXT_DTYPE_KINDS
+
+def get_non_text_kind(cell_value):
+    """셀 값이 숫자/날짜이면 종류('i', 'f', 'M', int64 범위를 넘는 정수는 'O'), 아니면 None (bool은 텍스트로 처리)"""
+    if isinstance(cell_value, (bool, np.bool_)):
+        return None
+    if isinstance(cell_value, (int, np.integer)):
+        return 'i' if INT64_MIN <= cell_value <= INT64_MAX else 'O'
+    if isinstance(cell_value, (float, np.floating)):
+        return 'f'
+    if isinstance(cell_value, (datetime, np.datetime64)):
+        return 'M'
+    return None
+
+def group_non_text_values(df):
+    """열별 숫자/날짜 셀을 (값 배열, 행 배열) 목록으로 묶음 ({열: [(값, 행), ...]})
+
+    숫자/날짜 dtype 열은 열 전체를 한 배열로 모으고, 헤더 등 문자열이 섞여 object가 된
+    열은 정수/실수/날짜 셀을 종류별 배열로 모은다. 문자열 셀은 group_distinct_values로 처리한다.
+    """
+    non_text_values = {}
+    for c in range(df.shape[1]):
+        column = df.iloc[:, c]
+        if is_non_text_column(column):
+            values = column.to_numpy()
+            rows = np.flatnonzero(~pd.isna(values))
+            if len(rows):
+                non_text_values[c] = [(values[rows], rows)]
+            continue
+
+        cells_by_kind = {}
+        for r, cell_value in enumerate(column.tolist()):
+            if pd.isna(cell_value):
+                continue
+            kind = get_non_text_kind(cell_value)
+            if kind is not None:
+                cells_by_kind.setdefault(kind, ([], []))
+                cells_by_kind[kind][0].append(cell_value)
+                cells_by_kind[kind][1].append(r)
+        if cells_by_kind:
+            non_text_values[c] = to_non_text_arrays(cells_by_kind)
+    return non_text_values
+
+def to_non_text_arrays(cells_by_kind):
+    """종류별 ([값], [행])을 [(값 배열, 행 배열), ...]로 변환"""
+    return [(np.array(values, dtype=NON_TEXT_DTYPES[kind]), np.array(rows, dtype=np.intp))
+            for kind, (values, rows) in cells_by_kind.items()]
+
+def group_distinct_values(df, text_only=False):
+    """열별로 비어 있지 않은 셀을 고유 텍스트 단위로 묶음 ({열: {텍스트: [행, ...]}})
+
+    텍스트는 열에서 처음 나온 순서, 행은 오름차순이다. 같은 문자열이 여러 행에
+    반복되는 시트에서 분석 함수들이 고유 텍스트마다 한 번만 계산하고, 출현 횟수를
+    곱하거나 행 목록으로 셀 주소/셀 개수를 펼칠 수 있도록 한다.
+    text_only이면 숫자/날짜 셀은 제외한다 (group_non_text_values로 문자열 변환 없이 처리).
+    """
+    groups = {}
+    for c in range(df.shape[1]):
+        if text_only and is_non_text_column(df.iloc[:, c]):
+            continue
+        column_groups = {}
+        for r, cell_value in enumerate(df.iloc[:, c].tolist()):
+            if pd.isna(cell_value):
+                continue
+            if text_only and get_non_text_kind(cell_value) is not None:
+                continue
+            text = str(cell_value)
+            if text.strip() == '':
+                continue  # 빈 셀은 무시
+            rows = column_groups.get(text)
+            if rows is None:
+                column_groups[text] = [r]
+            else:
+                rows.append(r)
+        groups[c] = column_groups
+    return groups
+
+# 공유 문자열/시트 XML에서 바로 모은 시트 (DataFrame 없이 글자 수 분석에 사용)
+class GroupedSheet:
+    """XML에서 모은 시트의 열별 값 묶음
+
+    shape는 DataFrame과 같은 (행 수, 열 수)로 값이 있는 마지막 셀까지이며, groups와
+    non_text_values는 각각 group_distinct_values(text_only=True), group_non_text_values와
+    같은 형식이다. shared_strings는 워크북의 공유 문자열 목록으로 모든 시트가 같은 목록을 가리킨다.
+    """
+    def __init__(self, shape, groups, non_text_values, shared_strings):
+        self.shape = shape
+        self.groups = groups
+        self.non_text_values = non_text_values
+        self.shared_strings = shared_strings
+
+    def without_shared_strings(self):
+        """워크북 전체 공유 문자열 목록을 뺀 복사본 (시트 워커로 보낼 때, 시트 값은 groups에 이미 있음)"""
+        return GroupedSheet(self.shape, self.groups, self.non_text_values, None)
+
+def get_rel_target(rels, rel_type):
+    """워크북 관계 중 rel_type 파트의 경로 (없으면 None)"""
+    for target_type, target in rels.values():
+        if target_type.endswith(rel_type):
+            return target
+    return None
+
+def read_shared_strings(archive, path):
+    """sharedStrings.xml을 한 번 스트리밍하여 공유 문자열 목록 반환
+
+    openpyxl과 같이 서식 있는 문자열은 <t> 조각을 이어 붙이고 윗주(<rPh>)는 제외한다.
+    """
+    strings = []
+    if path is None or path not in archive.namelist():
+        return strings
+    parts = []
+    in_text = False
+    phonetic_depth = 0
+
+    def start_element(name, attrs):
+        nonlocal in_text, phonetic_depth
+        tag = local_name(name)
+        if tag == 't':
+            in_text = phonetic_depth == 0
+        elif tag == 'si':
+            parts.clear()
+        elif tag == 'rPh':
+            phonetic_depth += 1
+
+    def end_element(name):
+        nonlocal in_text, phonetic_depth
+        tag = local_name(name)
+        if tag == 't':
+            in_text = False
+        elif tag == 'si':
+            strings.append(''.join(parts).replace('x005F_', ''))
+        elif tag == 'rPh':
+            phonetic_depth -= 1
+
+    def character_data(data):
+        if in_text:
+            parts.append(data)
+
+    parser = expat.ParserCreate()
+    parser.buffer_text = True
+    parser.StartElementHandler = start_element
+    parser.EndElementHandler = end_element
+    parser.CharacterDataHandler = character_data
+    with archive.open(path) as f:
+        parser.ParseFile(f)
+    return strings
+
+def read_date_styles(archive, path):
+    """셀 서식 번호 중 날짜 서식과 기간 서식인 것의 집합 (openpyxl과 같은 판정)"""
+    if path is None or path not in archive.namelist():
+        return set(), set()
+    root = fromstring(archive.read(path))
+    custom_formats = {int(fmt.get('numFmtId')): fmt.get('formatCode') for fmt in root.iter(f'{MAIN_NS}numFmt')}
+    date_styles, timedelta_styles = set(), set()
+    cell_xfs = root.find(f'{MAIN_NS}cellXfs')
+    if cell_xfs is None:
+        return date_styles, timedelta_styles
+    for style, xf in enumerate(cell_xfs.findall(f'{MAIN_NS}xf')):
+        num_fmt_id = int(xf.get('numFmtId', 0))
+        fmt = custom_formats[num_fmt_id] if num_fmt_id in custom_formats else BUILTIN_FORMATS.get(num_fmt_id)
+        if is_date_format(fmt):
+            date_styles.add(style)
+        if is_timedelta_format(fmt):
+            timedelta_styles.add(style)
+    return date_styles, timedelta_styles
+
+def read_workbook_epoch(archive):
+    """워크북의 날짜 기준일 (1904 날짜 체계이면 MAC_EPOCH)"""
+    workbook = fromstring(archive.read('xl/workbook.xml'))
+    properties = workbook.find(f'{MAIN_NS}workbookPr')
+    if properties is not None and properties.get('date1904', '').lower() in ('1', 'true'):
+        return MAC_EPOCH
+    return WINDOWS_EPOCH
+
+def convert_cell_value(cell_type, style, text, shared_strings, date_styles, timedelta_styles, epoch):
+    """셀 XML의 값 문자열을 pandas(openpyxl)로 읽었을 때와 같은 값으로 변환 (빈 셀/오류 셀은 None)"""
+    if cell_type == 's':
+        return shared_strings[int(text)]
+    if cell_type in ('str', 'inlineStr'):
+        return text
+    if cell_type == 'b':
+        return bool(int(text))
+    if cell_type == 'd':
+        return from_ISO8601(text)
+    if cell_type == 'e':
+        return None
+    number = int(text) if '.' not in text and 'E' not in text.upper() else float(text)
+    if style in date_styles:
+        try:
+            return from_excel(number, epoch, timedelta=style in timedelta_styles)
+        except (OverflowError, ValueError):
+            return None  # 날짜 범위를 벗어난 값은 오류 셀로 읽힘
+    # pandas와 같이 소수부가 없는 실수는 정수로 (int64 범위를 넘는 1E+20 등도 파이썬 int, get_non_text_kind의 'O')
+    if isinstance(number, float) and number.is_integer():
+        return int(number)
+    return number
+
+def scan_sheet_values(archive, sheet_path, shared_strings, date_styles, timedelta_styles, epoch):
+    """시트 XML을 스트리밍하며 열별 고유 텍스트와 행 번호, 숫자/날짜 값을 모아 GroupedSheet로 반환
+
+    DataFrame을 만들지 않고 값이 있는 셀만 처리하므로 서식만 있는 유령 범위도 비용이 없다.
+    """
+    groups = {}
+    non_text_cells = {}  # {열: {종류: ([값], [행])}}
+    row = col = max_row = max_col = 0
+    cell_type, style = 'n', 0
+    parts = []
+    in_value = in_text = in_inline = False
+    has_value = False
+    phonetic_depth = 0
+
+    def add_cell():
+        nonlocal max_row, max_col
+        value = convert_cell_value(cell_type, style, ''.join(parts), shared_strings, date_styles, timedelta_styles, epoch)
+        if value is None:
+            return
+        r, c = row - 1, col - 1
+        kind = get_non_text_kind(value)
+        if kind is not None:
+            values, rows = non_text_cells.setdefault(c, {}).setdefault(kind, ([], []))
+            values.append(value)
+            rows.append(r)
+        else:
+            value = str(value)
+            if value.strip() == '':
+                return  # 빈 셀은 무시
+            column_groups = groups.setdefault(c, {})
+            value_rows = column_groups.get(value)
+            if value_rows is None:
+                column_groups[value] = [r]
+            else:
+                value_rows.append(r)
+        if row > max_row:
+            max_row = row
+        if col > max_col:
+            max_col = col
+
+    def start_element(name, attrs):
+        nonlocal row, col, cell_type, style, in_value, in_text, in_inline, has_value, phonetic_depth
+        tag = local_name(name)
+        if tag == 'c':
+            reference = attrs.get('r')
+            position = parse_cell_reference(reference) if reference else None
+            col = position[1] if position else col + 1
+            cell_type = attrs.get('t', 'n')
+            style = int(attrs.get('s') or 0)
+            parts.clear()
+            has_value = False
+        elif tag == 'v':
+            # 인라인 문자열 셀의 <v>는 openpyxl과 같이 무시
+            in_value = cell_type != 'inlineStr'
+            has_value = has_value or in_value
+        elif tag == 'row':
+            row_ref = attrs.get('r')
+            row = int(row_ref) if row_ref else row + 1
+            col = 0
+        elif tag == 'is':
+            in_inline = True
+            has_value = cell_type == 'inlineStr'
+        elif tag == 't':
+            in_text = in_inline and phonetic_depth == 0
+        elif tag == 'rPh':
+            phonetic_depth += 1
+
+    def end_element(name):
+        nonlocal in_value, in_text, in_inline, phonetic_depth
+        tag = local_name(name)
+        if tag == 'c':
+            # 값이 비어 있는 셀(<v></v>)은 openpyxl과 같이 빈 셀로 처리
+            if has_value and (parts or cell_type == 'inlineStr'):
+                add_cell()
+        elif tag == 'v':
+            in_value = False
+        elif tag == 't':
+            in_text = False
+        elif tag == 'is':
+            in_inline = False
+        elif tag == 'rPh':
+            phonetic_depth -= 1
+
+    def character_data(data):
+        if in_value or in_text:
+            parts.append(data)
+
+    parser = expat.ParserCreate()
+    parser.buffer_text = True
+    parser.StartElementHandler = start_element
+    parser.EndElementHandler = end_element
+    parser.CharacterDataHandler = character_data
+    with archive.open(sheet_path) as f:
+        parser.ParseFile(f)
+
+    non_text_values = {c: to_non_text_arrays(cells_by_kind) for c, cells_by_kind in sorted(non_text_cells.items())}
+    return GroupedSheet((max_row, max_col), dict(sorted(groups.items())), non_text_values, shared_strings)
+
+def read_workbook_groups(file_path):
+    """XLSX/XLSM 워크북을 DataFrame 없이 읽어 ([(시트 이름, GroupedSheet)], 오류)로 반환 (글자 수 분석용)
+
+    공유 문자열(sharedStrings.xml)은 한 번만 읽어 모든 시트가 함께 쓰고, 시트 XML은
+    스트리밍하며 (열, 텍스트)별 행 번호와 숫자/날짜 값을 바로 모은다. XLSX/XLSM이 아니거나
+    구조를 읽을 수 없으면 read_workbook(pandas)으로 읽는다.
+    """
+    if not file_path.lower().endswith(('.xlsx', '.xlsm')):
+        return read_workbook(file_path)
+    sheets = []
+    try:
+        with zipfile.ZipFile(file_path) as archive:
+            sheet_paths = get_sheet_paths(archive, worksheets_only=True)
+            if not sheet_paths:
+                return read_workbook(file_path)
+            rels = get_workbook_rels(archive)
+            shared_strings = read_shared_strings(archive, get_rel_target(rels, SHARED_STRINGS_REL_TYPE))
+            date_styles, timedelta_styles = read_date_styles(archive, get_rel_target(rels, STYLES_REL_TYPE))
+            epoch = read_workbook_epoch(archive)
+            for sheet_name, sheet_path in sheet_paths.items():
+                sheet = scan_sheet_values(archive, sheet_path, shared_strings, date_styles, timedelta_styles, epoch)
+                sheets.append((sheet_name, sheet))
+    except (zipfile.BadZipFile, KeyError, IndexError, OSError, SyntaxError, ValueError, expat.ExpatError):
+        # 표준과 다른 구조의 파일은 pandas로 다시 읽음
+        return read_workbook(file_path)
+    return sheets, None
+
+def read_sheet(xls, sheet_name, bounds=None):
+    """시트를 읽고 실제 데이터 범위로 잘라서 반환"""
+    if bounds is not None:
+        max_row, max_col = bounds
+        # 실제 데이터가 끝나는 행에서 읽기를 멈춤 (유령 행은 파싱하지 않음)
+        df = pd.read_excel(xls, sheet_name=sheet_name, header=None, nrows=max_row)
+        df = df.iloc[:, :max_col]
+    else:
+        df = pd.read_excel(xls, sheet_name=sheet_name, header=None)
+    return trim_phantom_range(df)
+
+def read_workbook(file_path):
+    """워크북의 모든 시트를 읽어 ([(시트 이름, DataFrame)], 오류)로 반환
+
+    읽기 도중 오류가 나면 그때까지 읽은 시트와 오류를 함께 반환하여
+    순차 처리 때처럼 앞선 시트의 결과는 보고서에 남도록 한다.
+    """
+    sheets = []
+    try:
+        sheet_bounds = get_workbook_data_bounds(file_path)
+        with pd.ExcelFile(file_path) as xls:
+            for sheet_name in xls.sheet_names:
+                df = read_sheet(xls, sheet_name, sheet_bounds.get(sheet_name))
+                sheets.append((sheet_name, df))
+    except Exception as e:
+        return sheets, e
+    return sheets, None
+
+def prefetch_workbooks(folder_path, files_to_process, depth=PREFETCH_DEPTH, use_process=False, reader=read_workbook):
+    """다음 워크북들을 백그라운드에서 미리 읽으며 파일 순서대로 반환하는 제너레이터
+
+    (rel_path, file_name, sheets, error)를 yield 한다. depth가 0이면 미리 읽지 않고
+    호출 스레드에서 순차적으로 읽는다. use_process가 True이면 별도 프로세스에서
+    파싱하여 GIL 경쟁 없이 분석과 겹쳐 실행한다. reader는 워크북 하나를 읽는 함수
+    (read_workbook 또는 read_workbook_groups)이다.
+    """
+    if depth <= 0:
+        for rel_path, file_name in files_to_process:
+            sheets, error = reader(os.path.join(folder_path, rel_path))
+            yield rel_path, file_name, sheets, error
+        return
+
+    executor_class = ProcessPoolExecutor if use_process else ThreadPoolExecutor
+    pending = deque()
+    files = iter(files_to_process)
+
+    def submit_next():
+        for rel_path, file_name in files:
+            future = executor.submit(reader, os.path.join(folder_path, rel_path))
+            pending.append((rel_path, file_name, future))
+            return
+
+    with executor_class(max_workers=1) as executor:
+        try:
+            # 큐 깊이만큼 미리 제출 (분석 중인 워크북 + depth개의 워크북만 메모리에 유지)
+            for _ in range(depth):
+                submit_next()
+
+            while pending:
+                rel_path, file_name, future = pending.popleft()
+                try:
+                    sheets, error = future.result()
+                except Exception as e:
+                    # 워커 프로세스 자체의 오류 (예: 결과 직렬화 실패)
+                    sheets, error = [], e
+                submit_next()
+                yield rel_path, file_name, sheets, error
+        finally:
+            # 중단(Ctrl+C 등) 시 아직 시작하지 않은 읽기 작업 취소
+            for _, _, future in pending:
+                future.cancel()